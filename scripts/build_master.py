@@ -1,76 +1,46 @@
 from __future__ import annotations
 
 import argparse
-import re
-import unicodedata
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
 
-# ----------------------------
-# Name normalization utilities
-# ----------------------------
-def repair_mojibake(s: str) -> str:
-    s = (s or "").strip()
-    if not s:
-        return ""
-    if any(ch in s for ch in ("Ã", "Ä", "Â", "â", "€", "œ", "�", "Å")):
-        for enc in ("latin1", "cp1252"):
-            try:
-                return s.encode(enc).decode("utf-8")
-            except UnicodeError:
-                pass
-    return s
-
-
-def strip_accents(s: str) -> str:
-    s = (s or "").strip()
-    if not s:
-        return ""
-    s_norm = unicodedata.normalize("NFKD", s)
-    s_no = "".join(ch for ch in s_norm if not unicodedata.combining(ch))
-    return (
-        s_no.replace("Ł", "L").replace("ł", "l")
-            .replace("Đ", "D").replace("đ", "d")
-            .replace("Ø", "O").replace("ø", "o")
-            .replace("ß", "ss")
-    )
-
+from scripts.player_names import clean_display_names, load_alias_index, player_keys
 
-def clean_display_name(s: str) -> str:
-    # ASCII display (your preference)
-    return strip_accents(repair_mojibake(s))
 
-
-def make_source_key(s: str) -> str:
-    # key used for alias lookup
-    s = clean_display_name(s).lower()
-    return re.sub(r"[^a-z0-9]+", "", s)
-
-
-def load_canonical_name_map(aliases_path: Path) -> dict[str, str]:
+def load_canonical_name_map(aliases_path: Path | None = None) -> dict[str, str]:
     """
     Returns: {source_key -> display_name}
-    """
-    if not aliases_path.exists():
-        raise SystemExit(f"Missing aliases file: {aliases_path}\n"
-                         f"Run: python scripts/build_player_aliases.py")
 
-    aliases = pd.read_csv(aliases_path, dtype=str, keep_default_na=False, na_filter=False)
+    From the cached alias index (scripts/player_names.py load_alias_index(),
+    rebuilt from mappings/name_fixer_inputs when they change) by default, or
+    from an alias CSV such as mappings/player_aliases.csv when aliases_path is
+    given.  Before the index existed the default was that committed CSV.
+    """
+    if aliases_path is None:
+        aliases = load_alias_index()
+        source = "alias index"
+    else:
+        source = aliases_path
+        if not aliases_path.exists():
+            raise SystemExit(f"Missing aliases file: {aliases_path}\n"
+                             f"Run: python scripts/build_player_aliases.py")
+        aliases = pd.read_csv(aliases_path, dtype=str, keep_default_na=False, na_filter=False)
 
     required = {"source_key", "display_name"}
     if not required.issubset(set(aliases.columns)):
-        raise SystemExit(f"{aliases_path} is missing required columns: {sorted(required)}")
+        raise SystemExit(f"{source} is missing required columns: {sorted(required)}")
 
     # last one wins if duplicates sneak in; collisions should be prevented by build_player_aliases.py
-    m = {}
-    for _, r in aliases.iterrows():
-        k = (r.get("source_key") or "").strip()
-        v = clean_display_name(r.get("display_name") or "")
-        if k and v:
-            m[k] = v
-    return m
+    keys  = aliases["source_key"].str.strip()
+    names = clean_display_names(aliases["display_name"])
+    keep  = keys.ne("") & names.ne("")
+    return dict(zip(keys[keep], names[keep]))
 
 
 # ----------------------------
@@ -80,13 +50,16 @@ def main() -> None:
     p = argparse.ArgumentParser()
     p.add_argument("--season-dir", default="assets/data/season", help="Folder containing per-season CSVs")
     p.add_argument("--output", default="assets/data/league-table-combined.csv", help="Output combined CSV path")
-    p.add_argument("--aliases", default="mappings/player_aliases.csv", help="Alias mapping CSV")
+    p.add_argument("--aliases", default=None,
+                   help="Alias mapping CSV. Default: the alias index rebuilt from mappings/name_fixer_inputs "
+                        "(previously the default was the committed mappings/player_aliases.csv; pass that path "
+                        "to use it)")
     p.add_argument("--keys", default="Player,Year,Season type,Tm", help="Comma-separated key columns for de-dupe")
     args = p.parse_args()
 
     season_dir = Path(args.season_dir)
     output_path = Path(args.output)
-    aliases_path = Path(args.aliases)
+    aliases_path = Path(args.aliases) if args.aliases else None
 
     files = sorted(season_dir.glob("*.csv"))
     if not files:
@@ -147,9 +120,9 @@ def main() -> None:
                 f"First examples:\n{examples.to_string(index=False)}"
             )
 
-        # Clean mojibake/accents in Player, then canonicalize via mappings/player_aliases.csv
-        df["Player"] = df["Player"].astype(str).map(clean_display_name)
-        src_keys = df["Player"].map(make_source_key)
+        # Clean mojibake/accents in Player, then canonicalize via the alias table
+        df["Player"] = clean_display_names(df["Player"].astype(str))
+        src_keys = player_keys(df["Player"])
 
         mapped = src_keys.map(canonical_map)
 
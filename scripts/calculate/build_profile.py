@@ -0,0 +1,180 @@
+"""
+Per-phase profiling for build_season (the --profile / --cprofile options).
+
+PhaseProfiler.call() runs one step of the build — staging parquet load, config
+load, each phase, display formatting, CSV write — and records wall time, CPU
+time, tracemalloc peak, input/output row and column counts and bytes in/out.
+For file steps the byte counts are the on-disk sizes of the files read or
+written; for in-memory phases they are the in-memory sizes of the DataFrames,
+arrays and PlaytypeTensors passed in and returned.
+
+A disabled profiler (the default) calls straight through, so the build pays
+nothing when profiling is off.
+
+With cprofile=True every step also runs under its own cProfile.Profile; the
+stats of the slowest step are kept and can be dumped as a pstats file.
+cProfile roughly doubles Python-level overhead, so wall/CPU times recorded in
+that mode are inflated — use --profile alone for timing comparisons.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from scripts.calculate.playtype_tensor import PlaytypeTensor
+
+
+def _shape(obj) -> tuple[int | None, int | None]:
+    """(rows, cols) of the first DataFrame/Series/tensor/array found in obj."""
+    if isinstance(obj, pd.DataFrame):
+        return obj.shape
+    if isinstance(obj, pd.Series):
+        return len(obj), 1
+    if isinstance(obj, PlaytypeTensor):
+        return len(obj.player_ids), len(obj.slugs) * len(obj.fields)
+    if isinstance(obj, np.ndarray):
+        return (obj.shape[0], int(np.prod(obj.shape[1:]))) if obj.ndim else (1, 1)
+    if isinstance(obj, (tuple, list)):
+        for item in obj:
+            rows, cols = _shape(item)
+            if rows is not None:
+                return rows, cols
+    return None, None
+
+
+def _nbytes(obj) -> int:
+    """In-memory size of the DataFrames/Series/tensors/arrays in obj (shallow)."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True))
+    if isinstance(obj, PlaytypeTensor):
+        return int(obj.values.nbytes + obj.present.nbytes + obj.player_ids.nbytes)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (tuple, list)):
+        return sum(_nbytes(item) for item in obj)
+    if isinstance(obj, dict):
+        return sum(_nbytes(v) for v in obj.values())
+    return 0
+
+
+def _file_bytes(paths) -> int:
+    return sum(os.path.getsize(p) for p in paths if p and os.path.exists(p))
+
+
+def _label(season: str | None, name: str) -> str:
+    return f"{season} {name}" if season else name
+
+
+class PhaseProfiler:
+    """
+    Records one entry per build step.
+
+    Attributes:
+        enabled:  When False, call() is a plain function call.
+        cprofile: Also run each step under cProfile and keep the slowest step's stats.
+        entries:  List of per-step dicts, in run order.
+    """
+
+    def __init__(self, enabled: bool = False, cprofile: bool = False) -> None:
+        self.enabled   = enabled or cprofile
+        self.cprofile  = cprofile
+        self.entries: list[dict] = []
+        self.context: dict = {}
+        self._slowest: tuple[float, str, cProfile.Profile] | None = None
+        self._t0 = time.perf_counter()
+
+    def call(self, name: str, fn, *args, reads=(), writes=(), **kwargs):
+        """
+        Run fn(*args, **kwargs) as build step `name` and return its result.
+
+        Args:
+            reads:  File paths the step reads; bytes_in is their on-disk size.
+                    When empty, bytes_in is the in-memory size of args.
+            writes: File paths the step writes; bytes_out is their on-disk size
+                    after the call.  When empty, bytes_out is the in-memory size
+                    of the result.
+        """
+        if not self.enabled:
+            return fn(*args, **kwargs)
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        mem_base, _ = tracemalloc.get_traced_memory()
+        prof = cProfile.Profile() if self.cprofile else None
+
+        cpu0  = time.process_time()
+        wall0 = time.perf_counter()
+        try:
+            if prof is not None:
+                result = prof.runcall(fn, *args, **kwargs)
+            else:
+                result = fn(*args, **kwargs)
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu  = time.process_time() - cpu0
+            _, mem_peak = tracemalloc.get_traced_memory()
+            if started:
+                tracemalloc.stop()
+
+        in_rows, in_cols   = _shape(args)
+        out_rows, out_cols = _shape(result)
+        self.entries.append({
+            **self.context,
+            "phase":            name,
+            "wall_ms":          round(wall * 1000, 3),
+            "cpu_ms":           round(cpu * 1000, 3),
+            "peak_alloc_bytes": int(max(mem_peak - mem_base, 0)),
+            "rows_in":          in_rows,
+            "cols_in":          in_cols,
+            "rows_out":         out_rows,
+            "cols_out":         out_cols,
+            "bytes_in":         _file_bytes(reads) if reads else _nbytes(args),
+            "bytes_out":        _file_bytes(writes) if writes else _nbytes(result),
+        })
+
+        if prof is not None and (self._slowest is None or wall > self._slowest[0]):
+            self._slowest = (wall, _label(self.context.get("season"), name), prof)
+        return result
+
+    def report(self, meta: dict | None = None) -> dict:
+        """Profile report dict: run metadata, per-step entries and the slowest step."""
+        slowest = max(self.entries, key=lambda e: e["wall_ms"], default=None)
+        return {
+            "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+            **(meta or {}),
+            "total_wall_ms":    round((time.perf_counter() - self._t0) * 1000, 3),
+            "phases_wall_ms":   round(sum(e["wall_ms"] for e in self.entries), 3),
+            "cprofile":         self.cprofile,
+            "slowest_phase":    _label(slowest.get("season"), slowest["phase"]) if slowest else None,
+            "phases":           self.entries,
+        }
+
+    def write_report(self, path: str, meta: dict | None = None) -> dict:
+        report = self.report(meta)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[OK] Wrote profile: {path}  (slowest: {report['slowest_phase']})")
+        return report
+
+    def dump_slowest_pstats(self, path: str) -> str | None:
+        """Write the slowest step's cProfile stats (pstats format); returns its label."""
+        if self._slowest is None:
+            return None
+        _, label, prof = self._slowest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        prof.dump_stats(path)
+        print(f"[OK] Wrote pstats for {label}: {path}")
+        return label
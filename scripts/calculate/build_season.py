@@ -1,14 +1,32 @@
 import argparse
+import functools
+import json
 import os
+import re
 import sys
 
+import numpy as np
 import pandas as pd
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
+from scripts.calculate.build_profile import PhaseProfiler
 from scripts.calculate.config import build_config
+from scripts.calculate.playtype_tensor import PlaytypeTensor, as_playtype_tensor
+from scripts.stage.staging_dataset import (
+    load_staging_dataset,
+    partition_dtypes,
+    partition_is_current,
+    partition_path,
+)
+from scripts.stage.staging_dtypes import (
+    plain_dtype,
+    read_staging_parquet,
+    staging_columns,
+    widen_float_dtypes,
+)
 
 # ── Playtype definitions ──────────────────────────────────────────────────────
 # 10 non-Transition playtypes processed in Phase 1.
@@ -34,6 +52,9 @@ TRANSITION_SLUG = "transition"
 
 # ── ScoringShareOfTOV ─────────────────────────────────────────────────────────
 
+SCORING_SHARE_COLUMNS = ["pbp__Turnovers", "pbp__BadPassTurnovers", "pbp__BadPassOutOfBoundsTurnovers"]
+
+
 def compute_scoring_share_of_tov(df: pd.DataFrame) -> pd.DataFrame:
     """
     Add ScoringShareOfTOV column to the staging DataFrame.
@@ -70,11 +91,20 @@ def compute_scoring_share_of_tov(df: pd.DataFrame) -> pd.DataFrame:
 
 # ── Phase 1a ─────────────────────────────────────────────────────────────────
 
-def phase1a_playtype(df: pd.DataFrame, slug: str) -> pd.DataFrame:
+_PHASE1A_FIELDS = ["poss", "pts", "tov_total", "scoring_tovs", "scoring_plays"]
+
+PHASE1A_COLUMNS = ["PLAYER_ID", "Player"] + [
+    f"nba_pt_{pt['slug']}__{stat}"
+    for pt in PLAYTYPES
+    for stat in ("POSS", "PTS", "TOV_POSS_PCT")
+]
+
+
+def phase1a_playtypes(df: pd.DataFrame, slugs: list[str] | None = None) -> PlaytypeTensor:
     """
-    Phase 1a for one non-Transition playtype.
+    Phase 1a for all non-Transition playtypes at once.
 
-    Computes per-player, for players who have data for this playtype:
+    Computes per-player, per-playtype (for players who have data in that playtype):
         tov_total     = round(TOV_POSS_PCT * POSS, 0)
         scoring_tovs  = round(tov_total * ScoringShareOfTOV, 0)
         scoring_plays = POSS - tov_total + scoring_tovs
@@ -84,6 +114,44 @@ def phase1a_playtype(df: pd.DataFrame, slug: str) -> pd.DataFrame:
     This is Phase 1a only — xTOVs, TOV penalty, and PAB are deferred to Phase 1b,
     which runs after Lg Avg On-ball TOV rate is available from Phase 3a.
 
+    Args:
+        df:    Staging DataFrame with ScoringShareOfTOV already added.
+        slugs: Playtype slugs to compute (default: every slug in PLAYTYPES).
+
+    Returns:
+        PlaytypeTensor over the staging rows with fields
+            poss, pts, tov_total, scoring_tovs, scoring_plays
+        A player is present in a slug where that slug's POSS is not null.
+    """
+    if slugs is None:
+        slugs = [pt["slug"] for pt in PLAYTYPES]
+
+    def _stack(stat: str) -> np.ndarray:
+        cols = [f"nba_pt_{s}__{stat}" for s in slugs]
+        return df[cols].to_numpy(dtype=np.float64).T
+
+    poss   = _stack("POSS")
+    pts    = _stack("PTS")
+    tov    = _stack("TOV_POSS_PCT")
+    share  = df["ScoringShareOfTOV"].to_numpy(dtype=np.float64)
+
+    tov_total     = np.round(tov * poss, 0)
+    scoring_tovs  = np.round(tov_total * share, 0)
+    scoring_plays = poss - tov_total + scoring_tovs
+
+    return PlaytypeTensor.from_planes(
+        df["PLAYER_ID"].to_numpy(),
+        df["Player"].to_numpy(dtype=object),
+        slugs,
+        dict(zip(_PHASE1A_FIELDS, [poss, pts, tov_total, scoring_tovs, scoring_plays])),
+        present=~np.isnan(poss),
+    )
+
+
+def phase1a_playtype(df: pd.DataFrame, slug: str) -> pd.DataFrame:
+    """
+    Phase 1a for one non-Transition playtype (see phase1a_playtypes).
+
     Args:
         df:   Staging DataFrame with ScoringShareOfTOV already added.
         slug: Playtype slug, e.g. "iso" or "prballhandler".
@@ -93,35 +161,19 @@ def phase1a_playtype(df: pd.DataFrame, slug: str) -> pd.DataFrame:
             PLAYER_ID, Player, poss, pts, tov_total, scoring_tovs, scoring_plays
         Only rows where POSS is not null (player appeared in this playtype).
     """
-    poss_col = f"nba_pt_{slug}__POSS"
-    pts_col  = f"nba_pt_{slug}__PTS"
-    tov_col  = f"nba_pt_{slug}__TOV_POSS_PCT"
-
-    mask = df[poss_col].notna()
-    sub  = df.loc[mask, ["PLAYER_ID", "Player", poss_col, pts_col, tov_col, "ScoringShareOfTOV"]].copy()
-
-    sub["tov_total"]    = (sub[tov_col] * sub[poss_col]).round(0)
-    sub["scoring_tovs"] = (sub["tov_total"] * sub["ScoringShareOfTOV"]).round(0)
-    sub["scoring_plays"] = sub[poss_col] - sub["tov_total"] + sub["scoring_tovs"]
-
-    return (
-        sub
-        .rename(columns={poss_col: "poss", pts_col: "pts"})
-        .drop(columns=[tov_col, "ScoringShareOfTOV"])
-        .reset_index(drop=True)
-    )
+    return phase1a_playtypes(df, [slug]).frame(slug)
 
 
 # ── Phase 1b ─────────────────────────────────────────────────────────────────
 
-def phase1b_playtype(
-    pt1a: pd.DataFrame,
+def phase1b_playtypes(
+    pt1a: PlaytypeTensor,
     lg_avg_onball_tov_rate: float,
     cfg: dict,
-    baseline_override: float | None = None,
-) -> pd.DataFrame:
+    baseline_overrides: dict[str, float] | None = None,
+) -> PlaytypeTensor:
     """
-    Phase 1b for one non-Transition playtype.
+    Phase 1b for all non-Transition playtypes at once.
 
     Completes per-player scoring columns that depend on Lg Avg On-ball TOV rate
     (available only after Phase 3a).
@@ -130,45 +182,88 @@ def phase1b_playtype(
         tab_avg_scoring_ppp = SUM(pts) / SUM(scoring_plays)
 
     Per-player:
-        scoring_ppp_baseline = baseline_override if provided,
+        scoring_ppp_baseline = baseline_overrides[slug] if provided,
                                else max(CTG_HC_PPP, tab_avg_scoring_ppp)
         xTOVs                = poss * lg_avg_onball_tov_rate
         tov_penalty          = (scoring_tovs - xTOVs) * CTG_TOV_PENALTY
         pab                  = pts + tov_penalty - (scoring_ppp_baseline * scoring_plays)
 
     Args:
-        pt1a:                   Phase 1a output for this playtype.
+        pt1a:                   Phase 1a tensor.
         lg_avg_onball_tov_rate: League average on-ball TOV rate (from Phase 3a).
         cfg:                    Config dict (needs CTG_HC_PPP, CTG_TOV_PENALTY).
-        baseline_override:      If provided, use this value as the scoring PPP
-                                baseline instead of max(CTG_HC_PPP, tab_avg).
+        baseline_overrides:     {slug: baseline} used instead of
+                                max(CTG_HC_PPP, tab_avg) for those slugs.
                                 Used for Putbacks (offrebound), which uses
                                 CTG_HC_PPP directly.
 
     Returns:
-        pt1a DataFrame with added columns:
+        pt1a tensor with added fields:
             tab_avg_scoring_ppp, scoring_ppp_baseline, xTOVs, tov_penalty, pab
     """
-    df = pt1a.copy()
+    overrides = baseline_overrides or {}
+
+    poss          = pt1a.plane("poss")
+    pts           = pt1a.plane("pts")
+    scoring_tovs  = pt1a.plane("scoring_tovs")
+    scoring_plays = pt1a.plane("scoring_plays")
+
+    # Absent cells are 0.0 and NaNs are skipped, as in Series.sum().
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tab_avg = np.nansum(pts, axis=1) / np.nansum(scoring_plays, axis=1)
+
+    baseline = np.array([
+        overrides[s] if s in overrides else max(cfg["CTG_HC_PPP"], tab_avg[j])
+        for j, s in enumerate(pt1a.slugs)
+    ])
+
+    shape       = poss.shape
+    xtovs       = poss * lg_avg_onball_tov_rate
+    tov_penalty = (scoring_tovs - xtovs) * cfg["CTG_TOV_PENALTY"]
+    pab         = pts + tov_penalty - (baseline[:, None] * scoring_plays)
+
+    return pt1a.with_planes({
+        "tab_avg_scoring_ppp":  np.broadcast_to(tab_avg[:, None], shape),
+        "scoring_ppp_baseline": np.broadcast_to(baseline[:, None], shape),
+        "xTOVs":                xtovs,
+        "tov_penalty":          tov_penalty,
+        "pab":                  pab,
+    })
 
-    tab_avg_scoring_ppp  = df["pts"].sum() / df["scoring_plays"].sum()
-    scoring_ppp_baseline = (
-        baseline_override
-        if baseline_override is not None
-        else max(cfg["CTG_HC_PPP"], tab_avg_scoring_ppp)
-    )
 
-    df["tab_avg_scoring_ppp"]  = tab_avg_scoring_ppp
-    df["scoring_ppp_baseline"] = scoring_ppp_baseline
-    df["xTOVs"]                = df["poss"] * lg_avg_onball_tov_rate
-    df["tov_penalty"]          = (df["scoring_tovs"] - df["xTOVs"]) * cfg["CTG_TOV_PENALTY"]
-    df["pab"]                  = df["pts"] + df["tov_penalty"] - (scoring_ppp_baseline * df["scoring_plays"])
+def phase1b_playtype(
+    pt1a: pd.DataFrame,
+    lg_avg_onball_tov_rate: float,
+    cfg: dict,
+    baseline_override: float | None = None,
+) -> pd.DataFrame:
+    """
+    Phase 1b for one non-Transition playtype (see phase1b_playtypes).
 
-    return df
+    Args:
+        pt1a:                   Phase 1a output for this playtype.
+        lg_avg_onball_tov_rate: League average on-ball TOV rate (from Phase 3a).
+        cfg:                    Config dict (needs CTG_HC_PPP, CTG_TOV_PENALTY).
+        baseline_override:      If provided, use this value as the scoring PPP
+                                baseline instead of max(CTG_HC_PPP, tab_avg).
+
+    Returns:
+        pt1a DataFrame with added columns:
+            tab_avg_scoring_ppp, scoring_ppp_baseline, xTOVs, tov_penalty, pab
+    """
+    overrides = {"pt": baseline_override} if baseline_override is not None else None
+    t = PlaytypeTensor.from_frames({"pt": pt1a})
+    return phase1b_playtypes(t, lg_avg_onball_tov_rate, cfg, overrides).frame("pt")
 
 
 # ── Phase 2 ───────────────────────────────────────────────────────────────────
 
+PHASE2_COLUMNS = [
+    "PLAYER_ID", "Player", "pbp__OffPoss",
+    f"nba_pt_{TRANSITION_SLUG}__POSS", f"nba_pt_{TRANSITION_SLUG}__PTS", f"nba_pt_{TRANSITION_SLUG}__TOV_POSS_PCT",
+]
+
+
 def phase2_transition(df: pd.DataFrame, cfg: dict) -> tuple[pd.DataFrame, dict]:
     """
     Phase 2: Transition Scoring + tab-level aggregates.
@@ -242,39 +337,17 @@ _OBS_SLUGS = ["iso", "prballhandler", "postup"]
 _HC_EXTRA_SLUGS = ["spotup", "handoff", "cut", "offscreen", "offrebound", "misc"]
 # Note: "prrollman" (Roll & Pop) is excluded from HC scoring plays per spec.
 
-
-def _sum_scoring_plays(pt1a: dict[str, pd.DataFrame], slugs: list[str]) -> pd.Series:
-    """
-    Return a Series indexed by PLAYER_ID with the sum of scoring_plays across
-    the given slugs. Players absent from a slug are treated as 0.
-    """
-    frames = [
-        pt1a[s].set_index("PLAYER_ID")["scoring_plays"].rename(s)
-        for s in slugs
-        if s in pt1a
-    ]
-    if not frames:
-        return pd.Series(dtype=float)
-    combined = pd.concat(frames, axis=1).fillna(0.0)
-    return combined.sum(axis=1)
-
-
-def _sum_scoring_tovs(pt1a: dict[str, pd.DataFrame], slugs: list[str]) -> pd.Series:
-    """Sum of scoring_tovs across the given slugs, indexed by PLAYER_ID."""
-    frames = [
-        pt1a[s].set_index("PLAYER_ID")["scoring_tovs"].rename(s)
-        for s in slugs
-        if s in pt1a
-    ]
-    if not frames:
-        return pd.Series(dtype=float)
-    combined = pd.concat(frames, axis=1).fillna(0.0)
-    return combined.sum(axis=1)
+PHASE3A_COLUMNS = [
+    "PLAYER_ID", "Player",
+    "pbp__BadPassTurnovers", "pbp__BadPassOutOfBoundsTurnovers",
+    "nba_pass__AST_ADJ", "nba_pass__AST", "nba_pass__SECONDARY_AST",
+    "nba_pass__POTENTIAL_AST", "nba_pass__AST_PTS_CREATED",
+]
 
 
 def phase3a_passing(
     df_stg: pd.DataFrame,
-    pt1a: dict[str, pd.DataFrame],
+    pt1a: PlaytypeTensor | dict[str, pd.DataFrame],
     pt2: pd.DataFrame,
     cfg: dict,
 ) -> tuple[pd.DataFrame, dict]:
@@ -285,7 +358,7 @@ def phase3a_passing(
 
     Inputs:
         df_stg: Staging DataFrame (with ScoringShareOfTOV already added).
-        pt1a:   Dict of Phase 1a DataFrames keyed by playtype slug.
+        pt1a:   Phase 1a tensor (or dict of Phase 1a DataFrames keyed by slug).
         pt2:    Phase 2 Transition DataFrame (per player).
         cfg:    Config dict.
 
@@ -363,11 +436,12 @@ def phase3a_passing(
     base["hc_playmaking_tovs"] = base["playmaking_tovs"] - base["tr_playmaking_tovs"]
 
     # ── OBS and HC scoring plays (from Phase 1a) ──────────────────────────────
-    obs_sp  = _sum_scoring_plays(pt1a, _OBS_SLUGS)
-    hc_extra_sp = _sum_scoring_plays(pt1a, _HC_EXTRA_SLUGS)
+    t1a = as_playtype_tensor(pt1a).reindex(base.index)
+    obs_sp      = pd.Series(t1a.category_sum(_OBS_SLUGS, "scoring_plays"), index=base.index)
+    hc_extra_sp = pd.Series(t1a.category_sum(_HC_EXTRA_SLUGS, "scoring_plays"), index=base.index)
 
-    base["obs_plays"]        = obs_sp.reindex(base.index).fillna(0.0)
-    base["hc_scoring_plays"] = base["obs_plays"] + hc_extra_sp.reindex(base.index).fillna(0.0)
+    base["obs_plays"]        = obs_sp
+    base["hc_scoring_plays"] = base["obs_plays"] + hc_extra_sp
     base["tr_scoring_plays"] = base["tr_scoring_plays"]  # already set above
     base["total_scoring_plays"] = base["hc_scoring_plays"] + base["tr_scoring_plays"]
 
@@ -432,15 +506,14 @@ def phase3a_passing(
     )
 
     # ── Lg Avg On-ball TOV rate ───────────────────────────────────────────────
-    obs_scoring_tovs = _sum_scoring_tovs(pt1a, _OBS_SLUGS)
-    obs_scoring_plays = _sum_scoring_plays(pt1a, _OBS_SLUGS)
+    obs_scoring_tovs = pd.Series(t1a.category_sum(_OBS_SLUGS, "scoring_tovs"), index=base.index)
 
     num = (
-        obs_scoring_tovs.reindex(base.index).fillna(0.0).sum()
+        obs_scoring_tovs.sum()
         + base["on_ball_passing_tovs"].sum()
     )
     den = (
-        obs_scoring_plays.reindex(base.index).fillna(0.0).sum()
+        obs_sp.sum()
         + base["est_hc_pm_plays_clamped"].sum()
     )
     lg_avg_onball_tov_rate = num / den if den > 0 else 0.0
@@ -665,17 +738,97 @@ _ALL_SCORING_SLUGS = _ON_BALL_SLUGS + _PARTNER_SLUGS + _SPACE_SLUGS + _CRASH_SLU
 
 # ── Phase 6 ──────────────────────────────────────────────────────────────────
 
+LEAGUE_TABLE_CONTRACT = os.path.join(REPO_ROOT, "contracts", "league_table_contract.json")
+
+# Output category label → (raw-total prefix on the Phase 6 base frame, has-data gate).
+# Every "{label} PRF|Plays|PC/{g,36,75}" and "{label} rORTG" column in the contract
+# is generated from the {prefix}_prf / {prefix}_plays / {prefix}_pc raw totals.
+_P6_CATEGORIES = {
+    "On-ball":           ("ob",   "ob"),
+    "Off-ball: Partner": ("pt",   "pt"),
+    "Off-ball: Space":   ("sp",   "sp"),
+    "Off-ball: Crash":   ("cr",   "cr"),
+    "Transition":        ("tr",   "tr"),
+    "Total":             ("tot",  "any"),
+    "Scoring":           ("sc",   "any"),
+    "Playmaking":        ("pm",   "ob"),
+    "Half court":        ("hc",   "hc"),
+    "Off-ball":          ("offb", "offb"),
+}
+
+# PC-only breakdowns: label → (raw PC column, has-data gate)
+_P6_PC_ONLY = {
+    "On-ball Scoring":    ("ob_sc_pab",         "ob"),
+    "On-ball Playmaking": ("hc_playmaking_pab", "ob"),
+}
+
+PHASE6_COLUMNS = [
+    "PLAYER_ID", "Player",
+    "nba_trad__GP", "nba_trad__MIN", "pbp__OffPoss", "nba_trad__TEAM_ABBREVIATION",
+]
 
-def _sum_pt1b(pt1b: dict[str, pd.DataFrame], slugs: list[str], col: str) -> pd.Series:
-    """Sum a column from pt1b across slugs, indexed by PLAYER_ID."""
-    frames = [
-        pt1b[s].set_index("PLAYER_ID")[col].rename(s)
-        for s in slugs
-        if s in pt1b
-    ]
-    if not frames:
-        return pd.Series(dtype=float)
-    return pd.concat(frames, axis=1).fillna(0.0).sum(axis=1)
+# Rate suffix → column of the (gp, mins/36, poss/75) divisor matrix
+_P6_RATES = {"g": 0, "36": 1, "75": 2}
+
+_P6_RATE_COL = re.compile(
+    r"^(?P<label>.+) (?P<metric>PRF|Plays|PC)/(?P<rate>g|36|75)(?: \((?P<qual>[^)]+)\))?$"
+)
+_P6_ORTG_COL = re.compile(r"^(?P<label>.+) rORTG$")
+
+
+@functools.lru_cache(maxsize=None)
+def phase6_column_spec(contract_path: str = LEAGUE_TABLE_CONTRACT) -> tuple[list[str], tuple]:
+    """
+    Derive the Phase 6 rate-column spec from contracts/league_table_contract.json.
+
+    Returns:
+        (columns, spec) — columns is the contract's output column order; spec has
+        one (column, kind, raw, gate, rate) tuple per generated column, where kind is:
+            "rate"     raw / divisor[rate]
+            "rate_fr"  raw / divisor[rate] + Floor raising PC/rate  ("(floor raising adj.)")
+            "ortg"     100 * {raw}_pc / {raw}_plays where plays > 0
+            "fr"       floor_raising_pc_per_{rate} as computed by Phase 5
+        and every value is NaN where the gate's has-data flag is False.
+
+    Contract columns that are not rates (identity, creation usage, ratios,
+    Has data? flags) are not in spec; phase6_assemble builds those directly.
+    """
+    with open(contract_path, encoding="utf-8") as f:
+        columns = json.load(f)["columns"]
+
+    spec = []
+    for col in columns:
+        m = _P6_ORTG_COL.match(col)
+        if m and m["label"] in _P6_CATEGORIES:
+            prefix, gate = _P6_CATEGORIES[m["label"]]
+            spec.append((col, "ortg", prefix, gate, None))
+            continue
+
+        m = _P6_RATE_COL.match(col)
+        if not m:
+            continue
+        label, metric, rate, qual = m["label"], m["metric"], m["rate"], m["qual"]
+
+        if label == "Floor raising" and metric == "PC" and qual is None:
+            spec.append((col, "fr", f"floor_raising_pc_per_{rate}", "fr", rate))
+            continue
+        if label in _P6_CATEGORIES:
+            prefix, gate = _P6_CATEGORIES[label]
+            raw = f"{prefix}_{metric.lower()}"
+        elif label in _P6_PC_ONLY and metric == "PC":
+            raw, gate = _P6_PC_ONLY[label]
+        else:
+            raise ValueError(f"No Phase 6 rule for contract column: {col!r}")
+
+        if qual is None or qual == "ex. floor raising":
+            kind = "rate"
+        elif qual == "floor raising adj.":
+            kind = "rate_fr"
+        else:
+            raise ValueError(f"No Phase 6 rule for contract column: {col!r}")
+        spec.append((col, kind, raw, gate, rate))
+
+    return columns, tuple(spec)
 
 
 def _rates(base: pd.DataFrame, raw_col: str, gp: pd.Series, mins: pd.Series,
@@ -688,7 +841,7 @@ def _rates(base: pd.DataFrame, raw_col: str, gp: pd.Series, mins: pd.Series,
 
 
 def phase6_assemble(
-    pt1b: dict[str, pd.DataFrame],
+    pt1b: PlaytypeTensor | dict[str, pd.DataFrame],
     pt3b: pd.DataFrame,
     pt4: pd.DataFrame,
     pt5: pd.DataFrame,
@@ -703,8 +856,14 @@ def phase6_assemble(
     for every category in /g, /36, /75 formats, plus aggregates,
     floor-raising adjustments, creation usage, and Has data? flags.
 
+    The rate columns are generated from phase6_column_spec() (derived from
+    contracts/league_table_contract.json): each raw total is divided by the
+    matching column of a (gp, mins/36, poss/75) divisor matrix in one
+    preallocated float64 block, then gated by its Has data? flag.  Output
+    columns follow the contract order.
+
     Args:
-        pt1b:        Phase 1b DataFrames keyed by slug.
+        pt1b:        Phase 1b tensor (or dict of Phase 1b DataFrames keyed by slug).
         pt3b:        Phase 3b DataFrame (est_hc_pm_plays_final, est_hc_pm_pts,
                      hc_playmaking_pab, total_playmaking_plays, est_tr_pm_pts).
         pt4:         Phase 4 DataFrame (scoring_points_created, transition_prf,
@@ -741,10 +900,15 @@ def phase6_assemble(
     poss = base["poss"]
 
     # ── Per-category raw totals ───────────────────────────────────────────────
+    t1b = as_playtype_tensor(pt1b).reindex(base.index)
+
+    def cat_sum(slugs: list[str], field: str) -> pd.Series:
+        return pd.Series(t1b.category_sum(slugs, field), index=base.index)
+
     # On-ball scoring component (Phase 1b)
-    ob_pts    = _sum_pt1b(pt1b, _ON_BALL_SLUGS, "pts")
-    ob_plays  = _sum_pt1b(pt1b, _ON_BALL_SLUGS, "scoring_plays")
-    ob_pab    = _sum_pt1b(pt1b, _ON_BALL_SLUGS, "pab")
+    ob_pts    = cat_sum(_ON_BALL_SLUGS, "pts")
+    ob_plays  = cat_sum(_ON_BALL_SLUGS, "scoring_plays")
+    ob_pab    = cat_sum(_ON_BALL_SLUGS, "pab")
 
     # On-ball: add HC playmaking from Phase 3b
     pm3 = pt3b.set_index("PLAYER_ID")[
@@ -754,24 +918,24 @@ def phase6_assemble(
     base = base.join(pm3, how="left")
     base[pm3.columns] = base[pm3.columns].fillna(0.0)
 
-    base["ob_prf"]   = ob_pts.reindex(base.index).fillna(0.0) + base["est_hc_pm_pts"]
-    base["ob_plays"] = ob_plays.reindex(base.index).fillna(0.0) + base["est_hc_pm_plays_final"]
-    base["ob_pc"]    = ob_pab.reindex(base.index).fillna(0.0) + base["hc_playmaking_pab"]
+    base["ob_prf"]   = ob_pts + base["est_hc_pm_pts"]
+    base["ob_plays"] = ob_plays + base["est_hc_pm_plays_final"]
+    base["ob_pc"]    = ob_pab + base["hc_playmaking_pab"]
 
     # Off-ball: Partner
-    base["pt_prf"]   = _sum_pt1b(pt1b, _PARTNER_SLUGS, "pts").reindex(base.index).fillna(0.0)
-    base["pt_plays"] = _sum_pt1b(pt1b, _PARTNER_SLUGS, "scoring_plays").reindex(base.index).fillna(0.0)
-    base["pt_pc"]    = _sum_pt1b(pt1b, _PARTNER_SLUGS, "pab").reindex(base.index).fillna(0.0)
+    base["pt_prf"]   = cat_sum(_PARTNER_SLUGS, "pts")
+    base["pt_plays"] = cat_sum(_PARTNER_SLUGS, "scoring_plays")
+    base["pt_pc"]    = cat_sum(_PARTNER_SLUGS, "pab")
 
     # Off-ball: Space
-    base["sp_prf"]   = _sum_pt1b(pt1b, _SPACE_SLUGS, "pts").reindex(base.index).fillna(0.0)
-    base["sp_plays"] = _sum_pt1b(pt1b, _SPACE_SLUGS, "scoring_plays").reindex(base.index).fillna(0.0)
-    base["sp_pc"]    = _sum_pt1b(pt1b, _SPACE_SLUGS, "pab").reindex(base.index).fillna(0.0)
+    base["sp_prf"]   = cat_sum(_SPACE_SLUGS, "pts")
+    base["sp_plays"] = cat_sum(_SPACE_SLUGS, "scoring_plays")
+    base["sp_pc"]    = cat_sum(_SPACE_SLUGS, "pab")
 
     # Off-ball: Crash
-    base["cr_prf"]   = _sum_pt1b(pt1b, _CRASH_SLUGS, "pts").reindex(base.index).fillna(0.0)
-    base["cr_plays"] = _sum_pt1b(pt1b, _CRASH_SLUGS, "scoring_plays").reindex(base.index).fillna(0.0)
-    base["cr_pc"]    = _sum_pt1b(pt1b, _CRASH_SLUGS, "pab").reindex(base.index).fillna(0.0)
+    base["cr_prf"]   = cat_sum(_CRASH_SLUGS, "pts")
+    base["cr_plays"] = cat_sum(_CRASH_SLUGS, "scoring_plays")
+    base["cr_pc"]    = cat_sum(_CRASH_SLUGS, "pab")
 
     # Transition (Phase 4)
     tr4 = pt4.set_index("PLAYER_ID")[
@@ -809,12 +973,9 @@ def phase6_assemble(
     base["offb_pc"]    = base["pt_pc"]   + base["sp_pc"]   + base["cr_pc"]
 
     # Scoring (all 10 non-TR pt1b + transition scoring)
-    all_pts    = _sum_pt1b(pt1b, _ALL_SCORING_SLUGS, "pts")
-    all_splays = _sum_pt1b(pt1b, _ALL_SCORING_SLUGS, "scoring_plays")
-    all_pab    = _sum_pt1b(pt1b, _ALL_SCORING_SLUGS, "pab")
-    base["sc_prf"]   = all_pts.reindex(base.index).fillna(0.0) + base["tr_pts"]
-    base["sc_plays"] = all_splays.reindex(base.index).fillna(0.0) + base["tr_scoring_plays"]
-    base["sc_pc"]    = all_pab.reindex(base.index).fillna(0.0) + base["tr_sc_pc"]
+    base["sc_prf"]   = cat_sum(_ALL_SCORING_SLUGS, "pts") + base["tr_pts"]
+    base["sc_plays"] = cat_sum(_ALL_SCORING_SLUGS, "scoring_plays") + base["tr_scoring_plays"]
+    base["sc_pc"]    = cat_sum(_ALL_SCORING_SLUGS, "pab") + base["tr_sc_pc"]
 
     # Playmaking
     base["pm_prf"]   = base["est_hc_pm_pts"] + base["est_tr_pm_pts"]
@@ -829,39 +990,11 @@ def phase6_assemble(
     ]
     base = base.join(fr5, how="left")
 
-    # ── Compute /g, /36, /75 for each category ────────────────────────────────
-    def cat_cols(prefix: str, prf_raw: str, plays_raw: str, pc_raw: str,
-                 has_mask: pd.Series) -> dict:
-        """Build {col_name: Series} for one category's rate columns.
-
-        Column order matches the known-good CSV:
-            PRF/g, PRF/36, PRF/75, Plays/g, Plays/36, Plays/75,
-            rORTG, PC/g, PC/36, PC/75
-        """
-        rates = [("g", gp), ("36", mins.clip(lower=1e-9) / 36),
-                 ("75", poss.clip(lower=1e-9) / 75)]
-        out = {}
-        for rate, divisor in rates:
-            out[f"{prefix} PRF/{rate}"] = (base[prf_raw] / divisor).where(has_mask)
-        for rate, divisor in rates:
-            out[f"{prefix} Plays/{rate}"] = (base[plays_raw] / divisor).where(has_mask)
-        out[f"{prefix} rORTG"] = (
-            (100 * base[pc_raw] / base[plays_raw])
-            .replace([float("inf"), float("-inf")], float("nan"))
-            .where(base[plays_raw] > 0)
-            .where(has_mask)
-        )
-        for rate, divisor in rates:
-            out[f"{prefix} PC/{rate}"] = (base[pc_raw] / divisor).where(has_mask)
-        return out
+    base["ob_sc_pab"] = ob_pab
 
     # Has data? flags (player appears in at least one slug of the category)
     def has_any(slugs: list[str]) -> pd.Series:
-        pids = set()
-        for s in slugs:
-            if s in pt1b:
-                pids.update(pt1b[s]["PLAYER_ID"].astype(int).tolist())
-        return pd.Series(base.index.isin(pids), index=base.index)
+        return pd.Series(t1b.has_any(slugs), index=base.index)
 
     has_ob  = has_any(_ON_BALL_SLUGS)
     has_pt  = has_any(_PARTNER_SLUGS)
@@ -871,22 +1004,78 @@ def phase6_assemble(
     has_tr  = pd.Series(has_tr, index=base.index)
     has_any_cat = has_ob | has_pt | has_sp | has_cr | has_tr
     has_all_cat = has_ob & has_pt & has_sp & has_cr & has_tr
+    has_hc   = has_ob | has_pt | has_sp | has_cr
+    has_offb = has_pt | has_sp | has_cr
 
     # Individual playtype flags
-    has_iso   = pd.Series(base.index.isin(pt1b.get("iso", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_pnrbh = pd.Series(base.index.isin(pt1b.get("prballhandler", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_post  = pd.Series(base.index.isin(pt1b.get("postup", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_misc  = pd.Series(base.index.isin(pt1b.get("misc", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_rrp   = pd.Series(base.index.isin(pt1b.get("prrollman", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_ho    = pd.Series(base.index.isin(pt1b.get("handoff", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_su    = pd.Series(base.index.isin(pt1b.get("spotup", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_os    = pd.Series(base.index.isin(pt1b.get("offscreen", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_cut   = pd.Series(base.index.isin(pt1b.get("cut", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
-    has_putb  = pd.Series(base.index.isin(pt1b.get("offrebound", pd.DataFrame()).get("PLAYER_ID", pd.Series()).astype(int).tolist()), index=base.index)
+    has_iso   = has_any(["iso"])
+    has_pnrbh = has_any(["prballhandler"])
+    has_post  = has_any(["postup"])
+    has_misc  = has_any(["misc"])
+    has_rrp   = has_any(["prrollman"])
+    has_ho    = has_any(["handoff"])
+    has_su    = has_any(["spotup"])
+    has_os    = has_any(["offscreen"])
+    has_cut   = has_any(["cut"])
+    has_putb  = has_any(["offrebound"])
     # Passing: anyone with nba_pass data (non-zero playmaking_plays_ex_tov)
     has_pass  = base["total_playmaking_plays"] > 0
 
-    # Build output dict
+    # ── Rate columns: one broadcast divide into a preallocated block ──────────
+    contract_cols, spec = phase6_column_spec()
+    gates = {
+        "ob": has_ob, "pt": has_pt, "sp": has_sp, "cr": has_cr, "tr": has_tr,
+        "any": has_any_cat, "hc": has_hc, "offb": has_offb,
+        "fr": base["floor_raising_pc_per_g"].notna(),
+    }
+    gates = {k: v.to_numpy(dtype=bool) for k, v in gates.items()}
+
+    # (players × 3): gp, mins/36, poss/75 — computed once for every rate column
+    divisors = np.column_stack([
+        gp.to_numpy(dtype=np.float64),
+        (mins.clip(lower=1e-9) / 36).to_numpy(dtype=np.float64),
+        (poss.clip(lower=1e-9) / 75).to_numpy(dtype=np.float64),
+    ])
+    fr_rates = base[[f"floor_raising_pc_per_{r}" for r in _P6_RATES]].to_numpy(dtype=np.float64)
+
+    block = np.empty((len(base), len(spec)), dtype=np.float64)
+
+    def gate_matrix(entries) -> np.ndarray:
+        return np.column_stack([gates[e[3]] for e in entries])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pos  = [i for i, e in enumerate(spec) if e[1] in ("rate", "rate_fr")]
+        ents = [spec[i] for i in pos]
+        if ents:
+            rate_idx = np.array([_P6_RATES[e[4]] for e in ents])
+            adj  = np.array([e[1] == "rate_fr" for e in ents])
+            vals = base[[e[2] for e in ents]].to_numpy(dtype=np.float64, copy=True)
+            for r in _P6_RATES.values():
+                sel = rate_idx == r
+                vals[:, sel] /= divisors[:, r:r + 1]
+                vals[:, sel & adj] += np.nan_to_num(fr_rates[:, r:r + 1], nan=0.0)
+            vals[~gate_matrix(ents)] = np.nan
+            block[:, pos] = vals
+
+        pos  = [i for i, e in enumerate(spec) if e[1] == "ortg"]
+        ents = [spec[i] for i in pos]
+        if ents:
+            pc    = base[[f"{e[2]}_pc" for e in ents]].to_numpy(dtype=np.float64)
+            plays = base[[f"{e[2]}_plays" for e in ents]].to_numpy(dtype=np.float64)
+            vals  = 100 * pc / plays
+            vals[np.isinf(vals) | ~(plays > 0) | ~gate_matrix(ents)] = np.nan
+            block[:, pos] = vals
+
+        pos  = [i for i, e in enumerate(spec) if e[1] == "fr"]
+        ents = [spec[i] for i in pos]
+        if ents:
+            vals = fr_rates[:, [_P6_RATES[e[4]] for e in ents]].copy()
+            vals[~gate_matrix(ents)] = np.nan
+            block[:, pos] = vals
+
+    rate_pos = {e[0]: i for i, e in enumerate(spec)}
+
+    # ── Non-rate columns ──────────────────────────────────────────────────────
     cols: dict[str, pd.Series] = {}
 
     # Identity
@@ -899,29 +1088,6 @@ def phase6_assemble(
     cols["Possessions"]  = poss
     cols["Years experience"] = float("nan")
 
-    # Category PRF/Plays/PC/rORTG
-    cols.update(cat_cols("On-ball",          "ob_prf",   "ob_plays",  "ob_pc",   has_ob))
-    cols.update(cat_cols("Off-ball: Partner", "pt_prf",   "pt_plays",  "pt_pc",   has_pt))
-    cols.update(cat_cols("Off-ball: Space",   "sp_prf",   "sp_plays",  "sp_pc",   has_sp))
-    cols.update(cat_cols("Off-ball: Crash",   "cr_prf",   "cr_plays",  "cr_pc",   has_cr))
-    cols.update(cat_cols("Transition",        "tr_prf",   "tr_plays",  "tr_pc",         has_tr))
-    cols.update(cat_cols("Total",             "tot_prf",  "tot_plays", "tot_pc",  has_any_cat))
-    # The plain "Total PC" rates are replaced by the qualified (ex. floor raising) versions;
-    # remove them so only the qualified names appear in the output.
-    for _rate in ["g", "36", "75"]:
-        cols.pop(f"Total PC/{_rate}", None)
-
-    # Total PC ex. floor raising (already computed above as tot_pc)
-    for rate, divisor in [("g", gp), ("36", mins.clip(lower=1e-9) / 36),
-                           ("75", poss.clip(lower=1e-9) / 75)]:
-        cols[f"Total PC/{rate} (ex. floor raising)"] = (
-            (base["tot_pc"] / divisor).where(has_any_cat)
-        )
-
-    # Scoring and Playmaking aggregates
-    cols.update(cat_cols("Scoring",    "sc_prf",   "sc_plays", "sc_pc",   has_any_cat))
-    cols.update(cat_cols("Playmaking", "pm_prf",   "pm_plays", "pm_pc",   has_ob))
-
     # % Playmaking
     cols["% Playmaking"] = (
         (base["pm_plays"] / base["tot_plays"])
@@ -930,44 +1096,14 @@ def phase6_assemble(
         .where(has_any_cat)
     )
 
-    # Floor raising
-    fr_mask = base["floor_raising_pc_per_g"].notna()
-    cols["Floor raising PC/g"]   = base["floor_raising_pc_per_g"].where(fr_mask)
-    cols["Floor raising PC/36"]  = base["floor_raising_pc_per_36"].where(fr_mask)
-    cols["Floor raising PC/75"]  = base["floor_raising_pc_per_75"].where(fr_mask)
-
-    # Floor raising adjustments
-    _fr_rates = [("g", gp), ("36", mins.clip(lower=1e-9) / 36),
-                 ("75", poss.clip(lower=1e-9) / 75)]
-    for rate, divisor in _fr_rates:
-        fr_rate = base[f"floor_raising_pc_per_{rate}"].fillna(0.0)
-        ob_pc_rate = (base["ob_pc"] / divisor).where(has_ob)
-        cols[f"On-ball PC/{rate} (floor raising adj.)"] = (ob_pc_rate + fr_rate).where(has_ob)
-    for rate, divisor in _fr_rates:
-        fr_rate = base[f"floor_raising_pc_per_{rate}"].fillna(0.0)
-        tot_pc_rate = (base["tot_pc"] / divisor).where(has_any_cat)
-        cols[f"Total PC/{rate} (floor raising adj.)"] = (tot_pc_rate + fr_rate).where(has_any_cat)
-
-    # Half court
-    cols.update(cat_cols("Half court", "hc_prf", "hc_plays", "hc_pc", has_ob | has_pt | has_sp | has_cr))
-    for rate, divisor in [("g", gp), ("36", mins.clip(lower=1e-9) / 36),
-                           ("75", poss.clip(lower=1e-9) / 75)]:
-        fr_col = f"floor_raising_pc_per_{rate}"
-        hc_pc_rate = (base["hc_pc"] / divisor).where(has_ob | has_pt | has_sp | has_cr)
-        fr_rate = base[fr_col].fillna(0.0)
-        cols[f"Half court PC/{rate} (floor raising adj.)"] = (hc_pc_rate + fr_rate).where(has_ob | has_pt | has_sp | has_cr)
-
-    # Off-ball
-    cols.update(cat_cols("Off-ball", "offb_prf", "offb_plays", "offb_pc", has_pt | has_sp | has_cr))
-
     # Creation usage
     tot_plays_g = (base["tot_plays"] / gp).where(has_any_cat)
     ob_plays_g  = (base["ob_plays"]  / gp).where(has_ob)
-    offb_plays_g = (base["offb_plays"] / gp).where(has_pt | has_sp | has_cr)
+    offb_plays_g = (base["offb_plays"] / gp).where(has_offb)
     tr_plays_g  = (base["tr_plays"]  / gp).where(has_tr)
     cols["Total creation usage"]      = (tot_plays_g  * gp / poss.clip(lower=1e-9)).where(has_any_cat)
     cols["On-ball creation usage"]    = (ob_plays_g   * gp / poss.clip(lower=1e-9)).where(has_ob)
-    cols["Off-ball creation usage"]   = (offb_plays_g * gp / poss.clip(lower=1e-9)).where(has_pt | has_sp | has_cr)
+    cols["Off-ball creation usage"]   = (offb_plays_g * gp / poss.clip(lower=1e-9)).where(has_offb)
     cols["Transition creation usage"] = (tr_plays_g   * gp / poss.clip(lower=1e-9)).where(has_tr)
     ob_plays_36 = (base["ob_plays"] / mins.clip(lower=1e-9) * 36).where(has_ob)
     cols["On-ball share"] = (ob_plays_36 / ((36 / 48) * 90)).where(has_ob)
@@ -980,16 +1116,6 @@ def phase6_assemble(
         .where(has_ob)
     )
 
-    # On-ball Scoring / Playmaking decomposition
-    ob_sc_pab = ob_pab.reindex(base.index).fillna(0.0)
-    ob_pm_pab = base["hc_playmaking_pab"]
-    _ob_rates = [("g", gp), ("36", mins.clip(lower=1e-9) / 36),
-                 ("75", poss.clip(lower=1e-9) / 75)]
-    for rate, divisor in _ob_rates:
-        cols[f"On-ball Scoring PC/{rate}"] = (ob_sc_pab / divisor).where(has_ob)
-    for rate, divisor in _ob_rates:
-        cols[f"On-ball Playmaking PC/{rate}"] = (ob_pm_pab / divisor).where(has_ob)
-
     # Has data? flags
     cols["Has data? All"]             = has_all_cat
     cols["Has data? Any category"]    = has_any_cat
@@ -1010,14 +1136,22 @@ def phase6_assemble(
     cols["Has data? Off-ball: Crash"] = has_cr
     cols["Has data? Transition"]      = has_tr
 
-    return pd.DataFrame(cols)
+    missing = [c for c in contract_cols if c not in cols and c not in rate_pos]
+    if missing:
+        raise RuntimeError(f"Phase 6 produced no values for contract columns: {missing}")
+    return pd.DataFrame(
+        {c: cols[c] if c in cols else block[:, rate_pos[c]] for c in contract_cols},
+        index=base.index,
+    )
 
 
 # ── Phase 5 ──────────────────────────────────────────────────────────────────
 
+PHASE5_COLUMNS = ["PLAYER_ID", "nba_trad__GP", "nba_trad__MIN", "pbp__OffPoss"]
+
 
 def phase5_floor_raising(
-    pt1b: dict[str, pd.DataFrame],
+    pt1b: PlaytypeTensor | dict[str, pd.DataFrame],
     pt3b: pd.DataFrame,
     df_stg: pd.DataFrame,
     cfg: dict,
@@ -1030,8 +1164,8 @@ def phase5_floor_raising(
     (ISO, PNRBH, Post-Up, Misc).  Players without on-ball data receive NaN.
 
     Args:
-        pt1b:   Dict of Phase 1b DataFrames keyed by slug.
-                Each has PLAYER_ID and scoring_plays columns.
+        pt1b:   Phase 1b tensor (or dict of Phase 1b DataFrames keyed by slug);
+                provides scoring_plays per player and playtype.
         pt3b:   Phase 3b DataFrame; provides est_hc_pm_plays_final per player.
         df_stg: Staging DataFrame; provides nba_trad__GP, nba_trad__MIN,
                 pbp__OffPoss per player.
@@ -1045,19 +1179,16 @@ def phase5_floor_raising(
             raw_fr_per_g, raw_fr_per_36, raw_fr_per_75,
             fr_baseline_per_g, fr_baseline_per_36, fr_baseline_per_75,
             floor_raising_pc_per_g, floor_raising_pc_per_36, floor_raising_pc_per_75
-        One row per player who appears in at least one on-ball playtype.
+        One row per player who appears in at least one on-ball playtype,
+        ordered by PLAYER_ID (the FR baseline mean is taken in this order).
     """
     # ── On-ball scoring plays (sum across ISO, PNRBH, Post-Up, Misc) ─────────
-    frames = [
-        pt1b[s][["PLAYER_ID", "scoring_plays"]].rename(columns={"scoring_plays": f"sp_{s}"})
-        for s in _ON_BALL_SLUGS
-        if s in pt1b
-    ]
-    ob = frames[0]
-    for f in frames[1:]:
-        ob = ob.merge(f, on="PLAYER_ID", how="outer")
-    ob = ob.fillna(0.0)
-    ob["ob_scoring_plays"] = sum(ob[f"sp_{s}"] for s in _ON_BALL_SLUGS if f"sp_{s}" in ob.columns)
+    t1b     = as_playtype_tensor(pt1b)
+    on_ball = t1b.has_any(_ON_BALL_SLUGS)
+    ob_sp   = t1b.category_sum(_ON_BALL_SLUGS, "scoring_plays")[on_ball]
+    ids     = t1b.player_ids[on_ball]
+    order   = np.argsort(ids, kind="stable")
+    ob = pd.DataFrame({"PLAYER_ID": ids[order], "ob_scoring_plays": ob_sp[order]})
 
     # ── HC Playmaking plays (from Phase 3b) ───────────────────────────────────
     pm = pt3b[["PLAYER_ID", "est_hc_pm_plays_final"]].copy()
@@ -1107,67 +1238,141 @@ def phase5_floor_raising(
     return ob[keep_cols].reset_index(drop=True)
 
 
+# ── Staging columns ───────────────────────────────────────────────────────────
+
+# Staging columns read by each step.  Phases 1b, 3b and 4 only consume earlier
+# phase outputs.  A phase that starts reading a new staging column must list it
+# here, or read_staging() will not load it.
+STAGING_COLUMNS = {
+    "ScoringShareOfTOV": SCORING_SHARE_COLUMNS,
+    "Phase 1a":          PHASE1A_COLUMNS,
+    "Phase 2":           PHASE2_COLUMNS,
+    "Phase 3a":          PHASE3A_COLUMNS,
+    "Phase 5":           PHASE5_COLUMNS,
+    "Phase 6":           PHASE6_COLUMNS,
+}
+
+
+def required_staging_columns() -> list[str]:
+    """Union of STAGING_COLUMNS, in first-declared order."""
+    return list(dict.fromkeys(c for cols in STAGING_COLUMNS.values() for c in cols))
+
+
+def staging_read_columns(path: str, available, extra_columns: list[str] | None = None) -> list[str]:
+    """
+    Columns to read from one staging file: required_staging_columns() plus
+    extra_columns.  Raises RuntimeError listing, per phase, any required column
+    missing from available (the file's column names).
+    """
+    required  = dict(STAGING_COLUMNS)
+    if extra_columns:
+        required["Caller"] = list(extra_columns)
+    columns   = list(dict.fromkeys(c for cols in required.values() for c in cols))
+    available = set(available)
+
+    missing = {step: [c for c in cols if c not in available] for step, cols in required.items()}
+    missing = {step: cols for step, cols in missing.items() if cols}
+    if missing:
+        detail = "\n".join(f"  {step}: {cols}" for step, cols in missing.items())
+        raise RuntimeError(f"Staging file {path} is missing required columns:\n{detail}")
+    return columns
+
+
+def read_staging(path: str, extra_columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Read only the staging columns the phases need (parquet column projection).
+
+    Args:
+        path:          Staging parquet path.
+        extra_columns: Additional columns to read (e.g. "Season" for the stack).
+
+    Raises RuntimeError listing, per phase, any required column the file lacks.
+    """
+    columns = staging_read_columns(path, staging_columns(path), extra_columns)
+    return read_staging_parquet(path, columns=columns, widen_floats=True)
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--season",      required=True, help='e.g. "2024-25"')
-    parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
-    parser.add_argument("--output",      default=None,
-                        help="Override output CSV path (default: assets/data/season/league-table-20YY.csv)")
-    args = parser.parse_args()
+STAGING_DIR  = os.path.join(REPO_ROOT, "assets", "data", "staging")
+PROFILE_PATH = os.path.join(REPO_ROOT, "reports", "build_profile.json")
+PSTATS_PATH  = os.path.join(REPO_ROOT, "reports", "build_profile_slowest.pstats")
 
-    season           = args.season
-    season_type      = args.season_type
-    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
 
-    staging_path = os.path.join(REPO_ROOT, "assets", "data", "staging",
-                                f"{season}__{season_type_slug}.parquet")
-    ctg_path = os.path.join(REPO_ROOT, "assets", "data", "raw",
-                            season, season_type_slug, "ctg_league_averages.json")
-    pct_ast_path = os.path.join(REPO_ROOT, "assets", "data", "raw",
-                                season, season_type_slug, "pct_ast_pts_in_pa.json")
-
-    if not os.path.exists(staging_path):
-        raise FileNotFoundError(f"Missing staging file: {staging_path}. Run build_stage_season.py first.")
-    if not os.path.exists(ctg_path):
-        raise FileNotFoundError(f"Missing CTG file: {ctg_path}. Run ctg_league_avgs.py first.")
-    if not os.path.exists(pct_ast_path):
+def season_input_paths(season: str, season_type_slug: str) -> dict[str, str]:
+    """Return the staging, CTG and PCT_AST_PTS_IN_PA input paths for one season."""
+    raw_dir = os.path.join(REPO_ROOT, "assets", "data", "raw", season, season_type_slug)
+    return {
+        "staging": os.path.join(STAGING_DIR, f"{season}__{season_type_slug}.parquet"),
+        "ctg":     os.path.join(raw_dir, "ctg_league_averages.json"),
+        "pct_ast": os.path.join(raw_dir, "pct_ast_pts_in_pa.json"),
+    }
+
+
+def check_season_inputs(paths: dict[str, str]) -> None:
+    if not os.path.exists(paths["staging"]):
+        raise FileNotFoundError(f"Missing staging file: {paths['staging']}. Run build_stage_season.py first.")
+    if not os.path.exists(paths["ctg"]):
+        raise FileNotFoundError(f"Missing CTG file: {paths['ctg']}. Run ctg_league_avgs.py first.")
+    if not os.path.exists(paths["pct_ast"]):
         raise FileNotFoundError(
-            f"Missing PCT_AST_PTS_IN_PA file: {pct_ast_path}. "
+            f"Missing PCT_AST_PTS_IN_PA file: {paths['pct_ast']}. "
             f"Run scripts/calculate/compute_pct_ast_pts.py first."
         )
 
-    print(f"[INFO] Loading staging: {staging_path}")
-    df = pd.read_parquet(staging_path)
-    print(f"[INFO] Staging shape: {df.shape[0]} rows × {df.shape[1]} cols")
 
-    import json as _json
-    with open(pct_ast_path, encoding="utf-8") as _f:
-        _pct_ast_data = _json.load(_f)
-    pct_ast_pts_in_pa = _pct_ast_data["values"]["PCT_AST_PTS_IN_PA"]
+def load_season_config(paths: dict[str, str], pct_ast_pts_in_pa: float | None = None) -> dict:
+    """
+    Build the config dict for one season: fixed constants + CTG + PCT_AST_PTS_IN_PA.
+    pct_ast_pts_in_pa is read from paths["pct_ast"] unless passed in.
+    """
+    if pct_ast_pts_in_pa is None:
+        with open(paths["pct_ast"], encoding="utf-8") as f:
+            pct_ast_pts_in_pa = json.load(f)["values"]["PCT_AST_PTS_IN_PA"]
 
-    cfg = build_config(ctg_path)
+    cfg = build_config(paths["ctg"])
     cfg["PCT_AST_PTS_IN_PA"] = pct_ast_pts_in_pa
     print(f"[INFO] CTG_HC_PPP={cfg['CTG_HC_PPP']:.4f}  CTG_TOV_PENALTY={cfg['CTG_TOV_PENALTY']:.4f}")
     print(f"[INFO] PCT_AST_PTS_IN_PA={cfg['PCT_AST_PTS_IN_PA']:.4f}")
+    return cfg
+
+
+def default_output_path(season: str, output_dir: str | None = None) -> str:
+    season_year = season.split("-")[1]  # "2024-25" → "25"
+    out_dir = output_dir or os.path.join(REPO_ROOT, "assets", "data", "season")
+    return os.path.join(out_dir, f"league-table-20{season_year}.csv")
+
+
+def build_season_table(
+    df: pd.DataFrame,
+    cfg: dict,
+    season: str,
+    season_type: str,
+    profiler: PhaseProfiler | None = None,
+) -> pd.DataFrame:
+    """
+    Run Phases 1a–6 on one season's staging DataFrame and return the final
+    league-table DataFrame (percentage columns scaled for display, ghost rows
+    dropped), ready to be written as CSV.  Each phase runs through profiler.call()
+    when a profiler is given.
+    """
+    prof = profiler or PhaseProfiler()
 
     # ScoringShareOfTOV
-    df = compute_scoring_share_of_tov(df)
+    df = prof.call("compute_scoring_share_of_tov", compute_scoring_share_of_tov, df)
 
     # Phase 1a
     print("[INFO] Running Phase 1a...")
-    pt1a: dict[str, pd.DataFrame] = {}
+    pt1a = prof.call("phase1a_playtypes", phase1a_playtypes, df)
     for pt in PLAYTYPES:
-        result = phase1a_playtype(df, pt["slug"])
-        pt1a[pt["slug"]] = result
-        print(f"[OK]   {pt['name']:14s} ({pt['slug']}): {len(result)} players")
+        n_players = int(pt1a.has_any([pt["slug"]]).sum())
+        print(f"[OK]   {pt['name']:14s} ({pt['slug']}): {n_players} players")
 
     print("[OK] Phase 1a complete.")
 
     # Phase 2
     print("[INFO] Running Phase 2 (Transition)...")
-    pt2, tr_agg = phase2_transition(df, cfg)
+    pt2, tr_agg = prof.call("phase2_transition", phase2_transition, df, cfg)
     print(f"[OK]   Transition: {len(pt2)} players")
     print(f"[OK]   TR_AVG_PPP={tr_agg['TR_AVG_PPP']:.4f}  "
           f"TR_OVERALL_TOV_RATE={tr_agg['TR_OVERALL_TOV_RATE']:.4f}  "
@@ -1177,7 +1382,7 @@ def main() -> int:
 
     # Phase 3a
     print("[INFO] Running Phase 3a (Passing)...")
-    pt3a, agg3a = phase3a_passing(df, pt1a, pt2, cfg)
+    pt3a, agg3a = prof.call("phase3a_passing", phase3a_passing, df, pt1a, pt2, cfg)
     print(f"[OK]   Phase 3a: {len(pt3a)} players")
     print(f"[OK]   LG_AVG_PPPA            = {agg3a['LG_AVG_PPPA']:.4f}")
     print(f"[OK]   lg_avg_onball_tov_rate = {agg3a['lg_avg_onball_tov_rate']:.4f}")
@@ -1189,19 +1394,22 @@ def main() -> int:
     # max(CTG_HC_PPP, tab_avg), because second-chance scoring is valued relative
     # to the half-court average, not the already-elevated putback tab average.
     print("[INFO] Running Phase 1b...")
-    pt1b: dict[str, pd.DataFrame] = {}
-    for pt in PLAYTYPES:
-        baseline = cfg["CTG_HC_PPP"] if pt["slug"] == "offrebound" else None
-        pt1b[pt["slug"]] = phase1b_playtype(
-            pt1a[pt["slug"]], agg3a["lg_avg_onball_tov_rate"], cfg, baseline
-        )
-        print(f"[OK]   {pt['name']:14s} ({pt['slug']}): PAB range "
-              f"[{pt1b[pt['slug']]['pab'].min():.1f}, {pt1b[pt['slug']]['pab'].max():.1f}]")
+    pt1b = prof.call(
+        "phase1b_playtypes", phase1b_playtypes,
+        pt1a, agg3a["lg_avg_onball_tov_rate"], cfg, {"offrebound": cfg["CTG_HC_PPP"]},
+    )
+    pab = pt1b.plane("pab")
+    for j, pt in enumerate(PLAYTYPES):
+        slug_pab = pab[j][pt1b.present[j]]
+        # An empty play type (e.g. its ingest came back empty) must not abort the build
+        pab_range = ("n/a" if np.isnan(slug_pab).all()
+                     else f"[{np.nanmin(slug_pab):.1f}, {np.nanmax(slug_pab):.1f}]")
+        print(f"[OK]   {pt['name']:14s} ({pt['slug']}): PAB range {pab_range}")
     print("[OK] Phase 1b complete.")
 
     # Phase 3b — HC Playmaking PAB (depends on Phase 3a aggregates)
     print("[INFO] Running Phase 3b (HC Playmaking)...")
-    pt3b = phase3b_passing(pt3a, agg3a, tr_agg["TR_PPP_RATIO"], cfg)
+    pt3b = prof.call("phase3b_passing", phase3b_passing, pt3a, agg3a, tr_agg["TR_PPP_RATIO"], cfg)
     pab_range = pt3b["hc_playmaking_pab"]
     print(f"[OK]   Phase 3b: {len(pt3b)} players  "
           f"HC PM PAB range [{pab_range.min():.1f}, {pab_range.max():.1f}]")
@@ -1209,7 +1417,7 @@ def main() -> int:
 
     # Phase 4 — Transition Playmaking (depends on Phase 2 + Phase 3b)
     print("[INFO] Running Phase 4 (Transition Playmaking)...")
-    pt4 = phase4_transition(pt2, pt3b, tr_agg, cfg)
+    pt4 = prof.call("phase4_transition", phase4_transition, pt2, pt3b, tr_agg, cfg)
     pc_range = pt4["points_created"]
     checksum = (pt4["scoring_points_created"] + pt4["playmaking_points_created"] - pt4["points_created"]).abs().max()
     print(f"[OK]   Phase 4: {len(pt4)} players  "
@@ -1219,7 +1427,7 @@ def main() -> int:
 
     # Phase 5 — Floor Raising
     print("[INFO] Running Phase 5 (Floor Raising)...")
-    pt5 = phase5_floor_raising(pt1b, pt3b, df, cfg)
+    pt5 = prof.call("phase5_floor_raising", phase5_floor_raising, pt1b, pt3b, df, cfg)
     fr_range = pt5["floor_raising_pc_per_g"]
     print(f"[OK]   Phase 5: {len(pt5)} players  "
           f"floor raising PC/g range [{fr_range.min():.3f}, {fr_range.max():.3f}]  "
@@ -1229,17 +1437,14 @@ def main() -> int:
     # Phase 6 — Assemble final output
     print("[INFO] Running Phase 6 (Assemble)...")
     season_type_label = "RS" if season_type == "Regular Season" else "Playoffs"
-    out_df = phase6_assemble(pt1b, pt3b, pt4, pt5, df, season, season_type_label)
+    out_df = prof.call("phase6_assemble", phase6_assemble, pt1b, pt3b, pt4, pt5, df, season, season_type_label)
     print(f"[OK]   Phase 6: {len(out_df)} players × {len(out_df.columns)} columns")
 
-    # Write output CSV
-    if args.output:
-        out_path = args.output
-    else:
-        season_year = season.split("-")[1]  # "2024-25" → "25"
-        out_filename = f"league-table-20{season_year}.csv"
-        out_path = os.path.join(REPO_ROOT, "assets", "data", "season", out_filename)
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    return prof.call("format_season_table", format_season_table, out_df)
+
+
+def format_season_table(out_df: pd.DataFrame) -> pd.DataFrame:
+    """Scale percentage columns for display and drop blank-Player rows."""
     # Multiply percentage columns by 100 for website display (e.g. 0.643 → 64.3)
     pct_cols = [
         "Total creation usage",
@@ -1259,12 +1464,216 @@ def main() -> int:
     dropped = before - len(out_df)
     if dropped:
         print(f"[INFO] Dropped {dropped} blank-Player row(s) from output")
+    return out_df
+
+
+def write_season_table(out_df: pd.DataFrame, out_path: str) -> None:
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
     out_df.to_csv(out_path, index=False)
     print(f"[OK]   Written: {out_path}")
     print("[OK] Phase 6 complete.")
 
+
+# ── Multi-season stack ────────────────────────────────────────────────────────
+
+def discover_seasons(season_type_slug: str) -> list[str]:
+    """Seasons with a staging parquet for this season type, oldest first."""
+    suffix = f"__{season_type_slug}.parquet"
+    return sorted(
+        name[: -len(suffix)]
+        for name in os.listdir(STAGING_DIR)
+        if name.endswith(suffix)
+    )
+
+
+def load_staging_stack(
+    seasons: list[str], season_type_slug: str
+) -> tuple[pd.DataFrame, dict[str, pd.Series]]:
+    """
+    Load every season's staging parquet into one DataFrame keyed by
+    (Season, PLAYER_ID).
+
+    Staging schemas drift slightly between seasons (438–443 columns), so the
+    stack is the union of all columns.  The second return value maps each
+    season to its own column dtypes, which staging_stack_season() uses to
+    hand the phases exactly the frame a single-season load would produce.
+
+    When every season's partition of the staging dataset (staging_dataset.py)
+    is current, the stack is one filtered, column-projected dataset scan;
+    otherwise each season's staging file is read.
+    """
+    if all(partition_is_current(s, season_type_slug) for s in seasons):
+        schemas = {}
+        for season in seasons:
+            dtypes  = partition_dtypes(season, season_type_slug)
+            columns = staging_read_columns(partition_path(season, season_type_slug), dtypes.index, ["Season"])
+            schemas[season] = widen_float_dtypes(dtypes[columns])
+        print("[INFO] Reading staging stack from the staging dataset")
+        stack = load_staging_dataset(columns=columns, seasons=seasons, season_types=[season_type_slug])
+        # Categories in the scan are the union over seasons; decode them so
+        # staging_stack_season() re-encodes each season from its own values
+        stack = stack.astype({c: plain_dtype(t) for c, t in stack.dtypes.items()
+                              if isinstance(t, pd.CategoricalDtype)})
+    else:
+        stack, schemas = _read_staging_files(seasons, season_type_slug)
+
+    dupes = stack.duplicated(subset=["Season", "PLAYER_ID"])
+    if dupes.any():
+        raise RuntimeError(
+            f"Staging stack has {int(dupes.sum())} duplicate (Season, PLAYER_ID) rows."
+        )
+    return stack, schemas
+
+
+def _read_staging_files(
+    seasons: list[str], season_type_slug: str
+) -> tuple[pd.DataFrame, dict[str, pd.Series]]:
+    frames  = []
+    schemas = {}
+    for season in seasons:
+        df = read_staging(season_input_paths(season, season_type_slug)["staging"], ["Season"])
+        schemas[season] = df.dtypes
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True), schemas
+
+
+def staging_stack_season(stack: pd.DataFrame, schema: pd.Series, season: str) -> pd.DataFrame:
+    """Slice one season back out of the stack with its original columns and dtypes."""
+    df = stack.loc[stack["Season"] == season, list(schema.index)]
+    return df.astype(schema.to_dict()).reset_index(drop=True)
+
+
+def build_season(
+    season: str,
+    season_type: str,
+    df: pd.DataFrame | None = None,
+    pct_ast_pts_in_pa: float | None = None,
+    output: str | None = None,
+    write: bool = True,
+    profiler: PhaseProfiler | None = None,
+) -> pd.DataFrame:
+    """
+    Build one season's league table.
+
+    Args:
+        season:            e.g. "2024-25"
+        season_type:       "Regular Season" or "Playoffs"
+        df:                Staging DataFrame; read from the staging parquet when None.
+        pct_ast_pts_in_pa: PCT_AST_PTS_IN_PA; read from pct_ast_pts_in_pa.json when None.
+        output:            Output CSV path (default: assets/data/season/league-table-20YY.csv).
+        write:             Write the CSV.
+        profiler:          PhaseProfiler recording every step from the parquet
+                           load to the CSV write (see build_profile.py).
+
+    Returns:
+        The league-table DataFrame, as written to CSV.
+    """
+    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
+    paths = season_input_paths(season, season_type_slug)
+    prof  = profiler or PhaseProfiler()
+
+    if df is None:
+        check_season_inputs(paths)
+        print(f"[INFO] Loading staging: {paths['staging']}")
+        df = prof.call("read_staging", read_staging, paths["staging"], reads=[paths["staging"]])
+    elif not os.path.exists(paths["ctg"]):
+        raise FileNotFoundError(f"Missing CTG file: {paths['ctg']}. Run ctg_league_avgs.py first.")
+    print(f"[INFO] Staging shape: {df.shape[0]} rows × {df.shape[1]} cols")
+
+    config_reads = [paths["ctg"]] if pct_ast_pts_in_pa is not None else [paths["ctg"], paths["pct_ast"]]
+    cfg    = prof.call("load_season_config", load_season_config, paths, pct_ast_pts_in_pa, reads=config_reads)
+    out_df = build_season_table(df, cfg, season, season_type, prof)
+    if write:
+        out_path = output or default_output_path(season)
+        prof.call("write_season_table", write_season_table, out_df, out_path, writes=[out_path])
+    return out_df
+
+
+def run_single_season(args, profiler: PhaseProfiler) -> int:
+    output = args.output or default_output_path(args.season, args.output_dir)
+    profiler.context = {"season": args.season}
+    build_season(args.season, args.season_type, output=output, profiler=profiler)
     return 0
 
 
+def run_season_stack(args, season_type_slug: str, profiler: PhaseProfiler) -> int:
+    if args.seasons == ["all"]:
+        seasons = discover_seasons(season_type_slug)
+    else:
+        seasons = args.seasons
+    if not seasons:
+        raise FileNotFoundError(f"No staging files for {args.season_type} in {STAGING_DIR}.")
+
+    # Fail before any work if a season is missing an input
+    all_paths = {s: season_input_paths(s, season_type_slug) for s in seasons}
+    for paths in all_paths.values():
+        check_season_inputs(paths)
+
+    print(f"[INFO] Loading staging stack: {len(seasons)} seasons ({seasons[0]} … {seasons[-1]})")
+    stack, schemas = profiler.call(
+        "load_staging_stack", load_staging_stack, seasons, season_type_slug,
+        reads=[p["staging"] for p in all_paths.values()],
+    )
+    print(f"[INFO] Staging stack shape: {stack.shape[0]} rows × {stack.shape[1]} cols")
+
+    for season in seasons:
+        print(f"\n[INFO] ── {season} ──")
+        profiler.context = {"season": season}
+        df = profiler.call("staging_stack_season", staging_stack_season, stack, schemas[season], season)
+        print(f"[INFO] Staging shape: {df.shape[0]} rows × {df.shape[1]} cols")
+
+        paths    = all_paths[season]
+        cfg      = profiler.call("load_season_config", load_season_config, paths,
+                                 reads=[paths["ctg"], paths["pct_ast"]])
+        out_df   = build_season_table(df, cfg, season, args.season_type, profiler)
+        out_path = default_output_path(season, args.output_dir)
+        profiler.call("write_season_table", write_season_table, out_df, out_path, writes=[out_path])
+    profiler.context = {}
+
+    print(f"\n[OK] Built {len(seasons)} seasons.")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument("--season",       help='e.g. "2024-25"')
+    which.add_argument("--seasons",      nargs="+",
+                       help='Build several seasons in one run: "all" or e.g. 2013-14 2014-15')
+    parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
+    parser.add_argument("--output",      default=None,
+                        help="Override output CSV path (default: assets/data/season/league-table-20YY.csv)")
+    parser.add_argument("--output-dir",  default=None,
+                        help="Override output directory for league-table-20YY.csv (default: assets/data/season)")
+    parser.add_argument("--profile",     action="store_true",
+                        help=f"Write per-phase timings/memory/sizes to {os.path.relpath(PROFILE_PATH, REPO_ROOT)}")
+    parser.add_argument("--cprofile",    action="store_true",
+                        help=f"Also dump cProfile stats for the slowest phase to "
+                             f"{os.path.relpath(PSTATS_PATH, REPO_ROOT)} (implies --profile)")
+    args = parser.parse_args()
+
+    if args.seasons and args.output:
+        parser.error("--output applies to a single --season; use --output-dir with --seasons")
+
+    season_type_slug = "regular" if args.season_type == "Regular Season" else "playoffs"
+    profiler = PhaseProfiler(enabled=args.profile, cprofile=args.cprofile)
+
+    if args.seasons:
+        rc = run_season_stack(args, season_type_slug, profiler)
+    else:
+        rc = run_single_season(args, profiler)
+
+    if profiler.enabled:
+        meta = {
+            "seasons":     args.seasons or [args.season],
+            "season_type": args.season_type,
+        }
+        if args.cprofile:
+            meta["pstats_phase"] = profiler.dump_slowest_pstats(PSTATS_PATH)
+            meta["pstats_path"]  = os.path.relpath(PSTATS_PATH, REPO_ROOT).replace(os.sep, "/")
+        profiler.write_report(PROFILE_PATH, meta)
+    return rc
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
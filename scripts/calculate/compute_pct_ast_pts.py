@@ -19,6 +19,8 @@ REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
+from scripts.stage.staging_dtypes import read_staging_parquet
+
 # ---------------------------------------------------------------------------
 # Play type distributions: (CS, PU1, PU2, LT10_01, LT10_2)
 # See spec section "Play Type -> Tracking Column Distribution"
@@ -56,7 +58,37 @@ RESIDUAL_LEQ1_RATE = 0.55
 RESIDUAL_PPM = 2.2
 
 
-def load_inputs(season: str, season_type_slug: str) -> dict:
+def inputs_from_frames(tracking: dict, df_pt: pd.DataFrame, df_stage: pd.DataFrame) -> dict:
+    """
+    Reduce already-loaded inputs to what compute() needs.
+
+    Args:
+        tracking: The "values" dict from nba_tracking_shots.json.
+        df_pt:    Raw long-format play-type frame (nba_playtypes.parquet).
+        df_stage: Staging frame; only nba_pass__AST / nba_pass__AST_PTS_CREATED are used.
+    """
+    pt_fgm = df_pt.groupby("PLAY_TYPE")["FGM"].sum().to_dict()
+    total_ast_fgm = int(df_stage["nba_pass__AST"].sum())
+    total_ast_pts = int(df_stage["nba_pass__AST_PTS_CREATED"].sum())
+
+    return {
+        "tracking":      tracking,
+        "pt_fgm":        pt_fgm,
+        "total_ast_fgm": total_ast_fgm,
+        "total_ast_pts": total_ast_pts,
+    }
+
+
+def load_inputs(
+    season: str,
+    season_type_slug: str,
+    df_pt: pd.DataFrame | None = None,
+    df_stage: pd.DataFrame | None = None,
+) -> dict:
+    """
+    Load compute() inputs.  Play-type and staging frames that are passed in
+    (e.g. by scripts/run_season.py) are used as-is; the rest is read from disk.
+    """
     raw_dir     = os.path.join(REPO_ROOT, "assets", "data", "raw", season, season_type_slug)
     staging_path = os.path.join(REPO_ROOT, "assets", "data", "staging", f"{season}__{season_type_slug}.parquet")
 
@@ -69,26 +101,21 @@ def load_inputs(season: str, season_type_slug: str) -> dict:
         tracking = json.load(f)["values"]
 
     # Play type FGMs from raw parquet
-    pt_path = os.path.join(raw_dir, "nba_playtypes.parquet")
-    if not os.path.exists(pt_path):
-        raise FileNotFoundError(f"Missing play types: {pt_path}")
-    df_pt = pd.read_parquet(pt_path)
-    pt_fgm = df_pt.groupby("PLAY_TYPE")["FGM"].sum().to_dict()
+    if df_pt is None:
+        pt_path = os.path.join(raw_dir, "nba_playtypes.parquet")
+        if not os.path.exists(pt_path):
+            raise FileNotFoundError(f"Missing play types: {pt_path}")
+        df_pt = pd.read_parquet(pt_path, columns=["PLAY_TYPE", "FGM"])
 
     # Passing totals from staging parquet
-    if not os.path.exists(staging_path):
-        raise FileNotFoundError(f"Missing staging parquet: {staging_path}\n"
-                                f"Run: python scripts/stage/build_stage_season.py --season {season} --season-type ...")
-    df_stage = pd.read_parquet(staging_path, columns=["nba_pass__AST", "nba_pass__AST_PTS_CREATED"])
-    total_ast_fgm = int(df_stage["nba_pass__AST"].sum())
-    total_ast_pts = int(df_stage["nba_pass__AST_PTS_CREATED"].sum())
+    if df_stage is None:
+        if not os.path.exists(staging_path):
+            raise FileNotFoundError(f"Missing staging parquet: {staging_path}\n"
+                                    f"Run: python scripts/stage/build_stage_season.py --season {season} --season-type ...")
+        df_stage = read_staging_parquet(staging_path, columns=["nba_pass__AST", "nba_pass__AST_PTS_CREATED"],
+                                        widen_floats=True)
 
-    return {
-        "tracking":      tracking,
-        "pt_fgm":        pt_fgm,
-        "total_ast_fgm": total_ast_fgm,
-        "total_ast_pts": total_ast_pts,
-    }
+    return inputs_from_frames(tracking, df_pt, df_stage)
 
 
 def compute(inputs: dict, verbose: bool = True) -> dict:
@@ -308,22 +335,33 @@ def compute(inputs: dict, verbose: bool = True) -> dict:
     }
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(
-        description="Compute PCT_AST_PTS_IN_PA for a given season"
-    )
-    parser.add_argument("--season",      required=True, help='e.g. "2024-25"')
-    parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
-    args = parser.parse_args()
-
-    season           = args.season
-    season_type      = args.season_type
+def pct_ast_season(
+    season: str,
+    season_type: str,
+    df_pt: pd.DataFrame | None = None,
+    df_stage: pd.DataFrame | None = None,
+    write: bool = True,
+) -> dict:
+    """
+    Compute PCT_AST_PTS_IN_PA for one season and (optionally) write
+    pct_ast_pts_in_pa.json.
+
+    Args:
+        season:      e.g. "2024-25"
+        season_type: "Regular Season" or "Playoffs"
+        df_pt:       Raw play-type frame; read from disk when None.
+        df_stage:    Staging frame; read from disk when None.
+        write:       Write the JSON next to the raw inputs (what the CLI does).
+
+    Returns:
+        The JSON payload dict (PCT_AST_PTS_IN_PA is under output["values"]).
+    """
     season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
 
     print(f"[INFO] Computing PCT_AST_PTS_IN_PA for {season} ({season_type})")
     print()
 
-    inputs = load_inputs(season, season_type_slug)
+    inputs = load_inputs(season, season_type_slug, df_pt=df_pt, df_stage=df_stage)
     result = compute(inputs, verbose=True)
 
     pct = result["PCT_AST_PTS_IN_PA"]
@@ -362,16 +400,29 @@ def main() -> int:
         "validation": result["validation"],
     }
 
-    os.makedirs(out_dir, exist_ok=True)
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
-    os.replace(tmp_path, out_path)
+    if write:
+        os.makedirs(out_dir, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2)
+        os.replace(tmp_path, out_path)
 
-    print(f"\n[OK] Wrote {out_path}")
+        print(f"\n[OK] Wrote {out_path}")
 
     if not all_ok:
         print("[WARN] One or more validation checks outside expected bounds -- inspect output above.")
 
+    return output
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compute PCT_AST_PTS_IN_PA for a given season"
+    )
+    parser.add_argument("--season",      required=True, help='e.g. "2024-25"')
+    parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
+    args = parser.parse_args()
+
+    pct_ast_season(args.season, args.season_type)
     return 0
 
 
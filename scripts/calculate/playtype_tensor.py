@@ -0,0 +1,194 @@
+"""
+Dense player × playtype × field store for the Phase 1 playtype results.
+
+Phases 1a/1b used to keep one DataFrame per playtype slug, and every category
+total in Phases 3a, 5 and 6 rebuilt a PLAYER_ID-indexed concat of those frames.
+PlaytypeTensor keeps the same numbers in one float64 block aligned to a single
+player axis, so a category total is one masked reduction over the slug axis.
+
+Storage is (fields, slugs, players), C-contiguous.  Reducing over the slug axis
+therefore adds whole player vectors in slug order — the same summation order
+as pd.concat(frames, axis=1).fillna(0.0).sum(axis=1), which keeps the season
+CSV byte-for-byte identical to the per-slug implementation.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+class PlaytypeTensor:
+    """
+    Per-player playtype values aligned to one PLAYER_ID axis.
+
+    Attributes:
+        player_ids: 1-D array of PLAYER_IDs (player axis).
+        players:    1-D object array of display names, parallel to player_ids.
+        slugs:      Playtype slugs (slug axis), e.g. ["iso", "prballhandler", ...].
+        fields:     Field names (field axis), e.g. ["poss", "pts", ...].
+        present:    bool array (slugs × players); True where the player has data
+                    for that playtype (POSS not null in staging).
+
+    Cells where present is False hold 0.0, so reductions need no reindexing.
+    Cells where present is True keep whatever the formulas produced, NaN included.
+    """
+
+    def __init__(
+        self,
+        player_ids: np.ndarray,
+        players: np.ndarray,
+        slugs: list[str],
+        fields: list[str],
+        data: np.ndarray,
+        present: np.ndarray,
+    ) -> None:
+        self.player_ids = player_ids
+        self.players    = players
+        self.slugs      = list(slugs)
+        self.fields     = list(fields)
+        self._data      = data
+        self.present    = present
+        self._slug_pos  = {s: i for i, s in enumerate(self.slugs)}
+        self._field_pos = {f: i for i, f in enumerate(self.fields)}
+
+    # ── Construction ──────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_planes(
+        cls,
+        player_ids: np.ndarray,
+        players: np.ndarray,
+        slugs: list[str],
+        planes: dict[str, np.ndarray],
+        present: np.ndarray,
+    ) -> "PlaytypeTensor":
+        """Build from {field: (slugs × players) array}; absent cells are zeroed."""
+        fields = list(planes)
+        data = np.empty((len(fields), len(slugs), len(player_ids)), dtype=np.float64)
+        for i, f in enumerate(fields):
+            data[i] = planes[f]
+        data[:, ~present] = 0.0
+        return cls(player_ids, players, slugs, fields, data, present)
+
+    @classmethod
+    def from_frames(cls, frames: dict[str, pd.DataFrame]) -> "PlaytypeTensor":
+        """
+        Build from per-slug DataFrames (the phase1a_playtype / phase1b_playtype
+        output shape).  The player axis is the union of PLAYER_IDs in first-seen
+        order; fields are the numeric columns of the first frame.
+        """
+        slugs = list(frames)
+        if not slugs:
+            empty = np.empty(0)
+            return cls(empty, empty.astype(object), [], [], np.empty((0, 0, 0)),
+                       np.empty((0, 0), dtype=bool))
+
+        first  = frames[slugs[0]]
+        fields = [c for c in first.columns if c not in ("PLAYER_ID", "Player")]
+
+        ids_all = pd.concat([frames[s]["PLAYER_ID"] for s in slugs], ignore_index=True)
+        index   = pd.Index(ids_all.drop_duplicates().to_numpy())
+
+        names = pd.Series(pd.NA, index=index, dtype=object)
+        for s in reversed(slugs):
+            if "Player" in frames[s].columns:
+                names.loc[frames[s]["PLAYER_ID"].to_numpy()] = frames[s]["Player"].to_numpy()
+
+        data    = np.zeros((len(fields), len(slugs), len(index)), dtype=np.float64)
+        present = np.zeros((len(slugs), len(index)), dtype=bool)
+        for j, s in enumerate(slugs):
+            pos = index.get_indexer(frames[s]["PLAYER_ID"].to_numpy())
+            present[j, pos] = True
+            for i, f in enumerate(fields):
+                data[i, j, pos] = frames[s][f].to_numpy(dtype=np.float64)
+
+        return cls(index.to_numpy(), names.to_numpy(), slugs, fields, data, present)
+
+    # ── Accessors ─────────────────────────────────────────────────────────────
+
+    @property
+    def values(self) -> np.ndarray:
+        """(players × slugs × fields) view of the underlying block."""
+        return self._data.transpose(2, 1, 0)
+
+    def plane(self, field: str) -> np.ndarray:
+        """(slugs × players) view of one field."""
+        return self._data[self._field_pos[field]]
+
+    def slug_index(self, slugs: list[str]) -> np.ndarray:
+        """Positions of the given slugs on the slug axis (unknown slugs skipped)."""
+        return np.array([self._slug_pos[s] for s in slugs if s in self._slug_pos], dtype=np.intp)
+
+    def category_sum(self, slugs: list[str], field: str) -> np.ndarray:
+        """
+        Per-player sum of one field across the given slugs.
+        Players absent from a slug — and NaN results inside a slug — count as 0.
+        """
+        idx = self.slug_index(slugs)
+        if len(idx) == 0:
+            return np.zeros(len(self.player_ids))
+        block = self.plane(field)[idx]
+        if np.isnan(block).any():
+            block = np.nan_to_num(block, nan=0.0)
+        return block.sum(axis=0)
+
+    def has_any(self, slugs: list[str]) -> np.ndarray:
+        """bool per player: True if present in at least one of the given slugs."""
+        idx = self.slug_index(slugs)
+        if len(idx) == 0:
+            return np.zeros(len(self.player_ids), dtype=bool)
+        return self.present[idx].any(axis=0)
+
+    # ── Transformations ───────────────────────────────────────────────────────
+
+    def with_planes(self, planes: dict[str, np.ndarray]) -> "PlaytypeTensor":
+        """Return a new tensor with extra fields appended (absent cells zeroed)."""
+        extra = np.empty((len(planes), len(self.slugs), len(self.player_ids)), dtype=np.float64)
+        for i, f in enumerate(planes):
+            extra[i] = planes[f]
+        extra[:, ~self.present] = 0.0
+        data = np.concatenate([self._data, extra], axis=0)
+        return PlaytypeTensor(self.player_ids, self.players, self.slugs,
+                              self.fields + list(planes), data, self.present)
+
+    def reindex(self, player_ids) -> "PlaytypeTensor":
+        """
+        Align to another player axis (e.g. the Phase 3a/6 base index).
+        Players not in this tensor come back absent with zero values.
+        """
+        target = np.asarray(player_ids)
+        if len(target) == len(self.player_ids) and np.array_equal(target, self.player_ids):
+            return self
+        pos  = pd.Index(self.player_ids).get_indexer(target)
+        hit  = pos >= 0
+        data = np.zeros((len(self.fields), len(self.slugs), len(target)), dtype=np.float64)
+        data[:, :, hit] = self._data[:, :, pos[hit]]
+        present = np.zeros((len(self.slugs), len(target)), dtype=bool)
+        present[:, hit] = self.present[:, pos[hit]]
+        players = np.full(len(target), pd.NA, dtype=object)
+        players[hit] = self.players[pos[hit]]
+        return PlaytypeTensor(target, players, self.slugs, self.fields, data, present)
+
+    def frame(self, slug: str) -> pd.DataFrame:
+        """
+        Per-slug DataFrame in the phase1a_playtype / phase1b_playtype shape:
+        PLAYER_ID, Player, then every field, for players present in the slug.
+        """
+        j    = self._slug_pos[slug]
+        mask = self.present[j]
+        cols = {"PLAYER_ID": self.player_ids[mask], "Player": self.players[mask]}
+        for i, f in enumerate(self.fields):
+            cols[f] = self._data[i, j, mask]
+        return pd.DataFrame(cols)
+
+    def frames(self) -> dict[str, pd.DataFrame]:
+        """All slugs as per-slug DataFrames, keyed by slug."""
+        return {s: self.frame(s) for s in self.slugs}
+
+
+def as_playtype_tensor(pt: "PlaytypeTensor | dict[str, pd.DataFrame]") -> PlaytypeTensor:
+    """Accept either a PlaytypeTensor or a dict of per-slug frames."""
+    if isinstance(pt, PlaytypeTensor):
+        return pt
+    return PlaytypeTensor.from_frames(pt)
@@ -0,0 +1,343 @@
+"""
+what_if.py
+
+Vectorized parameter sweeps over the fixed constants in config.py.
+
+sweep_points_created() evaluates K config variants in one pass: the
+cfg-independent work (ScoringShareOfTOV, Phase 1a, Phase 2, and the Phase 3a
+columns that no constant touches) runs once, then the cfg-dependent part of
+Phases 3a–6 runs on arrays with a leading variant axis — (K × players) for
+per-player values and (K × slugs × players) for the Phase 1b playtype block.
+
+Only the constants in SWEEP_CONSTANTS can vary.  CTG values and
+PCT_AST_PTS_IN_PA are season inputs and come from the base cfg.
+
+Usage:
+    python scripts/calculate/what_if.py --season 2024-25 --season-type "Regular Season" \\
+        --grid PADDING_VOLUME=200,400,800 --grid HC_CLAMP_MAX=0.85,0.86859,0.88
+    python scripts/calculate/what_if.py --seasons all --season-type "Regular Season" \\
+        --grid FR_MIN_POSS=400,600,800 --output reports/what_if.csv
+
+    from scripts.calculate.what_if import sweep_points_created, variant_grid
+    variants = variant_grid({"PADDING_VOLUME": [200, 400, 800]})
+    pc = sweep_points_created(df_stg, cfg, variants)
+    pc["Total PC"]            # players × K
+"""
+
+import argparse
+import itertools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.calculate.build_season import (
+    _ALL_SCORING_SLUGS,
+    _CRASH_SLUGS,
+    _OBS_SLUGS,
+    _ON_BALL_SLUGS,
+    _PARTNER_SLUGS,
+    _SPACE_SLUGS,
+    STAGING_DIR,
+    compute_scoring_share_of_tov,
+    discover_seasons,
+    load_season_config,
+    phase1a_playtypes,
+    phase2_transition,
+    phase3a_passing,
+    read_staging,
+    season_input_paths,
+)
+
+# Constants that may vary between variants (the fixed block of config.py)
+SWEEP_CONSTANTS = (
+    "PCT_FT_AST_NO_SHOT", "LG_AVG_PP_FT_AST", "PADDING_VOLUME",
+    "HC_CLAMP_MAX", "HC_CLAMP_MIN",
+    "HC_REG_INTERCEPT", "HC_REG_PLAYMAKING", "HC_REG_OBS", "HC_REG_HCPCT",
+    "TR_REG_INTERCEPT", "TR_REG_TRANSITION", "TR_REG_PLAYMAKING", "TR_REG_HCPCT",
+    "FR_INTERCEPT", "FR_LINEAR", "FR_QUADRATIC", "FR_MIN_POSS",
+)
+
+
+def variant_grid(axes: dict[str, list]) -> list[dict]:
+    """
+    Cartesian product of per-constant value lists, as a list of override dicts.
+
+    variant_grid({"PADDING_VOLUME": [200, 400], "FR_MIN_POSS": [500, 600]})
+    → 4 variants, PADDING_VOLUME varying slowest.
+    """
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+
+def _params(cfg: dict, variants: list[dict]) -> dict[str, np.ndarray]:
+    """{constant: (K × 1) array} for every swept constant, base cfg where not overridden."""
+    unknown = sorted({k for v in variants for k in v} - set(SWEEP_CONSTANTS))
+    if unknown:
+        raise ValueError(f"Cannot sweep {unknown}; sweepable constants: {list(SWEEP_CONSTANTS)}")
+    return {
+        name: np.array([float(v.get(name, cfg[name])) for v in variants])[:, None]
+        for name in SWEEP_CONSTANTS
+    }
+
+
+def sweep_points_created(df_stg: pd.DataFrame, cfg: dict, variants: list[dict]) -> dict[str, pd.DataFrame]:
+    """
+    Evaluate Phases 3a–6 Points Created for K config variants at once.
+
+    Args:
+        df_stg:   Staging DataFrame (read_staging() columns are enough).
+        cfg:      Base config dict from load_season_config() (CTG constants and
+                  PCT_AST_PTS_IN_PA included).
+        variants: K override dicts, e.g. [{}, {"PADDING_VOLUME": 200}];
+                  {} is the base cfg.  Keys must be in SWEEP_CONSTANTS.
+
+    Returns:
+        {
+            "Total PC":           players × K season-total Points Created
+                                  (ex. floor raising; NaN without any category data),
+            "Floor raising PC/g": players × K floor raising PC per game
+                                  (NaN for players with no on-ball data),
+        }
+        Both indexed by PLAYER_ID in Phase 6 row order, columns 0..K-1.
+        Total PC/g (floor raising adj.) is Total PC / Games + Floor raising PC/g.
+    """
+    if not variants:
+        raise ValueError("variants is empty")
+    p = _params(cfg, variants)
+    pen    = cfg["CTG_TOV_PENALTY"]
+    hc_ppp = cfg["CTG_HC_PPP"]
+
+    # ── cfg-independent work, once ────────────────────────────────────────────
+    df          = compute_scoring_share_of_tov(df_stg)
+    pt1a        = phase1a_playtypes(df)
+    pt2, tr_agg = phase2_transition(df, cfg)
+    pt3a, _     = phase3a_passing(df, pt1a, pt2, cfg)
+
+    ids  = pt3a["PLAYER_ID"].to_numpy()
+    base = pt3a.set_index("PLAYER_ID")
+    passing = (
+        df.dropna(subset=["PLAYER_ID"]).drop_duplicates(subset=["PLAYER_ID"])
+        .set_index("PLAYER_ID")[["nba_pass__POTENTIAL_AST", "nba_pass__AST_PTS_CREATED"]]
+        .reindex(ids).fillna(0.0)
+    )
+
+    def col(frame: pd.DataFrame, name: str) -> np.ndarray:
+        return frame[name].to_numpy(dtype=np.float64)
+
+    ft_assist  = col(base, "ft_assist")
+    pm_tovs    = col(base, "playmaking_tovs")
+    hc_pm_tovs = col(base, "hc_playmaking_tovs")
+    obs        = col(base, "obs_plays")
+    hc_sp      = col(base, "hc_scoring_plays")
+    tr_sp      = col(base, "tr_scoring_plays")
+    total_sp   = col(base, "total_scoring_plays")
+    ob_pass_tovs = col(base, "on_ball_passing_tovs")
+
+    t1a = pt1a.reindex(ids)
+    obs_sp_sum   = t1a.category_sum(_OBS_SLUGS, "scoring_plays").sum()
+    obs_tovs_sum = t1a.category_sum(_OBS_SLUGS, "scoring_tovs").sum()
+
+    # ── Phase 3a (K × players) ────────────────────────────────────────────────
+    ex_tov = col(passing, "nba_pass__POTENTIAL_AST") + ft_assist * p["PCT_FT_AST_NO_SHOT"]
+    pm_pts = (col(passing, "nba_pass__AST_PTS_CREATED") * cfg["PCT_AST_PTS_IN_PA"]
+              + ft_assist * p["LG_AVG_PP_FT_AST"])
+    tpm = ex_tov + pm_tovs
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hc_pct = np.where(total_sp > 0, hc_sp / total_sp, p["HC_CLAMP_MIN"])
+        hc_pct = np.minimum(np.maximum(hc_pct, p["HC_CLAMP_MIN"]), p["HC_CLAMP_MAX"])
+
+        est_hc = (p["HC_REG_INTERCEPT"] + tpm * p["HC_REG_PLAYMAKING"]
+                  + obs * p["HC_REG_OBS"] + hc_pct * p["HC_REG_HCPCT"])
+        est_tr = (p["TR_REG_INTERCEPT"] + tr_sp * p["TR_REG_TRANSITION"]
+                  + tpm * p["TR_REG_PLAYMAKING"] + hc_pct * p["TR_REG_HCPCT"])
+        est_hc = np.minimum(np.maximum(est_hc, 0.0), tpm)
+        est_tr = np.minimum(np.maximum(est_tr, 0.0), tpm)
+
+        lg_avg_pppa = (pm_pts.sum(axis=1) / ex_tov.sum(axis=1))[:, None]
+        pad         = p["PADDING_VOLUME"]
+        pppa_padded = np.where(ex_tov > 0, (lg_avg_pppa * pad + pm_pts) / (ex_tov + pad), 0.0)
+
+        den = obs_sp_sum + est_hc.sum(axis=1)
+        lg_avg_tov = np.where(den > 0, (obs_tovs_sum + ob_pass_tovs.sum()) / den, 0.0)
+        hc_ppp_w_tov = (hc_ppp + lg_avg_tov * pen)[:, None]
+
+        # ── Phase 1b (K × slugs × players): only pab feeds Points Created ─────
+        poss          = t1a.plane("poss")
+        pts           = t1a.plane("pts")
+        scoring_tovs  = t1a.plane("scoring_tovs")
+        scoring_plays = t1a.plane("scoring_plays")
+        tab_avg  = np.nansum(pts, axis=1) / np.nansum(scoring_plays, axis=1)
+        baseline = np.array([
+            hc_ppp if s == "offrebound" else max(hc_ppp, tab_avg[j])
+            for j, s in enumerate(t1a.slugs)
+        ])
+        xtovs = poss[None] * lg_avg_tov[:, None, None]
+        pab   = pts[None] + (scoring_tovs[None] - xtovs) * pen - (baseline[:, None] * scoring_plays)[None]
+        pab[:, ~t1a.present] = 0.0
+        pab = np.nan_to_num(pab, nan=0.0)
+
+        def cat_pab(slugs: list[str]) -> np.ndarray:
+            return pab[:, t1a.slug_index(slugs)].sum(axis=1)
+
+        # ── Phase 3b ──────────────────────────────────────────────────────────
+        denom_norm = est_hc + est_tr
+        factor   = np.where(denom_norm > 0, tpm / denom_norm, 0.0)
+        hc_final = np.where(tpm == 0, 0.0, est_hc * factor)
+        tr_final = np.where(tpm == 0, 0.0, est_tr * factor)
+
+        ratio      = tr_agg["TR_PPP_RATIO"]
+        pppa_denom = tr_final * ratio + hc_final
+        hc_pppa    = np.where(pppa_denom > 0, pm_pts / pppa_denom, 0.0)
+        tr_pm_pts  = tr_final * (hc_pppa * ratio)
+        hc_padded  = np.where(pppa_denom > 0, pppa_padded * ex_tov / pppa_denom, 0.0)
+        hc_pm_pab  = hc_padded * (hc_final - hc_pm_tovs) + hc_pm_tovs * pen - hc_final * hc_ppp_w_tov
+
+        # ── Phase 4 (K × transition players) ──────────────────────────────────
+        pos = pd.Index(ids).get_indexer(pt2["PLAYER_ID"].to_numpy())
+        hit = pos >= 0
+        tr_plays_pm = np.zeros((len(variants), len(pt2)))
+        tr_pts_pm   = np.zeros((len(variants), len(pt2)))
+        tr_plays_pm[:, hit] = np.nan_to_num(tr_final[:, pos[hit]], nan=0.0)
+        tr_pts_pm[:, hit]   = np.nan_to_num(tr_pm_pts[:, pos[hit]], nan=0.0)
+
+        tov_rate  = tr_agg["TR_OVERALL_TOV_RATE"]
+        t_poss    = col(pt2, "poss")
+        t_pts     = col(pt2, "pts")
+        t_played  = col(pt2, "poss_played")
+        t_sp      = col(pt2, "scoring_plays")
+        t_sc_tovs = col(pt2, "scoring_tovs")
+        t_pm_tovs = col(pt2, "transition_playmaking_tovs")
+
+        xtov     = t_poss * tov_rate
+        x_pm     = tr_plays_pm * tov_rate
+        total    = t_sp + tr_plays_pm
+        per_100  = np.where(t_played > 0, 100 * total / t_played, 0.0)
+        up_to_la = np.minimum(per_100, tr_agg["TR_AVG_PLAYS"])
+        base_ppp = np.where(
+            per_100 > 0,
+            (up_to_la * tr_agg["TR_AVG_PPP"] + (per_100 - up_to_la) * hc_ppp) / per_100,
+            tr_agg["TR_AVG_PPP"],
+        )
+        tr_sc_pc = (t_pts + pen * t_sc_tovs) - (base_ppp * t_sp + pen * (xtov - x_pm))
+        tr_pm_pc = (tr_pts_pm + pen * t_pm_tovs) - (base_ppp * tr_plays_pm + pen * x_pm)
+
+    tr_pc = np.zeros((len(variants), len(ids)))
+    tr_pc[:, pos[hit]] = np.nan_to_num(tr_sc_pc[:, hit], nan=0.0) + np.nan_to_num(tr_pm_pc[:, hit], nan=0.0)
+
+    # ── Phase 6: Total PC ─────────────────────────────────────────────────────
+    ob_pc  = cat_pab(_ON_BALL_SLUGS) + np.nan_to_num(hc_pm_pab, nan=0.0)
+    tot_pc = ob_pc + cat_pab(_PARTNER_SLUGS) + cat_pab(_SPACE_SLUGS) + cat_pab(_CRASH_SLUGS) + tr_pc
+    has_any_cat = t1a.has_any(_ALL_SCORING_SLUGS) | np.isin(ids, pt2["PLAYER_ID"].to_numpy())
+    tot_pc[:, ~has_any_cat] = np.nan
+
+    # ── Phase 5: Floor raising PC/g ───────────────────────────────────────────
+    on_ball = t1a.has_any(_ON_BALL_SLUGS)
+    stg = (
+        df.dropna(subset=["PLAYER_ID"]).drop_duplicates(subset=["PLAYER_ID"])
+        .set_index("PLAYER_ID").reindex(ids)
+    )
+    gp    = col(stg, "nba_trad__GP")[on_ball]
+    oposs = col(stg, "pbp__OffPoss")[on_ball]
+    ob_plays = (t1a.category_sum(_ON_BALL_SLUGS, "scoring_plays")[on_ball]
+                + np.nan_to_num(hc_final[:, on_ball], nan=0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x      = ob_plays / gp
+        raw_fr = p["FR_INTERCEPT"] + p["FR_LINEAR"] * x + p["FR_QUADRATIC"] * x ** 2
+        qual   = (oposs >= p["FR_MIN_POSS"]) & ~np.isnan(raw_fr)
+        fr_baseline = np.where(qual, raw_fr, 0.0).sum(axis=1) / qual.sum(axis=1)
+    fr_pc = np.full((len(variants), len(ids)), np.nan)
+    fr_pc[:, on_ball] = raw_fr - fr_baseline[:, None]
+
+    index = pd.Index(ids, name="PLAYER_ID")
+    return {
+        "Total PC":           pd.DataFrame(tot_pc.T, index=index),
+        "Floor raising PC/g": pd.DataFrame(fr_pc.T, index=index),
+    }
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def parse_grid(specs: list[str]) -> dict[str, list[float]]:
+    """["PADDING_VOLUME=200,400"] → {"PADDING_VOLUME": [200.0, 400.0]}"""
+    axes = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise ValueError(f"Bad --grid {spec!r}; expected NAME=v1,v2,...")
+        axes[name.strip()] = [float(v) for v in values.split(",")]
+    return axes
+
+
+def sweep_season(season: str, season_type: str, variants: list[dict]) -> pd.DataFrame:
+    """One season's sweep as a long DataFrame (one row per player × variant)."""
+    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
+    paths = season_input_paths(season, season_type_slug)
+    df    = read_staging(paths["staging"])
+    cfg   = load_season_config(paths)
+    res   = sweep_points_created(df, cfg, variants)
+
+    index = res["Total PC"].index
+    ident = (
+        df.dropna(subset=["PLAYER_ID"]).drop_duplicates(subset=["PLAYER_ID"])
+        .set_index("PLAYER_ID").reindex(index)
+    )
+    swept  = sorted({name for v in variants for name in v})
+    frames = []
+    for k, v in enumerate(variants):
+        frames.append(pd.DataFrame({
+            "Season":             season,
+            "PLAYER_ID":          index,
+            "Player":             ident["Player"].to_numpy(),
+            "Games":              ident["nba_trad__GP"].to_numpy(),
+            "variant":            k,
+            **{name: v.get(name, cfg[name]) for name in swept},
+            "Total PC":           res["Total PC"][k].to_numpy(),
+            "Floor raising PC/g": res["Floor raising PC/g"][k].to_numpy(),
+        }))
+    out = pd.concat(frames, ignore_index=True)
+    return out[out["Player"].notna()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument("--season",       help='e.g. "2024-25"')
+    which.add_argument("--seasons",      nargs="+", help='"all" or e.g. 2013-14 2014-15')
+    parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
+    parser.add_argument("--grid",        action="append", required=True,
+                        help="NAME=v1,v2,... (repeatable; variants are the cartesian product)")
+    parser.add_argument("--output",      default=os.path.join(REPO_ROOT, "reports", "what_if.csv"))
+    args = parser.parse_args()
+
+    season_type_slug = "regular" if args.season_type == "Regular Season" else "playoffs"
+    if args.seasons == ["all"]:
+        seasons = discover_seasons(season_type_slug)
+    else:
+        seasons = args.seasons or [args.season]
+    if not seasons:
+        raise FileNotFoundError(f"No staging files for {args.season_type} in {STAGING_DIR}.")
+
+    variants = variant_grid(parse_grid(args.grid))
+    print(f"[INFO] {len(variants)} variants × {len(seasons)} seasons")
+
+    frames = []
+    for season in seasons:
+        print(f"[INFO] ── {season} ──")
+        frames.append(sweep_season(season, args.season_type, variants))
+
+    out = pd.concat(frames, ignore_index=True)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    out.to_csv(args.output, index=False)
+    print(f"[OK] Written: {args.output} ({len(out)} rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,45 +1,56 @@
+"""
+ctg_league_avgs.py
+
+Scrapes the Cleaning the Glass league averages (TOV%, half-court and putback
+efficiency) into assets/data/raw/{season}/{slug}/ctg_league_averages.json.
+
+Several seasons and season types can be fetched in one run and one session:
+
+    python scripts/ingest/ctg_league_avgs.py --season 2025-26 --season-type "Regular Season"
+    python scripts/ingest/ctg_league_avgs.py --season 2021-22 2022-23 2023-24 --season-type "Regular Season" Playoffs
+
+With CTG_EMAIL / CTG_PASSWORD set, the WordPress login happens once and its
+cookies are saved to CTG_SESSION_PATH (gitignored); later runs reuse them
+until they expire, so a historical backfill costs one login.  --fresh-login
+ignores the saved cookies.
+
+Only the tr.league_averages row of each page is read: the page is scanned
+for the table's id and parsed from there with html.parser, stopping at the
+end of that row.
+"""
+
 import argparse
 import json
 import os
+import re
 import sys
 import time
-from datetime import datetime, timezone
-from typing import Callable, TypeVar
+from html.parser import HTMLParser
 
 import requests
-from bs4 import BeautifulSoup
 
-T = TypeVar("T")
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.ingest.ingest_client import (  # noqa: E402
+    HTTP_CACHE_DIR,
+    ensure_dir,
+    ingest_session,
+    utc_now_iso,
+    with_retries,
+    write_json_if_changed,
+)
 
 CTG_BASE = "https://cleaningtheglass.com"
 CTG_LOGIN_URL = f"{CTG_BASE}/wp-login.php"
 CTG_FOURFACTORS_URL = f"{CTG_BASE}/stats/league/fourfactors"
 CTG_CONTEXT_URL = f"{CTG_BASE}/stats/league/context"
 
-
-def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-def ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
-
-
-def with_retries(fn: Callable[[], T], label: str, attempts: int = 5) -> T:
-    last_err: Exception | None = None
-    for i in range(1, attempts + 1):
-        try:
-            return fn()
-        except Exception as e:
-            last_err = e
-            if i == attempts:
-                break
-            wait = 2 ** i
-            print(f"[WARN] {label} failed (attempt {i}/{attempts}): {e}")
-            print(f"[WARN] Waiting {wait}s then retrying...")
-            time.sleep(wait)
-    assert last_err is not None
-    raise last_err
+CTG_SESSION_PATH = os.path.join(HTTP_CACHE_DIR, "cleaningtheglass.com", "session_cookies.json")
+CTG_LOGIN_COOKIE_PREFIX = "wordpress_logged_in_"
+# Lifetime assumed for saved cookies that carry no expiry of their own
+CTG_SESSION_MAX_AGE = 2 * 24 * 3600
 
 
 def ctg_season_param(season: str) -> int:
@@ -62,6 +73,7 @@ def ctg_login(session: requests.Session, email: str, password: str) -> None:
         "wp-submit": "Log In",
         "redirect_to": CTG_FOURFACTORS_URL,
         "testcookie": "1",
+        "rememberme": "forever",
     }
     resp = session.post(CTG_LOGIN_URL, data=payload, timeout=30, allow_redirects=True)
     resp.raise_for_status()
@@ -73,30 +85,166 @@ def ctg_login(session: requests.Session, email: str, password: str) -> None:
         )
 
 
+def save_session_cookies(session: requests.Session, path: str = CTG_SESSION_PATH) -> None:
+    """Save session's CTG cookies (with their expiry) to path, readable by the owner only."""
+    cookies = [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path,
+         "expires": c.expires, "secure": c.secure}
+        for c in session.cookies if "cleaningtheglass.com" in c.domain
+    ]
+    ensure_dir(os.path.dirname(path))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"saved_at": time.time(), "cookies": cookies}, f, indent=2)
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, path)
+
+
+def load_session_cookies(session: requests.Session, path: str = CTG_SESSION_PATH, now: float | None = None) -> bool:
+    """
+    Load the unexpired cookies saved at path into session.  Cookies without an
+    expiry count as expired CTG_SESSION_MAX_AGE after they were saved.
+
+    Returns:
+        True if an unexpired WordPress login cookie was loaded.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return False
+    now = time.time() if now is None else now
+    logged_in = False
+    for c in saved.get("cookies", []):
+        expires = c["expires"] if c["expires"] is not None else saved["saved_at"] + CTG_SESSION_MAX_AGE
+        if expires <= now:
+            continue
+        session.cookies.set_cookie(requests.cookies.create_cookie(
+            c["name"], c["value"], domain=c["domain"], path=c["path"], expires=c["expires"], secure=c["secure"],
+        ))
+        logged_in |= c["name"].startswith(CTG_LOGIN_COOKIE_PREFIX)
+    return logged_in
+
+
+def ctg_session(email: str, password: str, fresh_login: bool = False,
+                session_path: str = CTG_SESSION_PATH) -> tuple[requests.Session, str]:
+    """
+    One session for every CTG request of a run: saved login cookies if still
+    valid, else a fresh login (saved for later runs), else anonymous.
+
+    Returns:
+        (session, auth) with auth "saved" | "login" | "anonymous".
+    """
+    session = ingest_session()
+    session.headers.update({"User-Agent": "Mozilla/5.0"})
+
+    if not (email and password):
+        print("[INFO] CTG_EMAIL/CTG_PASSWORD not set — fetching without authentication.")
+        return session, "anonymous"
+    if not fresh_login and load_session_cookies(session, session_path):
+        print(f"[OK] Reusing saved CTG session: {session_path}")
+        return session, "saved"
+
+    session.cookies.clear()
+    try:
+        ctg_login(session, email, password)
+    except Exception as e:
+        print(
+            f"[WARN] CTG login failed: {e}. "
+            "Proceeding without auth (league averages are publicly accessible)."
+        )
+        session.cookies.clear()
+        return session, "anonymous"
+    save_session_cookies(session, session_path)
+    print("[OK] CTG login successful (session saved)")
+    return session, "login"
+
+
 def _fetch_page(session: requests.Session, url: str, params: dict) -> str:
     resp = session.get(url, params=params, timeout=30)
     resp.raise_for_status()
     return resp.text
 
 
-def _parse_stat_cells(table_tag, label: str) -> list:
-    """Return the td.stat.value cells from the league_averages thead row."""
-    thead = table_tag.find("thead")
-    if not thead:
-        raise ValueError(f"No <thead> found in table '{label}'")
-    row = thead.find("tr", class_="league_averages")
-    if not row:
-        raise ValueError(f"No tr.league_averages found in thead of table '{label}'")
-    cells = row.select("td.stat.value")
-    if not cells:
-        raise ValueError(f"No td.stat.value cells found in league_averages row of '{label}'")
-    return cells
-
-
-def _cell_float(cells: list, idx: int, label: str) -> float:
+class _RowDone(Exception):
+    pass
+
+
+class _LeagueAveragesParser(HTMLParser):
+    """
+    Collects the td.stat.value texts of the thead tr.league_averages row of
+    the first table fed to it; raises _RowDone at the end of that row (or of
+    the table).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.saw_thead = False
+        self.saw_row   = False
+        self.cells: list[str] = []
+        self._in_thead = False
+        self._in_row   = False
+        self._text: list[str] | None = None
+
+    def _end_cell(self) -> None:
+        if self._text is not None:
+            self.cells.append("".join(self._text).strip())
+            self._text = None
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get("class") or "").split()
+        if tag == "thead":
+            self._in_thead = self.saw_thead = True
+        elif tag == "tr" and self._in_thead and "league_averages" in classes:
+            self._in_row = self.saw_row = True
+        elif tag == "td" and self._in_row:
+            self._end_cell()
+            if "stat" in classes and "value" in classes:
+                self._text = []
+
+    def handle_endtag(self, tag):
+        if tag == "td":
+            self._end_cell()
+        elif tag == "tr" and self._in_row:
+            self._end_cell()
+            raise _RowDone
+        elif tag == "thead":
+            self._in_thead = False
+        elif tag == "table":
+            raise _RowDone
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text.append(data)
+
+
+def _parse_stat_cells(html: str, table_id: str, page: str) -> list[str]:
+    """Return the td.stat.value texts of the league_averages thead row of table#table_id."""
+    match = re.search(rf"""<table\b[^>]*\bid=["']?{re.escape(table_id)}["'\s>]""", html)
+    if not match:
+        raise ValueError(
+            f"Could not find table#{table_id} on the {page} page. "
+            "Page structure may have changed."
+        )
+    parser = _LeagueAveragesParser()
+    try:
+        parser.feed(html[match.start():])
+        parser.close()
+    except _RowDone:
+        pass
+    if not parser.saw_thead:
+        raise ValueError(f"No <thead> found in table '{table_id}'")
+    if not parser.saw_row:
+        raise ValueError(f"No tr.league_averages found in thead of table '{table_id}'")
+    if not parser.cells:
+        raise ValueError(f"No td.stat.value cells found in league_averages row of '{table_id}'")
+    return parser.cells
+
+
+def _cell_float(cells: list[str], idx: int, label: str) -> float:
     """Extract a float from a stat cell, stripping a trailing % if present."""
     try:
-        raw = cells[idx].get_text(strip=True)
+        raw = cells[idx]
     except IndexError:
         raise ValueError(
             f"Cell index {idx} out of range ({len(cells)} cells total) in table '{label}'"
@@ -113,14 +261,7 @@ def fetch_fourfactors(session: requests.Session, season: str, season_type: str)
 
     def _call() -> dict:
         html = _fetch_page(session, CTG_FOURFACTORS_URL, params)
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.find("table", id="league_four_factors")
-        if not table:
-            raise ValueError(
-                "Could not find table#league_four_factors on the fourfactors page. "
-                "Page structure may have changed."
-            )
-        cells = _parse_stat_cells(table, "league_four_factors")
+        cells = _parse_stat_cells(html, "league_four_factors", "fourfactors")
         # Index 5 = TOV% in the league_averages row
         return {"tov_pct": _cell_float(cells, 5, "league_four_factors")}
 
@@ -136,14 +277,7 @@ def fetch_context(session: requests.Session, season: str, season_type: str) -> d
 
     def _call() -> dict:
         html = _fetch_page(session, CTG_CONTEXT_URL, params)
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.find("table", id="league_offense_halfcourt_and_putbacks")
-        if not table:
-            raise ValueError(
-                "Could not find table#league_offense_halfcourt_and_putbacks on the context page. "
-                "Page structure may have changed."
-            )
-        cells = _parse_stat_cells(table, "league_offense_halfcourt_and_putbacks")
+        cells = _parse_stat_cells(html, "league_offense_halfcourt_and_putbacks", "context")
         # Index 1 = HC Pts/Play, 2 = HC OREB%, 6 = Putbacks Pts/Play
         return {
             "hc_pts_per_play": _cell_float(cells, 1, "league_offense_halfcourt_and_putbacks"),
@@ -154,37 +288,11 @@ def fetch_context(session: requests.Session, season: str, season_type: str) -> d
     return with_retries(_call, "CTG context", attempts=5)
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--season", required=True, help='e.g. "2025-26"')
-    parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
-    args = parser.parse_args()
-
-    season = args.season
-    season_type = args.season_type
+def ingest_season(session: requests.Session, season: str, season_type: str) -> dict:
+    """Fetch one season's league averages, write its raw JSON and return its manifest entry."""
     season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
-
-    email = os.environ.get("CTG_EMAIL", "")
-    password = os.environ.get("CTG_PASSWORD", "")
-
     out_dir = os.path.join("assets", "data", "raw", season, season_type_slug)
     ensure_dir(out_dir)
-    ensure_dir("reports")
-
-    session = requests.Session()
-    session.headers.update({"User-Agent": "Mozilla/5.0"})
-
-    if email and password:
-        try:
-            ctg_login(session, email, password)
-            print("[OK] CTG login successful")
-        except Exception as e:
-            print(
-                f"[WARN] CTG login failed: {e}. "
-                "Proceeding without auth (league averages are publicly accessible)."
-            )
-    else:
-        print("[INFO] CTG_EMAIL/CTG_PASSWORD not set — fetching without authentication.")
 
     ff_vals = fetch_fourfactors(session, season, season_type)
     ctx_vals = fetch_context(session, season, season_type)
@@ -201,12 +309,72 @@ def main() -> int:
         "ctg_season_type_param": ctg_season_type_param(season_type),
         "values": values,
     }
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
-
-    print(f"[OK] Wrote CTG league averages: {out_path}")
+    unchanged = write_json_if_changed(payload, out_path)
+    if unchanged:
+        print(f"[OK] CTG league averages unchanged (not rewritten): {out_path}")
+    else:
+        print(f"[OK] Wrote CTG league averages: {out_path}")
     print(f"[OK] Values: {values}")
 
+    return {
+        "id":          "ctg_league_averages",
+        "season":      season,
+        "season_type": season_type,
+        "path":        out_path.replace("\\", "/"),
+        "rows":        1,
+        "cols":        len(values),
+        "ok":          True,
+        "error":       None,
+        "unchanged":   unchanged,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season", required=True, nargs="+", help='e.g. "2025-26" (several for a batch)')
+    parser.add_argument("--season-type", required=True, nargs="+",
+                        help='e.g. "Regular Season" (several for a batch)')
+    parser.add_argument("--fresh-login", action="store_true",
+                        help="Log in again instead of reusing the saved CTG session")
+    args = parser.parse_args()
+
+    email = os.environ.get("CTG_EMAIL", "")
+    password = os.environ.get("CTG_PASSWORD", "")
+
+    session, auth = ctg_session(email, password, fresh_login=args.fresh_login)
+
+    raw_files = []
+    for season in args.season:
+        for season_type in args.season_type:
+            try:
+                raw_files.append(ingest_season(session, season, season_type))
+            except Exception as e:
+                print(f"[ERROR] CTG {season} {season_type}: {e}")
+                raw_files.append({
+                    "id": "ctg_league_averages", "season": season, "season_type": season_type,
+                    "path": None, "rows": 0, "cols": 0, "ok": False, "error": str(e), "unchanged": False,
+                })
+
+    failed = [f"{f['season']} {f['season_type']}" for f in raw_files if not f["ok"]]
+    manifest = {
+        "generated_at_utc": utc_now_iso(),
+        "season":           args.season[0] if len(args.season) == 1 else args.season,
+        "season_type":      args.season_type[0] if len(args.season_type) == 1 else args.season_type,
+        "raw_files":        raw_files,
+        "ok":               not failed,
+        "unchanged":        all(f["unchanged"] for f in raw_files),
+        "auth":             auth,
+        "policy":           {"level": "league", "source": "cleaningtheglass.com"},
+        "http":             session.summary(),
+    }
+    manifest_path = os.path.join(REPO_ROOT, "reports", "ctg_manifest.json")
+    ensure_dir(os.path.dirname(manifest_path))
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    if failed:
+        print(f"[ERROR] CTG league averages failed for: {', '.join(failed)}")
+        return 1
     return 0
 
 
@@ -0,0 +1,265 @@
+"""
+ingest_all.py
+
+Runs every ingest source for one season concurrently and writes one combined
+manifest (reports/ingest_all_manifest.json).
+
+The sources hit three hosts and share no data, so they run side by side as
+separate processes under asyncio:
+
+    run_ingest          stats.nba.com          (traditional + passing totals)
+    nba_playtypes       stats.nba.com
+    nba_tracking_shots  stats.nba.com
+    nba_pbpstats        api.pbpstats.com
+    ctg_league_avgs     cleaningtheglass.com
+
+At most HOST_CONCURRENCY[host] sources run against a host at once (--host-cap
+overrides).  The processes sharing a host split its rate limit: each gets
+BUCKETS_RATE_SHARE = 1 / (sources running there at once), so the host never
+sees more than HOST_RATE_LIMITS in scripts/ingest/ingest_client.py allows.
+
+A failing or timed-out source does not stop the others; the exit code is 1 if
+any source failed.  Each source's output is streamed with a "[name]" prefix.
+The ingest phase takes about as long as its slowest source.
+
+Usage:
+    python scripts/ingest/ingest_all.py --season 2025-26 --season-type "Regular Season"
+    python scripts/ingest/ingest_all.py --season 2025-26 --season-type "Regular Season" --host-cap stats.nba.com=1
+    python scripts/ingest/ingest_all.py --season 2025-26 --season-type "Regular Season" --timeout 900
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.ingest.ingest_client import utc_now_iso  # noqa: E402
+
+MANIFEST_PATH = os.path.join(REPO_ROOT, "reports", "ingest_all_manifest.json")
+
+# name, script, host, the manifest the script writes (repo-relative)
+INGEST_SOURCES = [
+    {"name": "run_ingest",         "script": "scripts/ingest/run_ingest.py",
+     "host": "stats.nba.com",        "manifest": "reports/ingest_manifest.json"},
+    {"name": "nba_playtypes",      "script": "scripts/ingest/nba_playtypes.py",
+     "host": "stats.nba.com",        "manifest": "reports/playtypes_manifest.json"},
+    {"name": "nba_pbpstats",       "script": "scripts/ingest/nba_pbpstats.py",
+     "host": "api.pbpstats.com",     "manifest": "reports/pbpstats_manifest.json"},
+    {"name": "ctg_league_avgs",    "script": "scripts/ingest/ctg_league_avgs.py",
+     "host": "cleaningtheglass.com", "manifest": "reports/ctg_manifest.json"},
+    {"name": "nba_tracking_shots", "script": "scripts/ingest/nba_tracking_shots.py",
+     "host": "stats.nba.com",        "manifest": "reports/ingest_manifest_tracking_shots.json"},
+]
+
+# Sources allowed to run against a host at once; hosts not listed get 1
+HOST_CONCURRENCY = {
+    "stats.nba.com":        3,
+    "api.pbpstats.com":     1,
+    "cleaningtheglass.com": 1,
+}
+
+# Output lines kept per source for the manifest when it fails
+TAIL_LINES = 20
+
+
+def host_caps(sources: list[dict], overrides: dict[str, int] | None = None) -> dict[str, int]:
+    """Concurrency cap per host used by sources (defaults, then overrides)."""
+    caps = {s["host"]: HOST_CONCURRENCY.get(s["host"], 1) for s in sources}
+    for host, cap in (overrides or {}).items():
+        if cap < 1:
+            raise ValueError(f"Host cap must be >= 1, got {host}={cap}")
+        caps[host] = cap
+    return caps
+
+
+def rate_shares(sources: list[dict], caps: dict[str, int]) -> dict[str, float]:
+    """BUCKETS_RATE_SHARE per host: 1 / (sources that can run there at once)."""
+    counts = collections.Counter(s["host"] for s in sources)
+    return {host: 1.0 / min(caps[host], n) for host, n in counts.items()}
+
+
+def read_source_manifest(path: str, since: float) -> dict | None:
+    """A source's own manifest, if it was written at or after since (epoch seconds)."""
+    try:
+        if os.path.getmtime(path) < since:
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+async def _stream(name: str, stream: asyncio.StreamReader, tail: collections.deque) -> None:
+    while True:
+        line = await stream.readline()
+        if not line:
+            return
+        text = line.decode("utf-8", errors="replace").rstrip()
+        tail.append(text)
+        print(f"[{name}] {text}", flush=True)
+
+
+async def run_source(
+    source: dict,
+    season: str,
+    season_type: str,
+    semaphore: asyncio.Semaphore,
+    rate_share: float,
+    timeout: float | None,
+    t0: float,
+) -> dict:
+    """Run one ingest script once its host has a free slot; returns its result entry."""
+    queued = time.perf_counter()
+    async with semaphore:
+        started = time.perf_counter()
+        started_epoch = time.time()
+        env = {**os.environ, "BUCKETS_RATE_SHARE": repr(rate_share), "PYTHONUNBUFFERED": "1"}
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, source["script"], "--season", season, "--season-type", season_type,
+            cwd=REPO_ROOT, env=env,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        )
+        tail: collections.deque = collections.deque(maxlen=TAIL_LINES)
+        reader = asyncio.create_task(_stream(source["name"], proc.stdout, tail))
+        timed_out = False
+        try:
+            await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            proc.kill()
+            await proc.wait()
+        try:
+            # A killed script's own children can keep the pipe open
+            await asyncio.wait_for(reader, 5 if timed_out else None)
+        except asyncio.TimeoutError:
+            pass
+        seconds = time.perf_counter() - started
+
+    manifest = read_source_manifest(os.path.join(REPO_ROOT, source["manifest"]), started_epoch)
+    ok = proc.returncode == 0 and not timed_out
+    raw_files = [
+        {k: f.get(k) for k in ("id", "path", "rows", "cols", "unchanged")}
+        for f in (manifest or {}).get("raw_files", [])
+    ]
+    return {
+        "script":         source["script"],
+        "host":           source["host"],
+        "ok":             ok,
+        "returncode":     proc.returncode,
+        "timed_out":      timed_out,
+        "rate_share":     rate_share,
+        "queued_seconds": round(started - queued, 3),
+        "started_at":     round(started - t0, 3),
+        "seconds":        round(seconds, 3),
+        "rows":           sum(f["rows"] or 0 for f in raw_files),
+        "raw_files":      raw_files,
+        "unchanged":      manifest.get("unchanged") if manifest else None,
+        "manifest":       source["manifest"] if manifest else None,
+        "http":           manifest.get("http") if manifest else None,
+        "error":          None if ok else ("timed out" if timed_out else "\n".join(tail)),
+    }
+
+
+async def ingest_all_async(
+    season: str,
+    season_type: str,
+    sources: list[dict] | None = None,
+    caps: dict[str, int] | None = None,
+    timeout: float | None = None,
+) -> dict:
+    """
+    Run sources (default INGEST_SOURCES) concurrently under per-host caps.
+
+    Returns:
+        The combined manifest: per-source timings, row counts and outcomes,
+        plus wall_seconds (actual) and serial_seconds (sum of source times).
+    """
+    sources = INGEST_SOURCES if sources is None else sources
+    caps    = host_caps(sources, caps)
+    shares  = rate_shares(sources, caps)
+    semaphores = {host: asyncio.Semaphore(cap) for host, cap in caps.items()}
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(
+        run_source(s, season, season_type, semaphores[s["host"]], shares[s["host"]], timeout, t0)
+        for s in sources
+    ))
+    wall = time.perf_counter() - t0
+
+    by_name = {s["name"]: r for s, r in zip(sources, results)}
+    return {
+        "generated_at_utc": utc_now_iso(),
+        "season":           season,
+        "season_type":      season_type,
+        "ok":               all(r["ok"] for r in results),
+        "failed":           [name for name, r in by_name.items() if not r["ok"]],
+        "unchanged":        all(r["unchanged"] for r in results),
+        "wall_seconds":     round(wall, 3),
+        "serial_seconds":   round(sum(r["seconds"] for r in results), 3),
+        "host_caps":        caps,
+        "timeout":          timeout,
+        "sources":          by_name,
+    }
+
+
+def ingest_all(season: str, season_type: str, **kwargs) -> dict:
+    """Synchronous wrapper around ingest_all_async()."""
+    return asyncio.run(ingest_all_async(season, season_type, **kwargs))
+
+
+def write_manifest(manifest: dict, path: str = MANIFEST_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def parse_host_caps(values: list[str]) -> dict[str, int]:
+    caps = {}
+    for value in values:
+        host, sep, cap = value.partition("=")
+        if not sep or not cap.isdigit():
+            raise ValueError(f"--host-cap expects HOST=N, got {value!r}")
+        caps[host] = int(cap)
+    return caps
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season", required=True, help='e.g. "2025-26"')
+    parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
+    parser.add_argument("--host-cap", action="append", default=[], metavar="HOST=N",
+                        help="Sources allowed to run against HOST at once (repeatable)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Seconds before a source is killed and marked failed (default: none)")
+    args = parser.parse_args()
+
+    manifest = ingest_all(args.season, args.season_type,
+                          caps=parse_host_caps(args.host_cap), timeout=args.timeout)
+    write_manifest(manifest)
+
+    print(f"\n{'Source':<20} {'Host':<22} {'Status':<8} {'Rows':>6} {'Start':>7} {'Time':>7}")
+    for name, r in manifest["sources"].items():
+        status = "ok" if r["ok"] else ("timeout" if r["timed_out"] else "FAILED")
+        if r["ok"] and r["unchanged"]:
+            status = "same"
+        print(f"{name:<20} {r['host']:<22} {status:<8} {r['rows']:>6} {r['started_at']:>6.1f}s {r['seconds']:>6.1f}s")
+    print(f"\n[INFO] Wall {manifest['wall_seconds']:.1f}s vs {manifest['serial_seconds']:.1f}s run one after another")
+    print(f"[OK] Manifest: {MANIFEST_PATH}")
+
+    if not manifest["ok"]:
+        print(f"[ERROR] Ingest failed for: {', '.join(manifest['failed'])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
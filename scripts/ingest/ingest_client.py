@@ -0,0 +1,434 @@
+"""
+ingest_client.py
+
+Shared HTTP client and file helpers for the ingest scripts.
+
+IngestSession is a requests.Session that every ingest request goes through —
+nba_api endpoints included (use_session_for_nba_api() installs it as nba_api's
+session):
+
+    keep-alive     one pooled connection set per host, reused across requests
+                   (and across seasons when one process runs several ingests)
+    rate limits    a token bucket per host (HOST_RATE_LIMITS), shared by all
+                   threads and retries; when several processes hit one host at
+                   once (scripts/ingest/ingest_all.py), each gets its
+                   BUCKETS_RATE_SHARE fraction of the host's rate
+    retries        429 / 5xx responses raise requests.HTTPError so
+                   with_retries() backs off — exponentially, with jitter, and
+                   never sooner than the response's Retry-After
+    metrics        one timing record per request; summary() goes into the
+                   ingest manifests under "http"
+    cassettes      mode "record" saves every response under CASSETTE_DIR;
+                   mode "replay" serves them back without touching the
+                   network (a request with no cassette raises RuntimeError),
+                   so the ingest layer can be tested and benchmarked offline
+    cache          in "live" mode, 200 responses to GETs are kept under
+                   HTTP_CACHE_DIR and served again without a request until
+                   their host's CACHE_TTLS expires, so a same-day rerun (e.g.
+                   after a downstream failure) does not re-download anything;
+                   login pages (NO_CACHE_PATHS) and responses that set
+                   cookies always go to the network, since a cached copy
+                   would not set the session's cookies
+
+The mode and cassette directory default to the BUCKETS_HTTP_MODE
+("live" | "record" | "replay") and BUCKETS_CASSETTE_DIR environment
+variables; BUCKETS_HTTP_CACHE=off turns the response cache off:
+
+    BUCKETS_HTTP_MODE=record python scripts/ingest/nba_pbpstats.py --season 2024-25 --season-type "Regular Season"
+    BUCKETS_HTTP_MODE=replay python scripts/ingest/nba_pbpstats.py --season 2024-25 --season-type "Regular Season"
+    BUCKETS_HTTP_CACHE=off   python scripts/ingest/nba_pbpstats.py --season 2024-25 --season-type "Regular Season"
+
+write_parquet_if_changed() / write_json_if_changed() leave a raw file alone
+when the fresh payload has the same content as the one on disk; the ingest
+manifests mark such files "unchanged", and the file's bytes (so its digest in
+scripts/local/run_pipeline.py) stay the same, letting downstream steps skip.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, TypeVar
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.ingest.rate_limit import TokenBucket  # noqa: E402
+
+T = TypeVar("T")
+
+CASSETTE_DIR   = os.path.join(REPO_ROOT, "assets", "data", "http_cassettes")
+HTTP_CACHE_DIR = os.path.join(REPO_ROOT, "assets", "data", "http_cache")
+MODES = ("live", "record", "replay")
+
+# Requests per second and burst size per host; other hosts are not limited
+HOST_RATE_LIMITS = {
+    "stats.nba.com":        (2.0, 4),
+    "api.pbpstats.com":     (1.0, 2),
+    "cleaningtheglass.com": (1.0, 2),
+}
+
+# Seconds a cached response stays fresh, per host; other hosts are not cached.
+# Short enough that the daily update always refetches.
+CACHE_TTLS = {
+    "stats.nba.com":        6 * 3600,
+    "api.pbpstats.com":     6 * 3600,
+    "cleaningtheglass.com": 12 * 3600,
+}
+
+# URL paths never served from or written to the response cache (login flows)
+NO_CACHE_PATHS = ("/wp-login.php",)
+
+# Responses retried by with_retries() (raised as requests.HTTPError)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Backoff: attempt i waits 2**i seconds, half of it jittered, capped
+BACKOFF_CAP = 60.0
+
+# Response headers kept in cassettes (bodies are stored decoded; cookies never)
+CASSETTE_HEADERS = ("Content-Type", "Retry-After", "Location")
+
+# JSON raw-file keys that change on every run and are ignored when comparing
+VOLATILE_KEYS = ("generated_at_utc", "http")
+
+
+# ── Files ─────────────────────────────────────────────────────────────────────
+
+def utc_now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def ensure_dir(path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+
+
+def atomic_write_parquet(df: pd.DataFrame, out_path: str) -> None:
+    tmp_path = out_path + ".tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, out_path)
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """
+    sha256 of a frame's column names and values.  Dtype spellings are not
+    hashed, so a frame and its parquet round trip hash the same.
+    """
+    h = hashlib.sha256("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def write_parquet_if_changed(df: pd.DataFrame, out_path: str) -> dict:
+    """
+    Write df to out_path unless the parquet already there has the same content.
+
+    Returns:
+        {"sha256": frame digest, "unchanged": True if the file was left alone}
+    """
+    digest = frame_digest(df)
+    unchanged = False
+    if os.path.exists(out_path):
+        try:
+            unchanged = frame_digest(pd.read_parquet(out_path)) == digest
+        except Exception as e:
+            print(f"[WARN] Could not read existing {out_path} ({e}); rewriting it")
+    if not unchanged:
+        atomic_write_parquet(df, out_path)
+    return {"sha256": digest, "unchanged": unchanged}
+
+
+def write_json_if_changed(payload: dict, out_path: str) -> bool:
+    """
+    Write payload to out_path unless the JSON already there is the same apart
+    from VOLATILE_KEYS.  Returns True if the file was left alone.
+    """
+    def _stable(d: dict) -> dict:
+        return {k: v for k, v in d.items() if k not in VOLATILE_KEYS}
+
+    if os.path.exists(out_path):
+        try:
+            with open(out_path, "r", encoding="utf-8") as f:
+                if _stable(json.load(f)) == _stable(json.loads(json.dumps(payload))):
+                    return True
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Could not read existing {out_path} ({e}); rewriting it")
+
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp_path, out_path)
+    return False
+
+
+# ── Retries ───────────────────────────────────────────────────────────────────
+
+def retry_after_seconds(err: Exception) -> float | None:
+    """Retry-After of the HTTP response behind err, in seconds (None if absent)."""
+    resp = getattr(err, "response", None)
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            when = datetime.strptime(value, "%a, %d %b %Y %H:%M:%S GMT").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return None
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_seconds(attempt: int, err: Exception | None = None) -> float:
+    """Jittered exponential backoff for attempt (1-based), at least err's Retry-After."""
+    base = min(BACKOFF_CAP, 2.0 ** attempt)
+    wait = base / 2 + random.uniform(0, base / 2)
+    retry_after = retry_after_seconds(err) if err is not None else None
+    return max(wait, min(retry_after, BACKOFF_CAP * 2)) if retry_after is not None else wait
+
+
+def with_retries(fn: Callable[[], T], label: str, attempts: int = 5) -> T:
+    last_err: Exception | None = None
+    for i in range(1, attempts + 1):
+        try:
+            return fn()
+        except Exception as e:
+            last_err = e
+            if i == attempts:
+                break
+            wait = backoff_seconds(i, e)
+            print(f"[WARN] {label} failed (attempt {i}/{attempts}): {e}")
+            print(f"[WARN] Waiting {wait:.1f}s then retrying...")
+            time.sleep(wait)
+    assert last_err is not None
+    raise last_err
+
+
+# ── Session ───────────────────────────────────────────────────────────────────
+
+def cassette_key(method: str, url: str, body: bytes | str | None) -> str:
+    """sha256 of the method, the full URL (query string included) and the body."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    h = hashlib.sha256(f"{method.upper()} {url}\n".encode("utf-8"))
+    h.update(body or b"")
+    return h.hexdigest()
+
+
+def _response_record(resp: requests.Response) -> dict:
+    return {
+        "method":     resp.request.method,
+        "url":        resp.url,
+        "status":     resp.status_code,
+        "reason":     resp.reason,
+        "encoding":   resp.encoding,
+        "headers":    {h: resp.headers[h] for h in CASSETTE_HEADERS if h in resp.headers},
+        "body":       base64.b64encode(resp.content).decode("ascii"),
+        "fetched_at": utc_now_iso(),
+    }
+
+
+def _response_from_record(record: dict, prep: requests.PreparedRequest) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = record["status"]
+    resp.reason      = record["reason"]
+    resp.url         = record["url"]
+    resp.encoding    = record["encoding"]
+    resp.headers.update(record["headers"])
+    resp._content    = base64.b64decode(record["body"])
+    resp.request     = prep
+    return resp
+
+
+def _sets_cookies(resp: requests.Response) -> bool:
+    """True if the response, or a redirect on the way to it, sets a cookie."""
+    return any("Set-Cookie" in r.headers for r in [*resp.history, resp])
+
+
+def _write_record(path: str, record: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(record, f)
+    os.replace(tmp_path, path)
+
+
+def _read_record(path: str) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class IngestSession(requests.Session):
+    """
+    requests.Session with pooled keep-alive connections, per-host token-bucket
+    rate limits, request timing, cassette record / replay and a TTL response
+    cache (see the module docstring).
+    """
+
+    def __init__(
+        self,
+        mode: str | None = None,
+        cassette_dir: str | None = None,
+        rate_limits: dict[str, tuple[float, int]] | None = None,
+        pool_size: int = 16,
+        cache: bool | None = None,
+        cache_dir: str | None = None,
+        cache_ttls: dict[str, float] | None = None,
+        rate_share: float | None = None,
+    ):
+        super().__init__()
+        self.mode = mode or os.environ.get("BUCKETS_HTTP_MODE", "live")
+        if self.mode not in MODES:
+            raise ValueError(f"HTTP mode must be one of {MODES}, got {self.mode!r}")
+        self.cassette_dir = cassette_dir or os.environ.get("BUCKETS_CASSETTE_DIR") or CASSETTE_DIR
+        self.rate_limits  = dict(HOST_RATE_LIMITS if rate_limits is None else rate_limits)
+        self.rate_share   = float(os.environ.get("BUCKETS_RATE_SHARE", 1.0)) if rate_share is None else rate_share
+        if not 0 < self.rate_share <= 1:
+            raise ValueError(f"Rate share must be in (0, 1], got {self.rate_share}")
+        if cache is None:
+            cache = os.environ.get("BUCKETS_HTTP_CACHE", "on").lower() not in ("off", "0", "false", "no")
+        self.cache        = cache and self.mode == "live"
+        self.cache_dir    = cache_dir or HTTP_CACHE_DIR
+        self.cache_ttls   = dict(CACHE_TTLS if cache_ttls is None else cache_ttls)
+        self.metrics: list[dict] = []
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def set_rate_limit(self, host: str, rate: float, burst: int) -> None:
+        with self._lock:
+            self.rate_limits[host] = (rate, burst)
+            self._buckets.pop(host, None)
+
+    def _bucket(self, host: str) -> TokenBucket | None:
+        if host not in self.rate_limits:
+            return None
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.rate_limits[host]
+                self._buckets[host] = TokenBucket(rate * self.rate_share, burst)
+            return self._buckets[host]
+
+    def _cassette_path(self, host: str, key: str) -> str:
+        return os.path.join(self.cassette_dir, host, f"{key}.json.gz")
+
+    def _cache_path(self, host: str, key: str) -> str | None:
+        """Cache file for a request to host, or None if host's responses are not cached."""
+        if not self.cache or host not in self.cache_ttls:
+            return None
+        return os.path.join(self.cache_dir, host, f"{key}.json.gz")
+
+    def _cached(self, path: str, host: str, prep: requests.PreparedRequest) -> requests.Response | None:
+        """The cached response at path if younger than host's TTL, else None."""
+        try:
+            if time.time() - os.path.getmtime(path) > self.cache_ttls[host]:
+                return None
+            return _response_from_record(_read_record(path), prep)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def request(self, method, url, params=None, data=None, headers=None, cookies=None, files=None,
+                auth=None, timeout=None, allow_redirects=True, proxies=None, hooks=None, stream=None,
+                verify=None, cert=None, json=None):
+        prep = self.prepare_request(requests.Request(
+            method=method.upper(), url=url, headers=headers, files=files, data=data or {}, json=json,
+            params=params or {}, auth=auth, cookies=cookies, hooks=hooks,
+        ))
+        host = urlsplit(prep.url).hostname or ""
+        key  = cassette_key(prep.method, prep.url, prep.body)
+
+        cache_path = None
+        if prep.method == "GET" and not urlsplit(prep.url).path.endswith(NO_CACHE_PATHS):
+            cache_path = self._cache_path(host, key)
+        cached = None if cache_path is None else self._cached(cache_path, host, prep)
+
+        start = time.perf_counter()
+        if self.mode == "replay":
+            resp, waited = self._replay(prep, host, key), 0.0
+        elif cached is not None:
+            resp, waited = cached, 0.0
+        else:
+            bucket = self._bucket(host)
+            waited = bucket.acquire() if bucket is not None else 0.0
+            start  = time.perf_counter()
+            settings = self.merge_environment_settings(prep.url, proxies or {}, stream, verify, cert)
+            resp = self.send(prep, timeout=timeout, allow_redirects=allow_redirects, **settings)
+            if self.mode == "record":
+                self._record(resp, host, key)
+            if cache_path is not None and resp.status_code == 200 and not _sets_cookies(resp):
+                _write_record(cache_path, _response_record(resp))
+
+        self.metrics.append({
+            "method":  prep.method,
+            "host":    host,
+            "path":    urlsplit(prep.url).path,
+            "status":  resp.status_code,
+            "seconds": round(time.perf_counter() - start, 4),
+            "waited":  round(waited, 4),
+            "bytes":   len(resp.content),
+            "replayed": self.mode == "replay",
+            "cached":  cached is not None,
+        })
+
+        if resp.status_code in RETRY_STATUSES:
+            raise requests.HTTPError(f"{resp.status_code} from {host}{urlsplit(prep.url).path}", response=resp)
+        return resp
+
+    def _record(self, resp: requests.Response, host: str, key: str) -> None:
+        _write_record(self._cassette_path(host, key), _response_record(resp))
+
+    def _replay(self, prep: requests.PreparedRequest, host: str, key: str) -> requests.Response:
+        path = self._cassette_path(host, key)
+        if not os.path.exists(path):
+            raise RuntimeError(f"No cassette for {prep.method} {prep.url} in {self.cassette_dir} (replay mode)")
+        return _response_from_record(_read_record(path), prep)
+
+    def summary(self) -> dict:
+        """Request count, cache hits, time, rate-limit wait and bytes, in total and per host."""
+        by_host: dict[str, dict] = {}
+        for m in self.metrics:
+            h = by_host.setdefault(m["host"], {"requests": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                               "waited": 0.0, "bytes": 0, "errors": 0,
+                                               "cache_hits": 0})
+            h["requests"]   += 1
+            h["cache_hits"] += m["cached"]
+            h["seconds"]     = round(h["seconds"] + m["seconds"], 4)
+            h["max_seconds"] = max(h["max_seconds"], m["seconds"])
+            h["waited"]      = round(h["waited"] + m["waited"], 4)
+            h["bytes"]      += m["bytes"]
+            h["errors"]     += m["status"] >= 400
+        return {
+            "mode": self.mode,
+            "cache": self.cache,
+            "rate_share": self.rate_share,
+            "requests": len(self.metrics),
+            "cache_hits": sum(m["cached"] for m in self.metrics),
+            "seconds": round(sum(m["seconds"] for m in self.metrics), 4),
+            "by_host": by_host,
+        }
+
+
+def ingest_session(**kwargs) -> IngestSession:
+    """An IngestSession (mode / cassette dir / cache switch from the environment unless given)."""
+    return IngestSession(**kwargs)
+
+
+def use_session_for_nba_api(session: IngestSession) -> None:
+    """Route every nba_api stats.nba.com request through session."""
+    from nba_api.stats.library.http import NBAStatsHTTP
+
+    NBAStatsHTTP.set_session(session)
@@ -3,8 +3,6 @@ import json
 import os
 import sys
 import time
-from datetime import datetime, timezone
-from typing import Callable, TypeVar
 
 import pandas as pd
 from nba_api.stats.endpoints import synergyplaytypes
@@ -14,9 +12,17 @@ REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
+from scripts.ingest.ingest_client import (  # noqa: E402
+    IngestSession,
+    ensure_dir,
+    ingest_session,
+    use_session_for_nba_api,
+    utc_now_iso,
+    with_retries,
+    write_parquet_if_changed,
+)
 from scripts.ingest.nba_policy import validate_playtypes_df  # noqa: E402
-
-T = TypeVar("T")
+from scripts.ingest.rate_limit import fetch_concurrently  # noqa: E402
 
 PLAY_TYPES = [
     "Isolation",
@@ -32,36 +38,12 @@ PLAY_TYPES = [
     "Transition",
 ]
 
-
-def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-def ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
-
-
-def atomic_write_parquet(df: pd.DataFrame, out_path: str) -> None:
-    tmp_path = out_path + ".tmp"
-    df.to_parquet(tmp_path, index=False)
-    os.replace(tmp_path, out_path)
-
-
-def with_retries(fn: Callable[[], T], label: str, attempts: int = 5) -> T:
-    last_err: Exception | None = None
-    for i in range(1, attempts + 1):
-        try:
-            return fn()
-        except Exception as e:
-            last_err = e
-            if i == attempts:
-                break
-            wait = 2 ** i
-            print(f"[WARN] {label} failed (attempt {i}/{attempts}): {e}")
-            print(f"[WARN] Waiting {wait}s then retrying...")
-            time.sleep(wait)
-    assert last_err is not None
-    raise last_err
+# Concurrency defaults: parallel requests, and the stats.nba.com rate limit
+# (RATE requests/s, bursts of BURST) shared by all of them, retries included
+WORKERS = 4
+RATE    = 2.0
+BURST   = 4
+NBA_STATS_HOST = "stats.nba.com"
 
 
 def fetch_play_type(season: str, season_type: str, play_type: str) -> pd.DataFrame:
@@ -81,10 +63,51 @@ def fetch_play_type(season: str, season_type: str, play_type: str) -> pd.DataFra
     return df
 
 
+def fetch_play_types(
+    season: str,
+    season_type: str,
+    session: IngestSession,
+    workers: int = WORKERS,
+    rate: float = RATE,
+    burst: int = BURST,
+) -> dict[str, dict]:
+    """
+    Fetch every PLAY_TYPES play type concurrently through session (installed
+    for nba_api), whose stats.nba.com rate limit is set to rate / burst.
+
+    Returns fetch_concurrently() results keyed by play type; a play type that
+    failed after its retries has ok=False and does not affect the others.
+    """
+    session.set_rate_limit(NBA_STATS_HOST, rate, burst)
+    use_session_for_nba_api(session)
+    tasks = {
+        play_type: (lambda pt=play_type: fetch_play_type(season, season_type, pt))
+        for play_type in PLAY_TYPES
+    }
+    return fetch_concurrently(tasks, workers)
+
+
+def previous_play_type_rows(out_path: str) -> dict[str, pd.DataFrame]:
+    """Rows per PLAY_TYPE of the existing nba_playtypes.parquet (empty if none)."""
+    if not os.path.exists(out_path):
+        return {}
+    try:
+        prev = pd.read_parquet(out_path)
+    except Exception:
+        return {}
+    if "PLAY_TYPE" not in prev.columns:
+        return {}
+    return {pt: g.reset_index(drop=True) for pt, g in prev.groupby("PLAY_TYPE", sort=False)}
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--season", required=True, help='e.g. "2025-26"')
     parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"Parallel requests (default {WORKERS})")
+    parser.add_argument("--rate", type=float, default=RATE,
+                        help=f"Request rate limit per second, retries included (default {RATE})")
+    parser.add_argument("--burst", type=int, default=BURST, help=f"Rate-limit burst size (default {BURST})")
     args = parser.parse_args()
 
     season = args.season
@@ -95,24 +118,69 @@ def main() -> int:
     ensure_dir(out_dir)
     ensure_dir("reports")
 
-    frames = []
-    for play_type in PLAY_TYPES:
-        df = fetch_play_type(season, season_type, play_type)
-        frames.append(df)
-        print(f"[OK] Fetched play type [{play_type}]: {df.shape[0]} rows")
-
-    df_all = pd.concat(frames, ignore_index=True)
-    validate_playtypes_df(df_all, "nba_playtypes")
-
     out_path = os.path.join(out_dir, "nba_playtypes.parquet")
-    atomic_write_parquet(df_all, out_path)
-    print(f"[OK] Wrote nba_playtypes: {out_path} ({df_all.shape[0]} rows, {df_all.shape[1]} cols)")
+    start = time.perf_counter()
+    session = ingest_session(pool_size=max(16, args.workers))
+    results = fetch_play_types(season, season_type, session, args.workers, args.rate, args.burst)
+    elapsed = time.perf_counter() - start
+
+    # A play type that failed keeps its rows from the previous file, if any
+    previous = None
+    frames, play_type_status = [], []
+    for play_type, res in results.items():
+        status = {"play_type": play_type, "ok": res["ok"], "source": "fetched",
+                  "rows": 0, "seconds": res["seconds"], "error": res["error"]}
+        if res["ok"]:
+            df = res["result"]
+            print(f"[OK] Fetched play type [{play_type}]: {df.shape[0]} rows ({res['seconds']:.1f}s)")
+        else:
+            if previous is None:
+                previous = previous_play_type_rows(out_path)
+            df = previous.get(play_type)
+            status["source"] = "previous" if df is not None else None
+            print(f"[WARN] Play type [{play_type}] failed: {res['error']}"
+                  + (f"; keeping {df.shape[0]} rows from {out_path}" if df is not None else ""))
+        if df is not None:
+            frames.append(df)
+            status["rows"] = int(df.shape[0])
+        play_type_status.append(status)
+    print(f"[INFO] Fetched {sum(r['ok'] for r in results.values())}/{len(results)} play types "
+          f"in {elapsed:.1f}s ({args.workers} workers, {args.rate:g} req/s)")
+
+    missing = [s["play_type"] for s in play_type_status if s["source"] is None]
+    fetched = [s["play_type"] for s in play_type_status if s["ok"]]
+    kept    = [s["play_type"] for s in play_type_status if s["source"] == "previous"]
 
     manifest = {
         "generated_at_utc": utc_now_iso(),
         "season": season,
         "season_type": season_type,
         "raw_dir": out_dir.replace("\\", "/"),
+        "raw_files": [],
+        "ok": False,
+        "play_types_fetched": fetched,
+        "play_types_kept_from_previous": kept,
+        "play_types": play_type_status,
+        "fetch_seconds": round(elapsed, 3),
+        "concurrency": {"workers": args.workers, "rate_per_sec": args.rate, "burst": args.burst},
+        "policy": {"level": "player", "type_grouping": "offensive", "mode": "Totals"},
+        "http": session.summary(),
+    }
+    if missing:
+        with open(os.path.join("reports", "playtypes_manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        raise RuntimeError(f"Play types failed with no previous data to keep: {missing}")
+
+    df_all = pd.concat(frames, ignore_index=True)
+    validate_playtypes_df(df_all, "nba_playtypes")
+
+    written = write_parquet_if_changed(df_all, out_path)
+    if written["unchanged"]:
+        print(f"[OK] Unchanged nba_playtypes: {out_path} ({df_all.shape[0]} rows, {df_all.shape[1]} cols; not rewritten)")
+    else:
+        print(f"[OK] Wrote nba_playtypes: {out_path} ({df_all.shape[0]} rows, {df_all.shape[1]} cols)")
+
+    manifest.update({
         "raw_files": [
             {
                 "id": "nba_playtypes",
@@ -121,12 +189,12 @@ def main() -> int:
                 "cols": int(df_all.shape[1]),
                 "ok": True,
                 "error": None,
+                **written,
             }
         ],
         "ok": True,
-        "play_types_fetched": PLAY_TYPES,
-        "policy": {"level": "player", "type_grouping": "offensive", "mode": "Totals"},
-    }
+        "unchanged": written["unchanged"],
+    })
 
     with open(os.path.join("reports", "playtypes_manifest.json"), "w", encoding="utf-8") as f:
         json.dump(manifest, f, indent=2)
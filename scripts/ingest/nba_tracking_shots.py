@@ -2,9 +2,6 @@ import argparse
 import json
 import os
 import sys
-import time
-from datetime import datetime, timezone
-from typing import Callable, TypeVar
 
 from nba_api.stats.endpoints import playerdashptshots
 
@@ -12,32 +9,14 @@ REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
-T = TypeVar("T")
-
-
-def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-def ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
-
-
-def with_retries(fn: Callable[[], T], label: str, attempts: int = 5) -> T:
-    last_err: Exception | None = None
-    for i in range(1, attempts + 1):
-        try:
-            return fn()
-        except Exception as e:
-            last_err = e
-            if i == attempts:
-                break
-            wait = 2 ** i
-            print(f"[WARN] {label} failed (attempt {i}/{attempts}): {e}")
-            print(f"[WARN] Waiting {wait}s then retrying...")
-            time.sleep(wait)
-    assert last_err is not None
-    raise last_err
+from scripts.ingest.ingest_client import (  # noqa: E402
+    ensure_dir,
+    ingest_session,
+    use_session_for_nba_api,
+    utc_now_iso,
+    with_retries,
+    write_json_if_changed,
+)
 
 
 def fetch_tracking_shots(season: str, season_type: str) -> tuple[dict, dict]:
@@ -105,6 +84,9 @@ def main() -> int:
     ensure_dir(out_dir)
     ensure_dir(os.path.join(REPO_ROOT, "reports"))
 
+    session = ingest_session()
+    use_session_for_nba_api(session)
+
     print("[INFO] Fetching PlayerDashPtShots (league-wide, all shot types + dribble ranges) ...")
     shot_totals, drib_totals = fetch_tracking_shots(season, season_type)
 
@@ -155,11 +137,8 @@ def main() -> int:
     }
 
     out_path = os.path.join(out_dir, "nba_tracking_shots.json")
-    tmp_path = out_path + ".tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(out, f, indent=2)
-    os.replace(tmp_path, out_path)
-    print(f"\n[OK] Wrote {out_path}")
+    unchanged = write_json_if_changed(out, out_path)
+    print(f"\n[OK] {'Unchanged (not rewritten)' if unchanged else 'Wrote'} {out_path}")
 
     manifest = {
         "generated_at_utc": utc_now_iso(),
@@ -174,10 +153,13 @@ def main() -> int:
                 "cols":  len(values),
                 "ok":    True,
                 "error": None,
+                "unchanged": unchanged,
             }
         ],
         "ok": True,
+        "unchanged": unchanged,
         "policy": {"level": "league", "mode": "totals", "filters": "shot_type + dribble_range"},
+        "http": session.summary(),
     }
     manifest_path = os.path.join(REPO_ROOT, "reports", "ingest_manifest_tracking_shots.json")
     with open(manifest_path, "w", encoding="utf-8") as f:
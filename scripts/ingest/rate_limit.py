@@ -0,0 +1,77 @@
+"""
+rate_limit.py
+
+Token-bucket rate limiting and bounded concurrent fetching for the ingest
+scripts.
+
+    bucket  = TokenBucket(rate=2.0, capacity=4)     # 2 requests/s, bursts of 4
+    results = fetch_concurrently(
+        {"Isolation": lambda: fetch(..., bucket=bucket), ...},
+        workers=4,
+    )
+
+Fetch functions call bucket.acquire() before every HTTP attempt, so retries
+are rate limited too.  fetch_concurrently() isolates failures: every task
+gets a result entry, ok or not, and one failing or slow task never cancels
+the others.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: tokens refill at rate per second up to capacity;
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"TokenBucket needs rate > 0 and capacity >= 1 (got {rate}, {capacity})")
+        self.rate     = float(rate)
+        self.capacity = float(capacity)
+        self._tokens  = float(capacity)
+        self._updated = time.monotonic()
+        self._lock    = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available.  Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens  = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+def fetch_concurrently(tasks: dict[str, Callable[[], T]], workers: int = 4) -> dict[str, dict]:
+    """
+    Run every task on a pool of workers threads.
+
+    Returns:
+        {name: {"ok", "result", "error", "seconds"}} in tasks order.  A task
+        that raises gets ok=False, result=None and the error message.
+    """
+    def _run(fn: Callable[[], T]) -> dict:
+        start = time.perf_counter()
+        try:
+            result, error = fn(), None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+        return {"ok": error is None, "result": result, "error": error,
+                "seconds": round(time.perf_counter() - start, 3)}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tasks) or 1))) as pool:
+        futures = {name: pool.submit(_run, fn) for name, fn in tasks.items()}
+        return {name: fut.result() for name, fut in futures.items()}
@@ -2,9 +2,6 @@ import argparse
 import json
 import os
 import sys
-import time
-from datetime import datetime, timezone
-from typing import Callable, TypeVar
 
 import pandas as pd
 from nba_api.stats.endpoints import leaguedashplayerstats, leaguedashptstats
@@ -14,41 +11,16 @@ REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 
+from scripts.ingest.ingest_client import (  # noqa: E402
+    ensure_dir,
+    ingest_session,
+    use_session_for_nba_api,
+    utc_now_iso,
+    with_retries,
+    write_parquet_if_changed,
+)
 from scripts.ingest.nba_policy import validate_player_totals_df  # noqa: E402
 
-T = TypeVar("T")
-
-
-def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-def ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
-
-
-def atomic_write_parquet(df: pd.DataFrame, out_path: str) -> None:
-    tmp_path = out_path + ".tmp"
-    df.to_parquet(tmp_path, index=False)
-    os.replace(tmp_path, out_path)
-
-
-def with_retries(fn: Callable[[], T], label: str, attempts: int = 5) -> T:
-    last_err: Exception | None = None
-    for i in range(1, attempts + 1):
-        try:
-            return fn()
-        except Exception as e:
-            last_err = e
-            if i == attempts:
-                break
-            wait = 2 ** i
-            print(f"[WARN] {label} failed (attempt {i}/{attempts}): {e}")
-            print(f"[WARN] Waiting {wait}s then retrying...")
-            time.sleep(wait)
-    assert last_err is not None
-    raise last_err
-
 
 def fetch_traditional_totals(season: str, season_type: str) -> pd.DataFrame:
     def _call() -> pd.DataFrame:
@@ -94,6 +66,9 @@ def main() -> int:
     ensure_dir(out_dir)
     ensure_dir("reports")
 
+    session = ingest_session()
+    use_session_for_nba_api(session)
+
     sources = [
         {
             "id": "nba_traditional_totals",
@@ -113,7 +88,7 @@ def main() -> int:
         fid = src["id"]
         fpath = os.path.join(out_dir, src["filename"])
         df = src["fetch"]()
-        atomic_write_parquet(df, fpath)
+        written = write_parquet_if_changed(df, fpath)
         manifest_files.append(
             {
                 "id": fid,
@@ -122,9 +97,13 @@ def main() -> int:
                 "cols": int(df.shape[1]),
                 "ok": True,
                 "error": None,
+                **written,
             }
         )
-        print(f"[OK] Wrote {fid}: {fpath} ({df.shape[0]} rows, {df.shape[1]} cols)")
+        if written["unchanged"]:
+            print(f"[OK] Unchanged {fid}: {fpath} ({df.shape[0]} rows, {df.shape[1]} cols; not rewritten)")
+        else:
+            print(f"[OK] Wrote {fid}: {fpath} ({df.shape[0]} rows, {df.shape[1]} cols)")
 
     manifest = {
         "generated_at_utc": utc_now_iso(),
@@ -133,7 +112,9 @@ def main() -> int:
         "raw_dir": out_dir.replace("\\", "/"),
         "raw_files": manifest_files,
         "ok": True,
+        "unchanged": all(f["unchanged"] for f in manifest_files),
         "policy": {"level": "player", "mode": "totals", "filters": "none"},
+        "http": session.summary(),
     }
 
     with open(os.path.join("reports", "ingest_manifest.json"), "w", encoding="utf-8") as f:
@@ -4,20 +4,58 @@ batch_build_historical.py
 Runs the full ingest + staging + compute pipeline for a list of seasons.
 Logs errors per step and continues on failure. Prints a summary table at the end.
 
+Scheduling:
+  - Network steps (the ingest scripts) run one at a time, season by season,
+    through a single rate-limited lane; --delay is slept between seasons there.
+  - As soon as a season's ingest finishes, its local steps (stage → validate →
+    pct_ast → build_season) are handed to a worker pool sized to the CPU count,
+    so local compute for different seasons overlaps with each other and with
+    the next season's ingest.  build_stage and validate_stage write shared,
+    season-agnostic reports (stage_delta.json, carry_forward_report.json,
+    refresh_status.json, stage_validation.json), so those two steps run one
+    season at a time.
+
+Checkpoints:
+  - Every step run is recorded in reports/batch_checkpoints.json, keyed by
+    (season, season type, step), with the content hashes of the artifacts it
+    wrote and, for local steps, of the inputs it read (the artifacts of the
+    steps before it, its script and the scripts/ modules that imports).
+  - A rerun skips a step whose last run succeeded, whose artifacts are still
+    on disk with the recorded hashes and whose inputs are unchanged, so an
+    interrupted or failed backfill resumes at the step that failed instead of
+    re-ingesting every season.  A rerun step whose artifacts come back
+    identical leaves the steps after it skippable.
+  - The network steps of config current_season (config/buckets.json) always
+    run: that season is still being played, so its source data keeps
+    changing even when the raw files on disk match the ledger.
+  - --force runs every selected step regardless; --only-steps limits the run
+    to the named steps (still checkpointed).
+
 Usage:
     python scripts/local/batch_build_historical.py
     python scripts/local/batch_build_historical.py --seasons 2013-14 2017-18 2021-22
     python scripts/local/batch_build_historical.py --delay 5
+    python scripts/local/batch_build_historical.py --jobs 4
+    python scripts/local/batch_build_historical.py --only-steps build_stage validate_stage --force
+    python scripts/local/batch_build_historical.py --timeout 900
 """
 
+import contextlib
 import json
 import os
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.local.run_pipeline import ALIAS_INPUTS, CONFIG_PATH, hash_inputs, script_sources  # noqa: E402
+
 PYTHON = os.path.join(REPO_ROOT, ".venv", "Scripts", "python.exe")
 SEASON_TYPE = "Regular Season"
 SEASON_TYPE_SLUG = "regular"
@@ -37,55 +75,228 @@ STEPS = [
     ("build_stage",       ["scripts/stage/build_stage_season.py"]),
     ("validate_stage",    ["scripts/qa/validate_stage_season.py"]),
     ("compute_pct_ast",   ["scripts/calculate/compute_pct_ast_pts.py"]),
+    ("build_season",      ["scripts/calculate/build_season.py"]),
 ]
 
-LOG_PATH = os.path.join(REPO_ROOT, "logs", "batch_build_historical.log")
+# Steps that hit external hosts — serialized through the rate-limited lane.
+NETWORK_STEPS = {"run_ingest", "nba_playtypes", "nba_pbpstats", "ctg_league_avgs", "nba_tracking_shots"}
+
+# A failure here stops the rest of the season (downstream would be wrong).
+STOP_ON_FAIL = ("build_stage", "validate_stage")
+
+# Steps that write reports/ files shared by every season — run one at a time.
+SHARED_REPORT_STEPS = ("build_stage", "validate_stage")
+
+# Season artifacts each step writes ({raw}: raw dir, {stg}: staging parquet,
+# {csv}: league table).  validate_stage only writes the shared report.
+STEP_OUTPUTS = {
+    "run_ingest":         ["{raw}/nba_traditional_totals.parquet", "{raw}/nba_passing_totals.parquet"],
+    "nba_playtypes":      ["{raw}/nba_playtypes.parquet"],
+    "nba_pbpstats":       ["{raw}/nba_pbpstats.parquet"],
+    "ctg_league_avgs":    ["{raw}/ctg_league_averages.json"],
+    "nba_tracking_shots": ["{raw}/nba_tracking_shots.json"],
+    "build_stage":        ["{stg}"],
+    "validate_stage":     [],
+    "compute_pct_ast":    ["{raw}/pct_ast_pts_in_pa.json"],
+    "build_season":       ["{csv}"],
+}
+
+# Inputs of local steps besides the upstream artifacts and their scripts
+# (run_pipeline.script_sources())
+STEP_EXTRA_INPUTS = {
+    "build_stage":  ALIAS_INPUTS,
+}
+
+DEFAULT_TIMEOUT = 300
+
+LOG_PATH    = os.path.join(REPO_ROOT, "logs", "batch_build_historical.log")
+LEDGER_PATH = os.path.join(REPO_ROOT, "reports", "batch_checkpoints.json")
+LEDGER_VERSION = 1
+
+
+_LOG_LOCK = threading.Lock()
+_LEDGER_LOCK = threading.Lock()
+_REPORTS_LOCK = threading.Lock()
 
 
 def log(msg: str) -> None:
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     line = f"{ts}  {msg}"
-    print(line, flush=True)
-    with open(LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    with _LOG_LOCK:
+        print(line, flush=True)
+        with open(LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+# ── Checkpoints ───────────────────────────────────────────────────────────────
+
+def checkpoint_key(season: str, season_type: str, step_name: str) -> str:
+    slug = "regular" if season_type == "Regular Season" else "playoffs"
+    return f"{step_name}[{season} {slug}]"
+
+
+def step_paths(step_name: str, season: str) -> tuple[list[str] | None, list[str]]:
+    """
+    Repo-relative (inputs, outputs) of a step for one season.  Inputs are None
+    for network steps: only their artifacts decide whether they rerun.
+    """
+    yy   = season.split("-")[1]
+    fill = {
+        "raw": f"assets/data/raw/{season}/{SEASON_TYPE_SLUG}",
+        "stg": f"assets/data/staging/{season}__{SEASON_TYPE_SLUG}.parquet",
+        "csv": f"assets/data/season/league-table-20{yy}.csv",
+    }
+    names   = [name for name, _ in STEPS]
+    outputs = [p.format(**fill) for p in STEP_OUTPUTS[step_name]]
+    if step_name in NETWORK_STEPS:
+        return None, outputs
+    upstream = [p.format(**fill) for name in names[:names.index(step_name)] for p in STEP_OUTPUTS[name]]
+    scripts  = sorted({dep for script in dict(STEPS)[step_name] for dep in script_sources(script)})
+    return upstream + scripts + STEP_EXTRA_INPUTS.get(step_name, []), outputs
+
+
+def current_season(path: str = CONFIG_PATH) -> str | None:
+    """config current_season (the season in progress), or None if unset or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("current_season") or None
+    except (OSError, ValueError):
+        return None
 
 
-def run_step(step_name: str, script_args: list[str], season: str) -> tuple[bool, str]:
+def load_ledger(path: str = LEDGER_PATH) -> dict:
+    if not os.path.exists(path):
+        return {"version": LEDGER_VERSION, "checkpoints": {}}
+    try:
+        with open(path, encoding="utf-8") as f:
+            ledger = json.load(f)
+    except Exception:
+        log(f"[WARN] Unreadable checkpoint ledger, running every step: {path}")
+        return {"version": LEDGER_VERSION, "checkpoints": {}}
+    if ledger.get("version") != LEDGER_VERSION:
+        log(f"[WARN] Checkpoint ledger version {ledger.get('version')} != {LEDGER_VERSION}, running every step")
+        return {"version": LEDGER_VERSION, "checkpoints": {}}
+    return ledger
+
+
+def save_ledger(ledger: dict, path: str = LEDGER_PATH) -> None:
+    with _LEDGER_LOCK:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(ledger, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+
+def step_run_reason(
+    ledger: dict,
+    step_name: str,
+    season: str,
+    root: str = REPO_ROOT,
+    live_season: str | None = None,
+) -> str | None:
+    """
+    Why the step has to run for season, or None if its checkpoint is still
+    valid (last run succeeded, artifacts unchanged, inputs unchanged).
+    Network steps of live_season (the season in progress) always run.
+    """
+    entry = ledger["checkpoints"].get(checkpoint_key(season, SEASON_TYPE, step_name))
+    if entry is None:
+        return "no checkpoint"
+    if not entry["ok"]:
+        return "failed last run"
+    if step_name in NETWORK_STEPS and season == live_season:
+        return "current season"
+    inputs, outputs = step_paths(step_name, season)
+    _, output_hashes = hash_inputs(outputs, root)
+    if output_hashes != entry["outputs"]:
+        changed = sorted(p for p in output_hashes if output_hashes[p] != entry["outputs"].get(p))
+        return f"artifacts missing or changed: {', '.join(changed)}"
+    if inputs is not None and hash_inputs(inputs, root)[0] != entry["inputs_hash"]:
+        return "inputs changed"
+    return None
+
+
+def record_checkpoint(
+    ledger: dict,
+    step_name: str,
+    season: str,
+    ok: bool,
+    err: str,
+    seconds: float,
+    inputs_hash: str | None,
+    root: str = REPO_ROOT,
+) -> dict:
+    """Record one step run in the ledger (artifact hashes taken now) and return the entry."""
+    _, outputs = step_paths(step_name, season)
+    entry = {
+        "season":       season,
+        "season_type":  SEASON_TYPE,
+        "step":         step_name,
+        "ok":           ok,
+        "error":        err or None,
+        "seconds":      round(seconds, 2),
+        "completed_at": datetime.now().isoformat(),
+        "inputs_hash":  inputs_hash,
+        "outputs":      hash_inputs(outputs, root)[1] if ok else {},
+    }
+    with _LEDGER_LOCK:
+        ledger["checkpoints"][checkpoint_key(season, SEASON_TYPE, step_name)] = entry
+    return entry
+
+
+def select_steps(only_steps: list[str] | None) -> list[tuple[str, list[str]]]:
+    """STEPS, limited to only_steps (in STEPS order) when given."""
+    if not only_steps:
+        return list(STEPS)
+    names   = [name for name, _ in STEPS]
+    unknown = [s for s in only_steps if s not in names]
+    if unknown:
+        raise ValueError(f"Unknown step(s) {unknown}. Valid: {names}")
+    return [s for s in STEPS if s[0] in only_steps]
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def run_step(step_name: str, script_args: list[str], season: str, timeout: float = DEFAULT_TIMEOUT) -> tuple[bool, str]:
     cmd = [PYTHON] + script_args + ["--season", season, "--season-type", SEASON_TYPE]
-    log(f"  [{step_name}] Running: {' '.join(cmd[1:])}")
+    tag = f"{season} {step_name}"
+    log(f"  [{tag}] Running: {' '.join(cmd[1:])}")
     try:
         result = subprocess.run(
             cmd,
             cwd=REPO_ROOT,
             capture_output=True,
             text=True,
-            timeout=300,  # 5 min per step
+            timeout=timeout,
         )
         if result.returncode != 0:
             err = (result.stderr or result.stdout or "").strip().splitlines()
             short_err = err[-1] if err else f"exit code {result.returncode}"
-            log(f"  [{step_name}] FAILED: {short_err}")
+            log(f"  [{tag}] FAILED: {short_err}")
             return False, short_err
-        log(f"  [{step_name}] OK")
+        log(f"  [{tag}] OK")
         return True, ""
     except subprocess.TimeoutExpired:
-        msg = "Timed out after 5 minutes"
-        log(f"  [{step_name}] FAILED: {msg}")
+        msg = f"Timed out after {timeout:g}s"
+        log(f"  [{tag}] FAILED: {msg}")
         return False, msg
     except Exception as e:
-        log(f"  [{step_name}] FAILED: {e}")
+        log(f"  [{tag}] FAILED: {e}")
         return False, str(e)
 
 
 def read_staging_info(season: str) -> tuple[int, int]:
     """Return (rows, cols) from staging parquet, or (-1, -1) on error."""
     try:
-        import pandas as pd
+        if REPO_ROOT not in sys.path:
+            sys.path.insert(0, REPO_ROOT)
+        from scripts.stage.staging_dtypes import read_staging_parquet
         path = os.path.join(REPO_ROOT, "assets", "data", "staging",
                             f"{season}__{SEASON_TYPE_SLUG}.parquet")
         if not os.path.exists(path):
             return -1, -1
-        df = pd.read_parquet(path)
+        df = read_staging_parquet(path)
         return int(df.shape[0]), int(df.shape[1])
     except Exception:
         return -1, -1
@@ -104,13 +315,71 @@ def read_pct_ast(season: str) -> str:
         return "error"
 
 
+def run_season_steps(
+    season: str,
+    steps: list[tuple[str, list[str]]],
+    season_result: dict,
+    ledger: dict,
+    force: bool = False,
+    timeout: float = DEFAULT_TIMEOUT,
+    live_season: str | None = None,
+) -> bool:
+    """
+    Run steps for one season in order, recording each in season_result and
+    the checkpoint ledger.  Steps with a valid checkpoint are skipped unless
+    force (see step_run_reason() for live_season).  Returns False if a
+    STOP_ON_FAIL step failed and the season was stopped.
+    """
+    for step_name, script_args in steps:
+        reason = "--force" if force else step_run_reason(ledger, step_name, season, live_season=live_season)
+        if reason is None:
+            log(f"  [{season} {step_name}] SKIP: checkpoint valid")
+            season_result["steps"][step_name] = {"ok": True, "err": "", "skipped": True}
+            continue
+
+        inputs, _ = step_paths(step_name, season)
+        inputs_hash = hash_inputs(inputs)[0] if inputs is not None else None
+        log(f"  [{season} {step_name}] Run: {reason}")
+        with _REPORTS_LOCK if step_name in SHARED_REPORT_STEPS else contextlib.nullcontext():
+            t0 = time.perf_counter()
+            ok, err = run_step(step_name, script_args, season, timeout)
+            seconds = time.perf_counter() - t0
+        record_checkpoint(ledger, step_name, season, ok, err, seconds, inputs_hash)
+        save_ledger(ledger)
+        season_result["steps"][step_name] = {"ok": ok, "err": err, "skipped": False}
+        if not ok:
+            if season_result["failed_step"] is None:
+                season_result["failed_step"] = step_name
+            # Continue running remaining steps even if one fails,
+            # unless it's a dependency (compute needs staging)
+            if step_name in STOP_ON_FAIL:
+                log(f"  Stopping season {season} -- staging step failed.")
+                return False
+    return True
+
+
+def run_local_steps(season: str, steps: list[tuple[str, list[str]]], season_result: dict, ledger: dict,
+                    force: bool, timeout: float) -> None:
+    local_steps = [s for s in steps if s[0] not in NETWORK_STEPS]
+    run_season_steps(season, local_steps, season_result, ledger, force, timeout)
+    log(f"  Season {season}: local steps done.")
+
+
 def main() -> None:
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--seasons", nargs="+", default=None,
                         help="Subset of seasons to run (default: all)")
     parser.add_argument("--delay", type=int, default=2,
-                        help="Seconds to sleep between seasons (default: 2)")
+                        help="Seconds to sleep between seasons in the network lane (default: 2)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Seasons whose local steps may run at once (default: CPU count)")
+    parser.add_argument("--only-steps", nargs="+", default=None, metavar="STEP",
+                        help=f"Run only these steps (default: all of {[name for name, _ in STEPS]})")
+    parser.add_argument("--force", action="store_true",
+                        help="Run the selected steps even when their checkpoints are valid")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds before a step is killed and marked failed (default: {DEFAULT_TIMEOUT})")
     args = parser.parse_args()
 
     seasons = args.seasons if args.seasons else SEASONS
@@ -121,37 +390,58 @@ def main() -> None:
         if s not in SEASONS:
             print(f"[ERROR] Unknown season: {s}. Valid: {SEASONS}")
             return
+    try:
+        steps = select_steps(args.only_steps)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return
 
     os.makedirs(os.path.join(REPO_ROOT, "logs"), exist_ok=True)
     log("=" * 70)
-    log(f"batch_build_historical.py  --  {len(seasons)} seasons  (delay={inter_delay}s)")
+    log(f"batch_build_historical.py  --  {len(seasons)} seasons  "
+        f"(delay={inter_delay}s, jobs={args.jobs}, timeout={args.timeout:g}s"
+        f"{', force' if args.force else ''})")
+    if args.only_steps:
+        log(f"Only steps: {', '.join(name for name, _ in steps)}")
+    live_season = current_season()
+    log(f"Checkpoints: {LEDGER_PATH}")
+    if live_season in seasons:
+        log(f"Current season {live_season}: ingest always runs")
     log("=" * 70)
 
+    ledger  = load_ledger()
     results: dict[str, dict] = {}
-
-    for i, season in enumerate(seasons):
-        log(f"\n{'='*70}")
-        log(f"Season {i+1}/{len(seasons)}: {season}")
-        log(f"{'='*70}")
-
-        season_result = {
-            "steps": {},
-            "failed_step": None,
-        }
-
-        for step_name, script_args in STEPS:
-            ok, err = run_step(step_name, script_args, season)
-            season_result["steps"][step_name] = {"ok": ok, "err": err}
-            if not ok:
-                if season_result["failed_step"] is None:
-                    season_result["failed_step"] = step_name
-                # Continue running remaining steps even if one fails,
-                # unless it's a dependency (staging needs ingest, compute needs staging)
-                # Stop season on: build_stage or validate_stage failure (downstream will be wrong)
-                if step_name in ("build_stage", "validate_stage"):
-                    log(f"  Stopping season {season} -- staging step failed.")
-                    break
-
+    network_steps = [s for s in steps if s[0] in NETWORK_STEPS]
+
+    # Network lane runs on this thread; each season's local steps go to the pool
+    # as soon as its ingest is done.
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = []
+        for i, season in enumerate(seasons):
+            log(f"\n{'='*70}")
+            log(f"Season {i+1}/{len(seasons)}: {season}")
+            log(f"{'='*70}")
+
+            season_result = {
+                "steps": {},
+                "failed_step": None,
+            }
+            results[season] = season_result
+
+            run_season_steps(season, network_steps, season_result, ledger, args.force, args.timeout, live_season)
+            futures.append(pool.submit(run_local_steps, season, steps, season_result, ledger,
+                                       args.force, args.timeout))
+
+            # Only throttle between seasons that actually hit the network
+            ran_network = any(not season_result["steps"][name]["skipped"] for name, _ in network_steps)
+            if ran_network and i < len(seasons) - 1:
+                log(f"\n  Sleeping {inter_delay}s before next season's ingest...")
+                time.sleep(inter_delay)
+
+        for fut in futures:
+            fut.result()
+
+    for season, season_result in results.items():
         rows, cols = read_staging_info(season)
         pct_ast    = read_pct_ast(season)
         season_result["rows"]    = rows
@@ -161,12 +451,6 @@ def main() -> None:
         all_ok = all(v["ok"] for v in season_result["steps"].values())
         season_result["overall_ok"] = all_ok
 
-        results[season] = season_result
-
-        if i < len(seasons) - 1:
-            log(f"\n  Sleeping {inter_delay}s before next season...")
-            time.sleep(inter_delay)
-
     # ── Summary table (all 13 seasons, merging prior results for skipped ones) ─
     # Load prior results for seasons not in this run
     prior_summary_path = os.path.join(REPO_ROOT, "reports", "batch_build_historical.json")
@@ -204,6 +488,9 @@ def main() -> None:
     log("=" * 70)
     n_pass = sum(1 for r in all_results.values() if r.get("overall_ok"))
     log(f"Result: {n_pass}/{len(all_results)} seasons fully passed.")
+    step_results = [v for r in results.values() for v in r["steps"].values()]
+    n_skipped = sum(1 for v in step_results if v.get("skipped"))
+    log(f"Steps this run: {len(step_results) - n_skipped} ran, {n_skipped} skipped (valid checkpoints).")
 
     # Write machine-readable summary (full 13-season view)
     summary_path = os.path.join(REPO_ROOT, "reports", "batch_build_historical.json")
@@ -0,0 +1,325 @@
+"""
+run_pipeline.py
+
+Incremental ingest → stage → validate → pct_ast → build_season → tests → master
+runner for one season.  Replaces the linear step chain in update.ps1.
+
+Every non-ingest step declares its input files (raw data, CTG JSON, alias
+mappings, the script it runs and every scripts/ module that script imports,
+found by script_sources()).  Before a step runs, those inputs are
+content-hashed; if the combined hash matches the one recorded for the last
+successful run and the step's outputs still exist, the step is skipped.
+Hashes are kept in reports/pipeline_manifest.json.
+
+The ingest step always runs (it is what refreshes the raw files); it runs
+all five ingest sources concurrently (scripts/ingest/ingest_all.py).  When
+the raw files come back byte-identical, everything downstream is skipped and
+no artifacts are regenerated.  When a step does run, its new outputs change
+the input hashes of the steps after it, so changes propagate on their own.
+
+Stops at the first failed step (exit code 1), like update.ps1 did.
+
+Usage:
+    python scripts/local/run_pipeline.py
+    python scripts/local/run_pipeline.py --season 2025-26 --season-type "Regular Season"
+    python scripts/local/run_pipeline.py --skip-ingest
+    python scripts/local/run_pipeline.py --force
+"""
+
+import argparse
+import ast
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+CONFIG_PATH = os.path.join(REPO_ROOT, "config", "buckets.json")
+MANIFEST_PATH = os.path.join(REPO_ROOT, "reports", "pipeline_manifest.json")
+
+# build_stage and build_master read the alias table through
+# player_names.load_alias_index(), which builds it from the name fixer inputs
+ALIAS_INPUTS = ["mappings/name_fixer_inputs/*.csv", "scripts/player_names.py"]
+
+
+def script_sources(script: str, root: str = REPO_ROOT) -> list[str]:
+    """
+    script plus every scripts/ module it imports, directly or through other
+    scripts/ modules (repo-relative, sorted), so that editing any of them
+    changes the input hash of the step that runs it.
+    """
+    found: set[str] = set()
+    todo = [script]
+    while todo:
+        rel = todo.pop()
+        if rel in found:
+            continue
+        found.add(rel)
+        try:
+            with open(os.path.join(root, rel), encoding="utf-8") as f:
+                tree = ast.parse(f.read(), filename=rel)
+        except (OSError, SyntaxError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                modules = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            elif isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            else:
+                continue
+            for module in modules:
+                dep = module.replace(".", "/") + ".py"
+                if module.startswith("scripts.") and os.path.exists(os.path.join(root, dep)):
+                    todo.append(dep)
+    return sorted(found)
+
+
+CALC_SOURCES = script_sources("scripts/calculate/build_season.py")
+
+
+def build_steps(season: str, season_type: str) -> list[dict]:
+    """
+    The pipeline DAG for one season, in run order.
+
+    Each step is a dict:
+        name:    step name (manifest key is "<name>[<season> <slug>]" for
+                 per-season steps, "<name>" for cross-season ones)
+        cmd:     script path + args, run with the current interpreter
+        inputs:  repo-relative paths / glob patterns hashed to decide skipping;
+                 None means "always run" (network ingest)
+        outputs: repo-relative paths that must exist for a skip to be valid
+    """
+    slug = "regular" if season_type == "Regular Season" else "playoffs"
+    yy   = season.split("-")[1]
+    raw  = f"assets/data/raw/{season}/{slug}"
+    stg  = f"assets/data/staging/{season}__{slug}.parquet"
+    csv  = f"assets/data/season/league-table-20{yy}.csv"
+    args = ["--season", season, "--season-type", season_type]
+
+    def ingest(name: str, script: str) -> dict:
+        return {"name": name, "cmd": [script] + args, "inputs": None, "outputs": [], "season": True}
+
+    return [
+        # All five ingest sources, concurrently (scripts/ingest/ingest_all.py)
+        ingest("ingest_all", "scripts/ingest/ingest_all.py"),
+        {
+            "name": "build_stage",
+            "cmd": ["scripts/stage/build_stage_season.py"] + args,
+            "inputs": [
+                f"{raw}/nba_traditional_totals.parquet",
+                f"{raw}/nba_passing_totals.parquet",
+                f"{raw}/nba_playtypes.parquet",
+                f"{raw}/nba_pbpstats.parquet",
+                f"{raw}/ctg_league_averages.json",
+            ] + ALIAS_INPUTS + script_sources("scripts/stage/build_stage_season.py"),
+            "outputs": [stg],
+            "season": True,
+        },
+        {
+            "name": "validate_stage",
+            "cmd": ["scripts/qa/validate_stage_season.py"] + args,
+            "inputs": [stg] + script_sources("scripts/qa/validate_stage_season.py"),
+            "outputs": ["reports/stage_validation.json"],
+            "season": True,
+        },
+        {
+            "name": "compute_pct_ast",
+            "cmd": ["scripts/calculate/compute_pct_ast_pts.py"] + args,
+            "inputs": [
+                stg,
+                f"{raw}/nba_tracking_shots.json",
+                f"{raw}/nba_playtypes.parquet",
+            ] + script_sources("scripts/calculate/compute_pct_ast_pts.py"),
+            "outputs": [f"{raw}/pct_ast_pts_in_pa.json"],
+            "season": True,
+        },
+        {
+            "name": "build_season",
+            "cmd": ["scripts/calculate/build_season.py"] + args,
+            "inputs": [
+                stg,
+                f"{raw}/ctg_league_averages.json",
+                f"{raw}/pct_ast_pts_in_pa.json",
+            ] + CALC_SOURCES,
+            "outputs": [csv],
+            "season": True,
+        },
+        {
+            "name": "test_end_to_end",
+            "cmd": ["tests/test_end_to_end.py"],
+            "inputs": [
+                "assets/data/season/league-table-20*.csv",
+                stg,
+                f"{raw}/ctg_league_averages.json",
+                f"{raw}/pct_ast_pts_in_pa.json",
+            ] + sorted(set(script_sources("tests/test_end_to_end.py") + CALC_SOURCES)),
+            "outputs": [],
+            "season": False,
+        },
+        {
+            "name": "build_master",
+            "cmd": ["scripts/build_master.py"],
+            "inputs": [
+                "assets/data/season/*.csv",
+            ] + ALIAS_INPUTS + script_sources("scripts/build_master.py"),
+            "outputs": ["assets/data/league-table-combined.csv"],
+            "season": False,
+        },
+    ]
+
+
+# ── Hashing ───────────────────────────────────────────────────────────────────
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_inputs(patterns: list[str], root: str = REPO_ROOT) -> tuple[str, dict[str, str]]:
+    """
+    Content-hash every file matched by patterns (paths or globs relative to root).
+
+    Returns (combined_hash, {relpath: sha256}).  A pattern that matches nothing
+    is recorded as "missing" so that a file appearing later changes the hash.
+    """
+    files: dict[str, str] = {}
+    for pattern in patterns:
+        matches = sorted(glob.glob(os.path.join(root, pattern)))
+        if not matches:
+            files[pattern] = "missing"
+            continue
+        for path in matches:
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            files[rel] = file_sha256(path)
+
+    combined = hashlib.sha256()
+    for rel in sorted(files):
+        combined.update(f"{rel}\0{files[rel]}\n".encode("utf-8"))
+    return combined.hexdigest(), files
+
+
+# ── Manifest ──────────────────────────────────────────────────────────────────
+
+def load_manifest() -> dict:
+    if not os.path.exists(MANIFEST_PATH):
+        return {"steps": {}}
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        data.setdefault("steps", {})
+        return data
+    except Exception:
+        print(f"[WARN] Unreadable manifest, treating all steps as changed: {MANIFEST_PATH}")
+        return {"steps": {}}
+
+
+def save_manifest(manifest: dict) -> None:
+    manifest["generated_at"] = datetime.now(timezone.utc).isoformat()
+    os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+    tmp = MANIFEST_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, MANIFEST_PATH)
+
+
+# ── Runner ────────────────────────────────────────────────────────────────────
+
+def step_key(step: dict, season: str, season_type: str) -> str:
+    if not step["season"]:
+        return step["name"]
+    slug = "regular" if season_type == "Regular Season" else "playoffs"
+    return f"{step['name']}[{season} {slug}]"
+
+
+def run_command(cmd: list[str]) -> int:
+    result = subprocess.run([sys.executable] + cmd, cwd=REPO_ROOT)
+    return result.returncode
+
+
+def run_pipeline(
+    season: str,
+    season_type: str,
+    force: bool = False,
+    skip_ingest: bool = False,
+) -> int:
+    """Run the pipeline for one season; returns 0 on success, 1 on the first failure."""
+    manifest = load_manifest()
+    counts   = {"ran": 0, "skipped": 0}
+    t_start  = time.perf_counter()
+
+    for step in build_steps(season, season_type):
+        key = step_key(step, season, season_type)
+
+        if step["inputs"] is None:
+            if skip_ingest:
+                print(f"[SKIP] {key}: --skip-ingest")
+                counts["skipped"] += 1
+                continue
+            digest, files = None, {}
+        else:
+            digest, files = hash_inputs(step["inputs"])
+            prev = manifest["steps"].get(key, {})
+            outputs_ok = all(os.path.exists(os.path.join(REPO_ROOT, p)) for p in step["outputs"])
+            if not force and outputs_ok and prev.get("inputs_hash") == digest:
+                print(f"[SKIP] {key}: inputs unchanged ({digest[:12]})")
+                counts["skipped"] += 1
+                continue
+
+        print(f"[INFO] Running {key}: {' '.join(step['cmd'])}", flush=True)
+        t0 = time.perf_counter()
+        rc = run_command(step["cmd"])
+        elapsed = round(time.perf_counter() - t0, 2)
+        if rc != 0:
+            print(f"[ERROR] {key} failed (exit code {rc}). Pipeline stopped.")
+            save_manifest(manifest)
+            return 1
+
+        counts["ran"] += 1
+        print(f"[OK]   {key} ({elapsed}s)")
+        if digest is not None:
+            # Only successful runs are recorded, so a failed step reruns next time.
+            manifest["steps"][key] = {
+                "inputs_hash": digest,
+                "inputs":      files,
+                "ran_at":      datetime.now(timezone.utc).isoformat(),
+                "seconds":     elapsed,
+            }
+        save_manifest(manifest)
+
+    total = round(time.perf_counter() - t_start, 2)
+    print(f"[OK] Pipeline complete: {counts['ran']} ran, {counts['skipped']} skipped ({total}s)")
+    return 0
+
+
+def main() -> int:
+    with open(CONFIG_PATH, encoding="utf-8") as f:
+        cfg = json.load(f)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season",      default=cfg.get("current_season"),
+                        help='e.g. "2025-26" (default: config current_season)')
+    parser.add_argument("--season-type", default=cfg.get("default_season_type"),
+                        help='e.g. "Regular Season" (default: config default_season_type)')
+    parser.add_argument("--force",       action="store_true",
+                        help="Run every step even when its inputs are unchanged")
+    parser.add_argument("--skip-ingest", action="store_true",
+                        help="Skip the network ingest steps and rebuild from the raw files on disk")
+    args = parser.parse_args()
+
+    if not args.season:
+        raise ValueError("config current_season is blank")
+    if not args.season_type:
+        raise ValueError("config default_season_type is blank")
+
+    return run_pipeline(args.season, args.season_type, force=args.force, skip_ingest=args.skip_ingest)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
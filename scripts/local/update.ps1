@@ -1,5 +1,6 @@
 # scripts/local/update.ps1
-# Runs: pull -> ingest -> stage -> validate -> calculate -> test -> master -> commit+push (if changed)
+# Runs: pull -> run_pipeline.py (ingest -> stage -> validate -> calculate -> test -> master,
+#       skipping unchanged steps) -> commit+push (if changed)
 # Uses config from: config\buckets.json
 # Writes logs to: logs\update.log
 
@@ -73,50 +74,13 @@ try {
   git checkout main | Out-Null
   git pull | Out-Null
 
-  # ---- Ingest / Stage / Validate (stop immediately if any fails) ----
-  Write-Log "Running ingest..."
-  & $VenvPython scripts/ingest/run_ingest.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "Ingest failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Running play-type ingest..."
-  & $VenvPython scripts/ingest/nba_playtypes.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "Play-type ingest failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Running PBPStats ingest..."
-  & $VenvPython scripts/ingest/nba_pbpstats.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "PBPStats ingest failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Running CTG league averages ingest..."
-  & $VenvPython scripts/ingest/ctg_league_avgs.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "CTG league averages ingest failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Running tracking shots ingest..."
-  & $VenvPython scripts/ingest/nba_tracking_shots.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "Tracking shots ingest failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Building staging..."
-  & $VenvPython scripts/stage/build_stage_season.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "Stage build failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Validating staging..."
-  & $VenvPython scripts/qa/validate_stage_season.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "Stage validation failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Computing PCT_AST_PTS_IN_PA..."
-  & $VenvPython scripts/calculate/compute_pct_ast_pts.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "PCT_AST_PTS_IN_PA computation failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Building season calculations..."
-  & $VenvPython scripts/calculate/build_season.py --season $Season --season-type $SeasonType
-  if ($LASTEXITCODE -ne 0) { throw "build_season failed (exit code $LASTEXITCODE)." }
-
-  Write-Log "Running end-to-end test suite..."
-  & $VenvPython tests/test_end_to_end.py
-  if ($LASTEXITCODE -ne 0) { throw "End-to-end tests failed (exit code $LASTEXITCODE). Pipeline stopped before commit." }
-
-  Write-Log "Building master combined CSV..."
-  & $VenvPython scripts/build_master.py
-  if ($LASTEXITCODE -ne 0) { throw "build_master failed (exit code $LASTEXITCODE)." }
+  # ---- Ingest -> stage -> validate -> calculate -> test -> master ----
+  # run_pipeline.py content-hashes each step's inputs and skips steps whose
+  # inputs are unchanged since the last successful run (reports/pipeline_manifest.json).
+  # Stops at the first failed step.
+  Write-Log "Running pipeline..."
+  & $VenvPython scripts/local/run_pipeline.py --season $Season --season-type $SeasonType
+  if ($LASTEXITCODE -ne 0) { throw "Pipeline failed (exit code $LASTEXITCODE). Stopped before commit." }
 
   # ---- Commit only if changed ----
   Write-Log "Checking for changes to commit..."
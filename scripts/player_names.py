@@ -0,0 +1,271 @@
+"""
+player_names.py
+
+Player-name normalization shared by the alias build (build_player_aliases.py),
+the master build (build_master.py) and staging (PBPStats name fallback in
+build_stage_season.py), plus the cached alias index.
+
+Keys and display names:
+    clean_display_name()  mojibake repair + accent strip (ASCII site display name)
+    make_player_key()     clean_display_name(), lowercased, alphanumeric only
+Both are memoized.  clean_display_names() / player_keys() are the bulk
+versions: they deduplicate first and clean the distinct values with
+vectorized string operations (repair attempted only on strings with a
+mojibake marker, one translation table for combining marks and special
+letters).
+
+Alias index:
+    build_alias_table() turns mappings/name_fixer_inputs/*.csv into the alias
+    table (player_key, display_name, source, source_name, source_key) that
+    build_player_aliases.py writes as mappings/player_aliases.csv.
+    load_alias_index() returns the same table from a pickle cache
+    (mappings/player_alias_index.pkl, not committed), rebuilding it when the
+    name fixer inputs or ALIAS_INDEX_VERSION change.  Pickle rather than
+    parquet: the build-master workflow installs pandas only.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import pickle
+import re
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT        = Path(__file__).resolve().parents[1]
+NAME_FIXER_DIR   = REPO_ROOT / "mappings" / "name_fixer_inputs"
+ALIAS_INDEX_PATH = REPO_ROOT / "mappings" / "player_alias_index.pkl"
+
+# Bump when the key / display rules or the index layout change
+ALIAS_INDEX_VERSION = 1
+
+# Master column (required) and optional per-source columns of a Name Fixer CSV
+MASTER_COLUMN  = "NBA Names"
+SOURCE_COLUMNS = [
+    ("bbi", "BBI Names"),
+    ("pbp", "PBP stats names"),
+    ("syn", "Synergy names"),
+]
+ALIAS_COLUMNS = ["player_key", "display_name", "source", "source_name", "source_key"]
+
+CSV_ENCODINGS = ["utf-8", "utf-8-sig", "cp1252", "latin1"]
+
+_MOJIBAKE_MARKERS = ("Ã", "Ä", "Â", "â", "€", "œ", "�", "Å")
+_MOJIBAKE_PATTERN = "[" + "".join(_MOJIBAKE_MARKERS) + "]"
+_NON_ASCII        = r"[^\x00-\x7f]"
+_NON_KEY_CHARS    = re.compile(r"[^a-z0-9]+")
+
+# Letters NFKD does not decompose, folded by hand
+_ASCII_FOLDS = {"Ł": "L", "ł": "l", "Đ": "D", "đ": "d", "Ø": "O", "ø": "o", "ß": "ss"}
+_ASCII_FOLD_TABLE = str.maketrans(_ASCII_FOLDS)
+
+
+# ── Normalization ─────────────────────────────────────────────────────────────
+
+def repair_mojibake(s: str) -> str:
+    s = (s or "").strip()
+    if not s:
+        return ""
+    if any(ch in s for ch in _MOJIBAKE_MARKERS):
+        for enc in ("latin1", "cp1252"):
+            try:
+                return s.encode(enc).decode("utf-8")
+            except UnicodeError:
+                pass
+    return s
+
+
+def strip_accents(s: str) -> str:
+    s = (s or "").strip()
+    if not s:
+        return ""
+    s_norm = unicodedata.normalize("NFKD", s)
+    s_no = "".join(ch for ch in s_norm if not unicodedata.combining(ch))
+    return s_no.translate(_ASCII_FOLD_TABLE)
+
+
+@functools.lru_cache(maxsize=None)
+def clean_display_name(s: str) -> str:
+    """Accentless, mojibake-proof site display name."""
+    return strip_accents(repair_mojibake(s))
+
+
+@functools.lru_cache(maxsize=None)
+def make_player_key(s: str) -> str:
+    """Key used for matching across sources (lower + alnum only)."""
+    return _NON_KEY_CHARS.sub("", clean_display_name(s).lower())
+
+
+def _accent_table(names: pd.Series) -> dict[int, str | None]:
+    """Translation table deleting every combining mark in names and folding _ASCII_FOLDS."""
+    chars = set("".join(names))
+    table = {ord(ch): None for ch in chars if unicodedata.combining(ch)}
+    table.update(_ASCII_FOLD_TABLE)
+    return table
+
+
+def _clean_unique(names: pd.Series) -> pd.Series:
+    """
+    clean_display_name() over distinct strings, vectorized: only strings with a
+    mojibake marker go through the encode/decode repair, and only non-ASCII
+    strings are NFKD-normalized and run through one translation table.
+    """
+    out = names.str.strip()
+
+    broken = out.str.contains(_MOJIBAKE_PATTERN, regex=True)
+    if broken.any():
+        out[broken] = out[broken].map(repair_mojibake)
+        out = out.str.strip()
+
+    accented = out.str.contains(_NON_ASCII, regex=True)
+    if accented.any():
+        decomposed = out[accented].str.normalize("NFKD")
+        out[accented] = decomposed.str.translate(_accent_table(decomposed))
+    return out
+
+
+def _map_unique(values: pd.Series, bulk) -> pd.Series:
+    """bulk() over the distinct non-null values of a Series, mapped back; nulls → ""."""
+    present = values.dropna().astype(str)
+    uniq    = pd.Series(present.unique(), dtype=object)
+    mapped  = present.map(dict(zip(uniq, bulk(uniq))))
+    return mapped.reindex(values.index, fill_value="").astype(object)
+
+
+def clean_display_names(values: pd.Series) -> pd.Series:
+    """clean_display_name() for a whole Series."""
+    return _map_unique(values, _clean_unique)
+
+
+def player_keys(values: pd.Series) -> pd.Series:
+    """make_player_key() for a whole Series."""
+    return _map_unique(
+        values, lambda uniq: _clean_unique(uniq).str.lower().str.replace(_NON_KEY_CHARS, "", regex=True)
+    )
+
+
+# ── Alias table ───────────────────────────────────────────────────────────────
+
+def read_name_fixer_csv(path: Path) -> pd.DataFrame:
+    """Read one Name Fixer CSV as strings, trying CSV_ENCODINGS in turn."""
+    last_err = None
+    for enc in CSV_ENCODINGS:
+        try:
+            return pd.read_csv(path, encoding=enc, dtype=str, keep_default_na=False, na_filter=False)
+        except UnicodeDecodeError as e:
+            last_err = e
+    raise SystemExit(f"Could not decode Name Fixer CSV {path.name}. Last error: {last_err}")
+
+
+def name_fixer_files(input_dir: Path = NAME_FIXER_DIR) -> list[Path]:
+    files = sorted(Path(input_dir).glob("*.csv"))
+    if not files:
+        raise SystemExit(f"No input CSVs found in {input_dir}")
+    return files
+
+
+def build_alias_table(input_dir: Path = NAME_FIXER_DIR) -> pd.DataFrame:
+    """
+    Alias rows for every Name Fixer CSV, in file / row / source order: the NBA
+    name itself (source "nba") and then each non-blank source name.  The first
+    row per (source, source_key) wins.
+    """
+    frames = []
+    for f in name_fixer_files(input_dir):
+        df = read_name_fixer_csv(f)
+        if MASTER_COLUMN not in df.columns:
+            raise SystemExit(f"{f.name} is missing required master column: '{MASTER_COLUMN}'")
+
+        nba_disp = clean_display_names(df[MASTER_COLUMN])
+        has_nba  = nba_disp.ne("")
+        rows     = pd.DataFrame({
+            "player_key":   player_keys(nba_disp),
+            "display_name": nba_disp,
+        })[has_nba]
+
+        # Always include the NBA name as an alias too
+        parts = [rows.assign(source="nba", source_name=rows["display_name"], _order=0)]
+        for order, (source, col) in enumerate(SOURCE_COLUMNS, start=1):
+            if col not in df.columns:
+                continue
+            raw = df.loc[has_nba, col].str.strip()
+            src = rows[raw.ne("")]
+            parts.append(src.assign(source=source, source_name=clean_display_names(raw[raw.ne("")]), _order=order))
+
+        # Row-major order (each NBA row followed by its source names)
+        long = pd.concat(parts).rename_axis("_row").reset_index()
+        long = long.sort_values(["_row", "_order"], kind="mergesort")
+        long["source_key"] = player_keys(long["source_name"])
+        frames.append(long[ALIAS_COLUMNS])
+
+    return (
+        pd.concat(frames, ignore_index=True)
+        .drop_duplicates(subset=["source", "source_key"])
+        .reset_index(drop=True)
+    )
+
+
+def alias_collisions(aliases: pd.DataFrame) -> pd.DataFrame:
+    """(source, source_key) pairs mapping to more than one player_key."""
+    counts = (
+        aliases.groupby(["source", "source_key"])["player_key"]
+        .nunique()
+        .reset_index(name="player_key_count")
+    )
+    return counts[counts["player_key_count"] > 1]
+
+
+# ── Cached index ──────────────────────────────────────────────────────────────
+
+def name_fixer_fingerprint(input_dir: Path = NAME_FIXER_DIR) -> str:
+    """sha256 over ALIAS_INDEX_VERSION and every input file's name and bytes."""
+    h = hashlib.sha256(f"v{ALIAS_INDEX_VERSION}".encode())
+    for f in name_fixer_files(input_dir):
+        h.update(f.name.encode("utf-8"))
+        h.update(f.read_bytes())
+    return h.hexdigest()
+
+
+def write_alias_index(aliases: pd.DataFrame, fingerprint: str, path: Path = ALIAS_INDEX_PATH) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": ALIAS_INDEX_VERSION, "fingerprint": fingerprint, "aliases": aliases}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+
+
+def load_alias_index(input_dir: Path = NAME_FIXER_DIR, path: Path = ALIAS_INDEX_PATH) -> pd.DataFrame:
+    """
+    The alias table, from the cached index when it matches the current name
+    fixer inputs; otherwise rebuilt from them and re-cached.
+    """
+    fingerprint = name_fixer_fingerprint(input_dir)
+    path = Path(path)
+    if path.exists():
+        try:
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("version") == ALIAS_INDEX_VERSION and cached.get("fingerprint") == fingerprint:
+                return cached["aliases"]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            pass
+
+    aliases = build_alias_table(input_dir)
+    if not alias_collisions(aliases).empty:
+        raise SystemExit("Alias collisions found. Run: python scripts/build_player_aliases.py")
+    write_alias_index(aliases, fingerprint, path)
+    print(f"[INFO] Rebuilt alias index: {path} ({len(aliases):,} aliases)")
+    return aliases
+
+
+def alias_lookup(source: str, value: str = "player_key", aliases: pd.DataFrame | None = None) -> dict[str, str]:
+    """{source_key: value} for one source ("nba", "bbi", "pbp", "syn")."""
+    if aliases is None:
+        aliases = load_alias_index()
+    rows = aliases[aliases["source"] == source]
+    return dict(zip(rows["source_key"], rows[value]))
@@ -1,32 +1,181 @@
 import argparse
+import hashlib
 import json
 import os
+import sys
 from datetime import datetime, timezone
 
 import pandas as pd
 
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.stage.staging_dtypes import plain_dtype, read_staging_parquet
+
+
+# Secondary-source column prefixes checked for a failed merge:
+# (prefix, message when no columns, message when missing for almost everyone)
+SOURCE_CHECKS = [
+    ("nba_pass__",
+     "No nba_pass__* columns found. Passing data did not merge into staging.",
+     "Passing columns exist but are missing for almost everyone ({missing}/{n}). "
+     "This usually means team-level or error payload merged incorrectly."),
+    ("nba_pt_",
+     "No nba_pt_* columns found. Play-type data did not merge into staging.",
+     "Play-type columns exist but are missing for almost everyone ({missing}/{n}). "
+     "This usually means the play-type endpoint returned unexpected data."),
+    ("pbp__",
+     "No pbp__* columns found. PBPStats data did not merge into staging.",
+     "PBPStats columns exist but are missing for almost everyone ({missing}/{n}). "
+     "This usually means the name join failed entirely."),
+]
+
+# Source prefixes summarized in the report (the checked ones plus traditional)
+SOURCE_PREFIXES = ["nba_trad__"] + [prefix for prefix, _, _ in SOURCE_CHECKS]
+
+# Carry-forward flag columns share their source's prefix but are never null
+CARRIED_FORWARD_SUFFIX = "carried_forward"
+
+# Warn when a column's null rate rises by more than this since the previous run
+NULL_RATE_JUMP = 0.25
+# Warn when the row count changes by more than this fraction since the previous run
+ROW_COUNT_CHANGE = 0.10
+
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--season", required=True)
-    parser.add_argument("--season-type", required=True)
-    args = parser.parse_args()
+def schema_fingerprint(df: pd.DataFrame) -> str:
+    """
+    sha256 over column names and dtypes.  Dtypes are taken before the compact
+    staging policy, so a frame read back from the parquet and the frame that
+    was written give the same fingerprint.
+    """
+    plain = {t: str(plain_dtype(t)) for t in set(df.dtypes)}
+    h = hashlib.sha256()
+    for col, dtype in df.dtypes.items():
+        h.update(f"{col}:{plain[dtype]};".encode("utf-8"))
+    return h.hexdigest()
 
-    season = args.season
-    season_type = args.season_type
-    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
 
-    stage_path = os.path.join("assets", "data", "staging", f"{season}__{season_type_slug}.parquet")
-    if not os.path.exists(stage_path):
-        raise FileNotFoundError(f"Missing staging file: {stage_path}")
+def staging_stats(df: pd.DataFrame) -> dict:
+    """
+    Row / column counts, schema fingerprint, per-column null rates and, per
+    source prefix, the number of rows missing every source column — all from
+    one null mask.
+    """
+    n    = int(df.shape[0])
+    na   = df.isna().to_numpy()
+    cols = df.columns.astype(str)
+    flag = cols.str.endswith(CARRIED_FORWARD_SUFFIX)
+
+    sources = {}
+    for prefix in SOURCE_PREFIXES:
+        in_source = cols.str.startswith(prefix) & ~flag
+        sources[prefix] = {
+            "columns":      int(in_source.sum()),
+            "missing_rows": int(na[:, in_source].all(axis=1).sum()) if in_source.any() else None,
+        }
+
+    rates = na.sum(axis=0) / n if n else na.sum(axis=0).astype(float)
+    return {
+        "rows": n,
+        "cols": int(df.shape[1]),
+        "schema_fingerprint": schema_fingerprint(df),
+        "sources": sources,
+        "null_rates": dict(zip(df.columns, rates.round(6).tolist())),
+    }
+
+
+def load_previous_report(season: str, season_type: str) -> dict | None:
+    """The last stage_validation.json, if it was written for the same season and type."""
+    path = os.path.join(REPO_ROOT, "reports", "stage_validation.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            prev = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if prev.get("season") != season or prev.get("season_type") != season_type or "null_rates" not in prev:
+        return None
+    return prev
+
+
+def compare_stats(stats: dict, prev: dict | None) -> tuple[dict | None, list[str]]:
+    """
+    Changes since the previous run's statistics, and warnings for a changed
+    schema, a row count off by more than ROW_COUNT_CHANGE or a column whose
+    null rate rose by more than NULL_RATE_JUMP.
+
+    Returns (changes dict or None without a previous run, warnings).
+    """
+    if prev is None:
+        return None, []
+
+    old_rates, new_rates = prev["null_rates"], stats["null_rates"]
+    jumps = {
+        c: [old_rates[c], r] for c, r in new_rates.items()
+        if c in old_rates and r - old_rates[c] > NULL_RATE_JUMP
+    }
+    changes = {
+        "previous_checked_at_utc": prev.get("checked_at_utc"),
+        "previous_rows": prev["rows"],
+        "rows_change": stats["rows"] - prev["rows"],
+        "schema_changed": stats["schema_fingerprint"] != prev.get("schema_fingerprint"),
+        "added_columns": [c for c in new_rates if c not in old_rates],
+        "removed_columns": [c for c in old_rates if c not in new_rates],
+        "null_rate_jumps": jumps,
+    }
+
+    warnings = []
+    if changes["schema_changed"]:
+        warnings.append(
+            f"Schema changed since the previous run: {len(changes['added_columns'])} added, "
+            f"{len(changes['removed_columns'])} removed columns."
+        )
+    if prev["rows"] and abs(changes["rows_change"]) > ROW_COUNT_CHANGE * prev["rows"]:
+        warnings.append(f"Row count changed from {prev['rows']} to {stats['rows']} since the previous run.")
+    if jumps:
+        warnings.append(
+            f"Null rate rose by more than {NULL_RATE_JUMP:.0%} for {len(jumps)} column(s): "
+            f"{', '.join(list(jumps)[:10])}"
+        )
+    return changes, warnings
+
+
+def validate_stage(
+    df: pd.DataFrame,
+    season: str,
+    season_type: str,
+    stage_path: str | None = None,
+    write_report: bool = True,
+) -> dict:
+    """
+    Check a staging DataFrame and write reports/stage_validation.json.
+
+    Args:
+        df:           Staging DataFrame (from the parquet or straight from stage_season()).
+        season:       e.g. "2024-25"
+        season_type:  "Regular Season" or "Playoffs"
+        stage_path:   Path recorded in the report (defaults to the standard staging path).
+        write_report: Write reports/stage_validation.json.
 
-    df = pd.read_parquet(stage_path)
+    Returns:
+        The report dict: the checks, staging_stats() and the comparison with
+        the previous run's report for the same season.  Raises RuntimeError
+        listing the problems if any check fails (after the report has been
+        written); changes since the previous run are only warnings.
+    """
+    if stage_path is None:
+        season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
+        stage_path = os.path.join("assets", "data", "staging", f"{season}__{season_type_slug}.parquet")
 
     problems = []
+    stats = staging_stats(df)
+    n = stats["rows"]
 
     # Required columns
     for col in ["Season", "SeasonType", "Player", "PLAYER_ID"]:
@@ -47,47 +196,17 @@ def main() -> None:
             problems.append("Duplicate PLAYER_ID values found (should be unique per season snapshot).")
 
     # Row count sanity
-    n = int(df.shape[0])
     if n < 200 or n > 900:
         problems.append(f"Row count looks wrong: {n} rows (expected roughly 400–650).")
 
-    # Ensure passing merge occurred (columns exist)
-    passing_cols = [c for c in df.columns if c.startswith("nba_pass__")]
-    if not passing_cols:
-        problems.append("No nba_pass__* columns found. Passing data did not merge into staging.")
-
-    # Missing secondary rows are allowed, but should be visible via carry_forward flags/report
-    # If a player has all nba_pass__ cols missing, that's OK as long as we didn't lose the entire table.
-    if passing_cols:
-        missing_pass_count = int(df[passing_cols].isna().all(axis=1).sum())
-        # If >90% missing, something is broken (likely wrong endpoint params)
-        if missing_pass_count > 0.9 * n:
-            problems.append(
-                f"Passing columns exist but are missing for almost everyone ({missing_pass_count}/{n}). "
-                f"This usually means team-level or error payload merged incorrectly."
-            )
-
-    # Ensure play-type merge occurred
-    pt_cols = [c for c in df.columns if c.startswith("nba_pt_")]
-    if not pt_cols:
-        problems.append("No nba_pt_* columns found. Play-type data did not merge into staging.")
-    elif int(df[pt_cols].isna().all(axis=1).sum()) > 0.9 * n:
-        problems.append(
-            f"Play-type columns exist but are missing for almost everyone "
-            f"({int(df[pt_cols].isna().all(axis=1).sum())}/{n}). "
-            f"This usually means the play-type endpoint returned unexpected data."
-        )
-
-    # Ensure PBPStats merge occurred
-    pbp_cols = [c for c in df.columns if c.startswith("pbp__")]
-    if not pbp_cols:
-        problems.append("No pbp__* columns found. PBPStats data did not merge into staging.")
-    elif int(df[pbp_cols].isna().all(axis=1).sum()) > 0.9 * n:
-        problems.append(
-            f"PBPStats columns exist but are missing for almost everyone "
-            f"({int(df[pbp_cols].isna().all(axis=1).sum())}/{n}). "
-            f"This usually means the name join failed entirely."
-        )
+    # Secondary sources merged, and not missing for almost everyone (>90% means a
+    # broken pull; individual missing players are carried forward and reported)
+    for prefix, no_columns, mostly_missing in SOURCE_CHECKS:
+        source = stats["sources"][prefix]
+        if not source["columns"]:
+            problems.append(no_columns)
+        elif source["missing_rows"] > 0.9 * n:
+            problems.append(mostly_missing.format(missing=source["missing_rows"], n=n))
 
     # Player name sanity
     if "Player" in df.columns:
@@ -95,23 +214,54 @@ def main() -> None:
         if blank_pct > 0.05:
             problems.append(f"Too many blank Player names: {blank_pct:.1%}")
 
-    os.makedirs("reports", exist_ok=True)
+    changes, warnings = compare_stats(stats, load_previous_report(season, season_type))
+
     report = {
         "checked_at_utc": utc_now_iso(),
         "season": season,
         "season_type": season_type,
         "staging_path": stage_path.replace("\\", "/"),
-        "rows": int(df.shape[0]),
-        "cols": int(df.shape[1]),
+        "rows": n,
+        "cols": stats["cols"],
         "ok": len(problems) == 0,
         "problems": problems,
+        "warnings": warnings,
+        "schema_fingerprint": stats["schema_fingerprint"],
+        "sources": stats["sources"],
+        "changes_since_previous": changes,
+        "null_rates": stats["null_rates"],
     }
-    with open(os.path.join("reports", "stage_validation.json"), "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2)
+    if write_report:
+        reports_dir = os.path.join(REPO_ROOT, "reports")
+        os.makedirs(reports_dir, exist_ok=True)
+        with open(os.path.join(reports_dir, "stage_validation.json"), "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
 
+    for w in warnings:
+        print(f"[WARN] {w}")
     if problems:
         raise RuntimeError("Stage validation failed:\n- " + "\n- ".join(problems))
 
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season", required=True)
+    parser.add_argument("--season-type", required=True)
+    args = parser.parse_args()
+
+    season = args.season
+    season_type = args.season_type
+    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
+
+    stage_path = os.path.join("assets", "data", "staging", f"{season}__{season_type_slug}.parquet")
+    if not os.path.exists(os.path.join(REPO_ROOT, stage_path)):
+        raise FileNotFoundError(f"Missing staging file: {stage_path}")
+
+    df = read_staging_parquet(os.path.join(REPO_ROOT, stage_path))
+    validate_stage(df, season, season_type, stage_path)
+
     print("Stage validation OK.")
 
 
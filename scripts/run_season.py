@@ -0,0 +1,109 @@
+"""
+run_season.py
+
+In-process stage → validate → pct_ast → build pipeline for one season.
+
+The per-step CLIs (build_stage_season.py, validate_stage_season.py,
+compute_pct_ast_pts.py, build_season.py) each start a fresh interpreter and
+re-read the staging parquet.  run_season() runs the same steps in one
+interpreter and hands DataFrames from step to step in memory: the staging
+frame goes straight to validation, PCT_AST_PTS_IN_PA and build_season, and
+the raw play-type frame read during staging is reused by PCT_AST_PTS_IN_PA.
+Writing the usual files (staging parquet, reports, pct_ast JSON, season CSV)
+is a side effect controlled by write=.
+
+Usage:
+    python scripts/run_season.py --season 2025-26 --season-type "Regular Season"
+    python scripts/run_season.py --season 2025-26 --season-type "Regular Season" --no-write
+
+    from scripts.run_season import run_season
+    result = run_season("2025-26", "Regular Season", write=False)
+    result["table"]   # league-table DataFrame
+"""
+
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.calculate.build_season import build_season
+from scripts.calculate.compute_pct_ast_pts import pct_ast_season
+from scripts.qa.validate_stage_season import validate_stage
+from scripts.stage.build_stage_season import stage_season
+
+
+def run_season(
+    season: str,
+    season_type: str,
+    write: bool = True,
+    output: str | None = None,
+) -> dict:
+    """
+    Run stage → validate → pct_ast → build for one season in this interpreter.
+
+    Args:
+        season:      e.g. "2024-25"
+        season_type: "Regular Season" or "Playoffs"
+        write:       Persist each step's usual outputs (staging parquet, reports,
+                     pct_ast_pts_in_pa.json, league-table CSV).  With write=False
+                     nothing is written and the results are only returned.
+        output:      Override the league-table CSV path (default:
+                     assets/data/season/league-table-20YY.csv).
+
+    Returns:
+        {
+            "staging":    staging DataFrame,
+            "validation": stage validation report dict,
+            "pct_ast":    pct_ast_pts_in_pa payload dict,
+            "table":      league-table DataFrame,
+        }
+
+    Raises whatever the failing step raises (FileNotFoundError for missing raw
+    inputs, RuntimeError for failed stage validation), like the CLIs do.
+    """
+    print(f"[INFO] Staging {season} ({season_type})...")
+    df_stage, raw = stage_season(season, season_type, write=write)
+
+    print("[INFO] Validating staging...")
+    validation = validate_stage(df_stage, season, season_type, write_report=write)
+    print("Stage validation OK.")
+
+    pct_ast = pct_ast_season(season, season_type, df_pt=raw["pt"], df_stage=df_stage, write=write)
+    pct_ast_pts_in_pa = pct_ast["values"]["PCT_AST_PTS_IN_PA"]
+
+    print(f"[INFO] Building season table {season} ({season_type})...")
+    table = build_season(
+        season, season_type,
+        df=df_stage,
+        pct_ast_pts_in_pa=pct_ast_pts_in_pa,
+        output=output,
+        write=write,
+    )
+
+    return {
+        "staging":    df_stage,
+        "validation": validation,
+        "pct_ast":    pct_ast,
+        "table":      table,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season",      required=True, help='e.g. "2024-25"')
+    parser.add_argument("--season-type", required=True, help='e.g. "Regular Season"')
+    parser.add_argument("--output",      default=None,
+                        help="Override output CSV path (default: assets/data/season/league-table-20YY.csv)")
+    parser.add_argument("--no-write",    action="store_true",
+                        help="Run every step but write nothing (dry run)")
+    args = parser.parse_args()
+
+    run_season(args.season, args.season_type, write=not args.no_write, output=args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,25 @@
 import argparse
 import json
 import os
-import re
-import unicodedata
-from datetime import datetime, timezone
+import sys
+from datetime import date, datetime, timezone
 
 import pandas as pd
 
-ALIASES_PATH = os.path.join("mappings", "player_aliases.csv")
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.player_names import alias_lookup, player_keys
+from scripts.stage.raw_snapshots import (
+    CARRY_FORWARD_DAYS,
+    HISTORY_DIR,
+    carry_forward_rows,
+    load_manifest,
+    record_snapshot,
+)
+from scripts.stage.staging_dataset import write_season_partition
+from scripts.stage.staging_dtypes import read_staging_parquet, write_staging_parquet
 
 PLAY_TYPE_PREFIX_MAP = {
     "Isolation":    "iso",
@@ -28,6 +40,13 @@ PLAY_TYPE_PREFIX_MAP = {
 # Only columns that actually exist in the DataFrame will be selected.
 PT_STAT_COLS = ["GP", "POSS", "PPP", "PTS", "FGA", "FGM", "TOV_POSS_PCT", "SCORE_POSS_PCT", "PERCENTILE"]
 
+# Secondary sources filled by carry-forward: {raw_snapshots source: staging column prefix}
+CARRY_FORWARD_SOURCES = {
+    "pass": "nba_pass__",
+    "pt":   "nba_pt_",
+    "pbp":  "pbp__",
+}
+
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -37,12 +56,6 @@ def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def atomic_write_parquet(df: pd.DataFrame, out_path: str) -> None:
-    tmp_path = out_path + ".tmp"
-    df.to_parquet(tmp_path, index=False)
-    os.replace(tmp_path, out_path)
-
-
 def prefix_except(df: pd.DataFrame, prefix: str, keep: set[str]) -> pd.DataFrame:
     rename = {}
     for c in df.columns:
@@ -91,6 +104,11 @@ def pivot_playtypes_to_wide(df_pt: pd.DataFrame, key: str = "PLAYER_ID") -> pd.D
     to wide format (one row per player, columns like nba_pt_iso__POSS).
     Multi-team players are aggregated to season totals before pivoting.
     Only columns in PT_STAT_COLS that exist in df_pt are included.
+
+    The aggregated long frame is reshaped once (unstack on PLAY_TYPE).  Rows are
+    sorted by key; columns are key, then per PLAY_TYPE_PREFIX_MAP entry the stats
+    in PT_STAT_COLS order.  Play types with no rows still get all-NaN columns.
+    An integer stat column stays integer when every player has a value.
     """
     available_stat_cols = [c for c in PT_STAT_COLS if c in df_pt.columns]
     missing_stat_cols = [c for c in PT_STAT_COLS if c not in df_pt.columns]
@@ -99,38 +117,29 @@ def pivot_playtypes_to_wide(df_pt: pd.DataFrame, key: str = "PLAYER_ID") -> pd.D
 
     df_pt = _aggregate_playtypes(df_pt, key, available_stat_cols)
 
-    frames = []
-    for api_name, slug in PLAY_TYPE_PREFIX_MAP.items():
-        sub = df_pt[df_pt["PLAY_TYPE"] == api_name][[key] + available_stat_cols].copy()
-        sub = sub.rename(columns={c: f"nba_pt_{slug}__{c}" for c in available_stat_cols})
-        frames.append(sub)
-
-    df_wide = frames[0]
-    for f in frames[1:]:
-        df_wide = df_wide.merge(f, on=key, how="outer")
+    long = df_pt[df_pt["PLAY_TYPE"].isin(PLAY_TYPE_PREFIX_MAP)]
+    wide = long.set_index([key, "PLAY_TYPE"])[available_stat_cols].unstack("PLAY_TYPE").sort_index()
 
-    return df_wide
+    columns = pd.MultiIndex.from_tuples(
+        [(stat, api_name) for api_name in PLAY_TYPE_PREFIX_MAP for stat in available_stat_cols]
+    )
+    wide = wide.reindex(columns=columns)
 
+    # unstack upcasts a whole integer block when any cell is missing; restore
+    # the source dtype for columns that are complete
+    for stat, api_name in columns:
+        dtype = long[stat].dtype
+        if pd.api.types.is_integer_dtype(dtype) and wide[(stat, api_name)].notna().all():
+            wide[(stat, api_name)] = wide[(stat, api_name)].astype(dtype)
 
-def _make_player_key(s: str) -> str:
-    """Normalize a player name to a lookup key: accent-strip, lowercase, alphanumeric only.
-    Mirrors make_key() in scripts/build_player_aliases.py."""
-    if not s:
-        return ""
-    s = unicodedata.normalize("NFKD", str(s))
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    for bad, good in [("Ł", "L"), ("ł", "l"), ("Đ", "D"), ("đ", "d"),
-                      ("Ø", "O"), ("ø", "o"), ("ß", "ss")]:
-        s = s.replace(bad, good)
-    return re.sub(r"[^a-z0-9]+", "", s.lower())
+    wide.columns = [f"nba_pt_{PLAY_TYPE_PREFIX_MAP[api_name]}__{stat}" for stat, api_name in columns]
+    return wide.rename_axis(key).reset_index()
 
 
-def load_pbp_alias_lookup(aliases_path: str) -> dict[str, str]:
-    """Returns {source_key: player_key} for source='pbp' rows in player_aliases.csv.
+def load_pbp_alias_lookup() -> dict[str, str]:
+    """Returns {source_key: player_key} for source='pbp' rows of the alias index.
     source_key is the pre-normalized PBP name; player_key is the canonical player key."""
-    aliases = pd.read_csv(aliases_path)
-    pbp = aliases[aliases["source"] == "pbp"]
-    return dict(zip(pbp["source_key"].astype(str), pbp["player_key"].astype(str)))
+    return alias_lookup("pbp")
 
 
 def resolve_pbp_names(
@@ -158,16 +167,12 @@ def resolve_pbp_names(
     # Name-based fallback for any rows that still lack a PLAYER_ID
     if needs_name_resolve.any():
         df_fallback = df_pbp[needs_name_resolve].copy()
-        df_fallback["_pbp_key"] = df_fallback["Name"].apply(
-            lambda n: _make_player_key(str(n)) if pd.notna(n) else ""
-        )
+        df_fallback["_pbp_key"] = player_keys(df_fallback["Name"])
         df_fallback["_player_key"] = df_fallback["_pbp_key"].map(pbp_lookup)
         df_fallback["_player_key"] = df_fallback["_player_key"].fillna(df_fallback["_pbp_key"])
 
         staging_df = staging_df.copy()
-        staging_df["_player_key"] = staging_df["Player"].apply(
-            lambda n: _make_player_key(str(n)) if pd.notna(n) else ""
-        )
+        staging_df["_player_key"] = player_keys(staging_df["Player"])
         key_to_pid = (
             staging_df.dropna(subset=["PLAYER_ID"])
             .set_index("_player_key")["PLAYER_ID"]
@@ -190,12 +195,17 @@ def resolve_pbp_names(
     return df_pbp, [str(n) for n in unmatched]
 
 
+def staging_path(season: str, season_type_slug: str) -> str:
+    """Repo-relative staging parquet path (as written into the reports)."""
+    return os.path.join("assets", "data", "staging", f"{season}__{season_type_slug}.parquet")
+
+
 def load_prev_staging(season: str, season_type_slug: str) -> pd.DataFrame | None:
-    prev_path = os.path.join("assets", "data", "staging", f"{season}__{season_type_slug}.parquet")
+    prev_path = os.path.join(REPO_ROOT, staging_path(season, season_type_slug))
     if not os.path.exists(prev_path):
         return None
     try:
-        return pd.read_parquet(prev_path)
+        return read_staging_parquet(prev_path, plain=True)
     except Exception:
         return None
 
@@ -234,10 +244,7 @@ def carry_forward_columns_from_prev(
     if flag_col not in current.columns:
         current[flag_col] = False
 
-    # Missing in source == all source cols are NA for that row
-    # (We only consider rows that have a PLAYER_ID)
-    mask_has_id = current[key].notna()
-    mask_missing_source = mask_has_id & current[source_cols].isna().all(axis=1)
+    mask_missing_source = missing_source_mask(current, key, source_cols)
 
     missing_ids = current.loc[mask_missing_source, key].astype(int).tolist()
     report["missing_player_ids"] = missing_ids
@@ -251,32 +258,27 @@ def carry_forward_columns_from_prev(
         return report
 
     # Deduplicate prev on PLAYER_ID before indexing (guards against corrupt prior snapshots)
-    prev_indexed = prev.drop_duplicates(subset=[key]).set_index(key, drop=False)
-
-    carried = []
-    not_found = []
+    prev_indexed = prev.drop_duplicates(subset=[key]).set_index(key)
+    fill_cols = [c for c in source_cols if c in prev_indexed.columns]
 
-    for pid in missing_ids:
-        if pid not in prev_indexed.index:
-            not_found.append(pid)
-            continue
+    # One row of previous values per missing row, aligned on PLAYER_ID
+    # (all-NA where the player is not in prev)
+    missing_rows = current.index[mask_missing_source]
+    prev_vals = prev_indexed[fill_cols].reindex(missing_ids)
+    prev_vals.index = missing_rows
 
-        prev_row = prev_indexed.loc[pid]
+    # A player is carried forward when prev has at least one non-null source value
+    has_prev = prev_vals.notna()
+    filled   = has_prev.any(axis=1).to_numpy()
 
-        # Fill each source column if it exists in prev
-        any_filled = False
-        for c in source_cols:
-            if c in prev_indexed.columns:
-                val = prev_row[c]
-                if pd.notna(val):
-                    current.loc[current[key] == pid, c] = val
-                    any_filled = True
+    for c in fill_cols:
+        rows = has_prev[c].to_numpy()
+        if rows.any():
+            current.loc[missing_rows[rows], c] = prev_vals.loc[rows, c].to_numpy()
+    current.loc[missing_rows[filled], flag_col] = True
 
-        if any_filled:
-            current.loc[current[key] == pid, flag_col] = True
-            carried.append(pid)
-        else:
-            not_found.append(pid)
+    carried   = [pid for pid, ok in zip(missing_ids, filled) if ok]
+    not_found = [pid for pid, ok in zip(missing_ids, filled) if not ok]
 
     report["carried_forward_player_ids"] = carried
     report["not_found_in_prev_player_ids"] = not_found
@@ -285,17 +287,154 @@ def carry_forward_columns_from_prev(
     return report
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--season", required=True)
-    parser.add_argument("--season-type", required=True)
-    args = parser.parse_args()
+def missing_source_mask(current: pd.DataFrame, key: str, source_cols: list[str]) -> pd.Series:
+    """Rows with a PLAYER_ID whose source columns are all NA (missing from that source)."""
+    return current[key].notna() & current[source_cols].isna().all(axis=1)
 
-    season = args.season
-    season_type = args.season_type
-    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
 
-    raw_dir = os.path.join("assets", "data", "raw", season, season_type_slug)
+def carry_forward_from_history(
+    *,
+    current: pd.DataFrame,
+    prev: pd.DataFrame | None,
+    season: str,
+    season_type_slug: str,
+    source: str,
+    key: str,
+    lookback_days: int = CARRY_FORWARD_DAYS,
+    day: date | None = None,
+    history_root: str = HISTORY_DIR,
+) -> dict:
+    """
+    carry_forward_columns_from_prev() for one CARRY_FORWARD_SOURCES source,
+    filling each missing player from the most recent raw snapshot that has them
+    within lookback_days (raw_snapshots.carry_forward_rows).  Players the
+    snapshot history has never seen (no snapshots yet, or none of them has the
+    player) are filled from prev, the previous staging snapshot.  A player
+    whose latest snapshot is past the window has expired: prev stands in only
+    if its row for them was observed, not itself carried forward, so old
+    values are never carried indefinitely.
+
+    The report gains "lookback_days" and "carried_forward_from" ({PLAYER_ID:
+    snapshot date or "previous_staging"}).
+    """
+    source_prefix = CARRY_FORWARD_SOURCES[source]
+    source_cols = [c for c in current.columns if c.startswith(source_prefix)]
+    missing_ids = []
+    if source_cols:
+        missing_ids = current.loc[missing_source_mask(current, key, source_cols), key].astype(int).tolist()
+
+    fill_from, origin = None, {}
+    if missing_ids:
+        history = carry_forward_rows(season, season_type_slug, source, missing_ids, day, lookback_days, key,
+                                     root=history_root)
+        if history is not None and history[1]:
+            fill_from, origin = history
+
+    unresolved = [pid for pid in missing_ids if pid not in origin]
+    if unresolved and prev is not None and key in prev.columns:
+        seen = load_manifest(season, season_type_slug, history_root)["sources"].get(source, {}).get("latest_seen", {})
+        flag_col = f"{source_prefix}carried_forward"
+        prev_rows = prev.loc[prev[key].isin(unresolved)]
+        carried_before = (prev_rows[flag_col].fillna(False).astype(bool) if flag_col in prev_rows.columns
+                          else pd.Series(False, index=prev_rows.index))
+        usable = ~prev_rows[key].astype(int).astype(str).isin(list(seen)) | ~carried_before
+        prev_rows = prev_rows.loc[usable, [key] + [c for c in source_cols if c in prev.columns]]
+        origin = {**origin, **dict.fromkeys(prev_rows[key].astype(int).tolist(), "previous_staging")}
+        fill_from = prev_rows if fill_from is None else pd.concat([fill_from, prev_rows], ignore_index=True)
+
+    report = carry_forward_columns_from_prev(
+        current=current,
+        prev=fill_from,
+        key=key,
+        source_prefix=source_prefix,
+        base_player_name_col="Player",
+    )
+    report["lookback_days"] = lookback_days
+    report["carried_forward_from"] = {str(pid): origin[pid] for pid in report["carried_forward_player_ids"]}
+    return report
+
+
+def stage_delta(current: pd.DataFrame, prev: pd.DataFrame | None, key: str = "PLAYER_ID") -> dict:
+    """
+    Row-level change set between the previous staging snapshot and the new frame.
+
+    Rows are matched on key and compared by per-row hash over the shared
+    columns; only rows whose hash differs are compared column by column.
+    Columns whose dtype changed are listed as retyped (and then every shared
+    row is compared by value).
+
+    Returns a dict with added / removed / changed PLAYER_IDs, per-column
+    changed-row counts, added / removed / retyped columns and "unchanged"
+    (True when writing current would reproduce prev exactly).
+    """
+    delta = {
+        "previous_rows": None if prev is None else int(prev.shape[0]),
+        "rows": int(current.shape[0]),
+        "unchanged": False,
+        "added_player_ids": [],
+        "removed_player_ids": [],
+        "changed_player_ids": [],
+        "changed_columns": {},
+        "added_columns": [],
+        "removed_columns": [],
+        "retyped_columns": [],
+        "order_changed": False,
+    }
+    if prev is None or key not in prev.columns:
+        delta["added_player_ids"] = sorted(int(p) for p in current[key].dropna())
+        delta["added_columns"] = list(current.columns)
+        return delta
+
+    shared = [c for c in current.columns if c in prev.columns and c != key]
+    delta["added_columns"]   = [c for c in current.columns if c not in prev.columns]
+    delta["removed_columns"] = [c for c in prev.columns if c not in current.columns]
+    delta["retyped_columns"] = [c for c in shared if current[c].dtype != prev[c].dtype]
+
+    cur_ids, prev_ids = pd.Index(current[key]), pd.Index(prev[key])
+    delta["added_player_ids"]   = sorted(int(p) for p in cur_ids.difference(prev_ids))
+    delta["removed_player_ids"] = sorted(int(p) for p in prev_ids.difference(cur_ids))
+
+    common = cur_ids.intersection(prev_ids)
+    cur    = current.drop_duplicates(subset=[key]).set_index(key).loc[common, shared]
+    old    = prev.drop_duplicates(subset=[key]).set_index(key).loc[common, shared]
+
+    same_dtype = [c for c in shared if c not in delta["retyped_columns"]]
+    row_changed = (
+        pd.util.hash_pandas_object(cur[same_dtype], index=False).to_numpy()
+        != pd.util.hash_pandas_object(old[same_dtype], index=False).to_numpy()
+    )
+    if delta["retyped_columns"]:
+        row_changed[:] = True
+
+    cur, old = cur[row_changed], old[row_changed]
+    differs = cur.ne(old) & ~(cur.isna() & old.isna())
+    counts  = differs.sum()
+    delta["changed_columns"]    = {c: int(n) for c, n in counts.items() if n}
+    delta["changed_player_ids"] = sorted(int(p) for p in cur.index[differs.any(axis=1).to_numpy()])
+
+    # Same columns / players in a different order still rewrite the file
+    same_cols = set(current.columns) == set(prev.columns)
+    same_ids  = len(delta["added_player_ids"]) == len(delta["removed_player_ids"]) == 0
+    delta["order_changed"] = bool(
+        (same_cols and list(current.columns) != list(prev.columns))
+        or (same_ids and not cur_ids.equals(prev_ids))
+    )
+    delta["unchanged"] = not (
+        delta["added_player_ids"] or delta["removed_player_ids"] or delta["changed_player_ids"]
+        or delta["added_columns"] or delta["removed_columns"] or delta["retyped_columns"]
+        or delta["order_changed"]
+    )
+    return delta
+
+
+def load_raw_inputs(season: str, season_type_slug: str) -> dict:
+    """
+    Read the five raw ingest outputs for one season.
+
+    Returns {"trad", "pass", "pt", "pbp": DataFrame, "ctg_values": dict}.
+    Raises FileNotFoundError naming the ingest to run when a file is missing.
+    """
+    raw_dir = os.path.join(REPO_ROOT, "assets", "data", "raw", season, season_type_slug)
     path_trad = os.path.join(raw_dir, "nba_traditional_totals.parquet")
     path_pass = os.path.join(raw_dir, "nba_passing_totals.parquet")
     path_pt   = os.path.join(raw_dir, "nba_playtypes.parquet")
@@ -313,13 +452,40 @@ def main() -> None:
     if not os.path.exists(path_ctg):
         raise FileNotFoundError(f"Missing REQUIRED raw file: {path_ctg}. Run ctg_league_avgs ingest first.")
 
-    df_trad = pd.read_parquet(path_trad)
-    df_pass = pd.read_parquet(path_pass)
-    df_pt   = pd.read_parquet(path_pt)
-    df_pbp  = pd.read_parquet(path_pbp)
     with open(path_ctg, encoding="utf-8") as f:
         ctg_data = json.load(f)
-    ctg_values = ctg_data["values"]
+
+    return {
+        "trad":       pd.read_parquet(path_trad),
+        "pass":       pd.read_parquet(path_pass),
+        "pt":         pd.read_parquet(path_pt),
+        "pbp":        pd.read_parquet(path_pbp),
+        "ctg_values": ctg_data["values"],
+    }
+
+
+def build_stage_frame(
+    raw: dict,
+    season: str,
+    season_type: str,
+    prev_stage: pd.DataFrame | None,
+    lookback_days: int = CARRY_FORWARD_DAYS,
+    day: date | None = None,
+) -> tuple[pd.DataFrame, dict[str, dict], list[str], dict[str, pd.DataFrame]]:
+    """
+    Join the raw inputs into the wide one-row-per-player staging DataFrame and
+    carry forward missing secondary-table rows from the raw snapshot history
+    (see carry_forward_from_history()).
+
+    Returns (staging_df, {"pass"|"pt"|"pbp": carry-forward report},
+    unmatched_pbp_names, {"pass"|"pt"|"pbp": today's source frame as merged},
+    the last for record_snapshot()).
+    """
+    df_trad = raw["trad"]
+    df_pass = raw["pass"]
+    df_pt   = raw["pt"]
+    df_pbp  = raw["pbp"]
+    ctg_values = raw["ctg_values"]
 
     key = "PLAYER_ID"
     if key not in df_trad.columns:
@@ -361,7 +527,7 @@ def main() -> None:
 
     # ---- PBPStats name resolution + merge ----
     # Must happen after Player column is set (used for player_key → PLAYER_ID lookup)
-    pbp_lookup = load_pbp_alias_lookup(ALIASES_PATH)
+    pbp_lookup = load_pbp_alias_lookup()
     df_pbp, unmatched_pbp = resolve_pbp_names(df_pbp, df, pbp_lookup)
     # Drop PBP rows that couldn't be resolved to a PLAYER_ID — they can't be joined
     df_pbp = df_pbp[df_pbp[key].notna()].copy()
@@ -374,44 +540,78 @@ def main() -> None:
     df["ctg__hc_oreb_pct"]   = ctg_values["hc_oreb_pct"]
     df["ctg__pb_pts_per_play"] = ctg_values["pb_pts_per_play"]
 
-    # ---- Carry-forward logic for missing players in Passing ----
-    prev_stage = load_prev_staging(season, season_type_slug)
-    carry_reports = []
+    # ---- Carry-forward for players missing from Passing / play types / PBPStats ----
+    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
+    carry = {
+        source: carry_forward_from_history(
+            current=df,
+            prev=prev_stage,
+            season=season,
+            season_type_slug=season_type_slug,
+            source=source,
+            key=key,
+            lookback_days=lookback_days,
+            day=day,
+        )
+        for source in CARRY_FORWARD_SOURCES
+    }
 
-    pass_report = carry_forward_columns_from_prev(
-        current=df,
-        prev=prev_stage,
-        key=key,
-        source_prefix="nba_pass__",
-        base_player_name_col="Player",
-    )
-    carry_reports.append(pass_report)
+    sources = {"pass": df_pass_p, "pt": df_pt_wide, "pbp": df_pbp_p}
+    return df, carry, unmatched_pbp, sources
 
-    pt_report = carry_forward_columns_from_prev(
-        current=df,
-        prev=prev_stage,
-        key=key,
-        source_prefix="nba_pt_",
-        base_player_name_col="Player",
-    )
-    carry_reports.append(pt_report)
-
-    pbp_report = carry_forward_columns_from_prev(
-        current=df,
-        prev=prev_stage,
-        key=key,
-        source_prefix="pbp__",
-        base_player_name_col="Player",
-    )
-    carry_reports.append(pbp_report)
 
-    # ---- Write staging ----
-    ensure_dir(os.path.join("assets", "data", "staging"))
-    out_path = os.path.join("assets", "data", "staging", f"{season}__{season_type_slug}.parquet")
-    atomic_write_parquet(df, out_path)
+def write_stage_outputs(
+    df: pd.DataFrame,
+    season: str,
+    season_type: str,
+    carry: dict[str, dict],
+    unmatched_pbp: list[str],
+    prev: pd.DataFrame | None = None,
+    sources: dict[str, pd.DataFrame] | None = None,
+    day: date | None = None,
+) -> str:
+    """
+    Write the staging parquet, stage_delta.json, carry_forward_report.json and
+    refresh_status.json, and record sources (build_stage_frame()'s per-source
+    frames) in the raw snapshot history.  The parquet (and its staging dataset
+    partition) is only rewritten when stage_delta() against prev, the previous
+    snapshot, finds a change.
+    """
+    key = "PLAYER_ID"
+    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
+    pass_report = carry["pass"]
+    pt_report   = carry["pt"]
+    pbp_report  = carry["pbp"]
+    carry_reports = [pass_report, pt_report, pbp_report]
+
+    # ---- Write staging (skipped when nothing changed) ----
+    ensure_dir(os.path.join(REPO_ROOT, "assets", "data", "staging"))
+    out_path = staging_path(season, season_type_slug)
+    delta = stage_delta(df, prev, key)
+    if not delta["unchanged"]:
+        compact = write_staging_parquet(df, os.path.join(REPO_ROOT, out_path))
+        write_season_partition(compact, season, season_type_slug)
+
+    # ---- Raw snapshot history (deduplicated by content hash) ----
+    snapshots = [
+        record_snapshot(frame, season, season_type_slug, source, day, key)
+        for source, frame in (sources or {}).items()
+    ]
 
     # ---- Reports ----
-    ensure_dir("reports")
+    reports_dir = os.path.join(REPO_ROOT, "reports")
+    ensure_dir(reports_dir)
+
+    stage_delta_report = {
+        "generated_at_utc": utc_now_iso(),
+        "season": season,
+        "season_type": season_type,
+        "staging_path": out_path.replace("\\", "/"),
+        "staging_written": not delta["unchanged"],
+        **delta,
+    }
+    with open(os.path.join(reports_dir, "stage_delta.json"), "w", encoding="utf-8") as f:
+        json.dump(stage_delta_report, f, indent=2)
 
     # Include readable player names for impacted IDs
     impacted = []
@@ -430,9 +630,15 @@ def main() -> None:
         "sources": carry_reports,
         "impacted_players": impacted,
         "pbp_unmatched_names": unmatched_pbp,
-        "notes": "If a player is missing from a secondary table today, we carry forward their last available values from the previous staging snapshot.",
+        "snapshots": snapshots,
+        "notes": (
+            "If a player is missing from a secondary table today, we carry forward their values from the "
+            "most recent raw snapshot that has them (within lookback_days), or from the previous staging "
+            "snapshot for players the snapshot history has not seen.  Players whose latest snapshot is "
+            "older than lookback_days are not carried from values that were themselves carried forward."
+        ),
     }
-    with open(os.path.join("reports", "carry_forward_report.json"), "w", encoding="utf-8") as f:
+    with open(os.path.join(reports_dir, "carry_forward_report.json"), "w", encoding="utf-8") as f:
         json.dump(carry_forward_report, f, indent=2)
 
     # refresh_status.json (include carry-forward summary)
@@ -444,6 +650,7 @@ def main() -> None:
         "rows": int(df.shape[0]),
         "cols": int(df.shape[1]),
         "ok": True,
+        "staging_changed": not delta["unchanged"],
         "carry_forward": {
             "nba_pass__missing": pass_report["missing_count"],
             "nba_pass__carried_forward": pass_report["carried_forward_count"],
@@ -453,10 +660,55 @@ def main() -> None:
             "pbp__carried_forward": pbp_report["carried_forward_count"],
         },
     }
-    with open(os.path.join("reports", "refresh_status.json"), "w", encoding="utf-8") as f:
+    with open(os.path.join(reports_dir, "refresh_status.json"), "w", encoding="utf-8") as f:
         json.dump(status, f, indent=2)
 
-    print(f"Wrote staging: {out_path} ({df.shape[0]} rows, {df.shape[1]} cols)")
+    if delta["unchanged"]:
+        print(f"[INFO] Staging unchanged, not rewritten: {out_path}")
+    else:
+        print(
+            f"Wrote staging: {out_path} ({df.shape[0]} rows, {df.shape[1]} cols; "
+            f"{len(delta['changed_player_ids'])} changed, {len(delta['added_player_ids'])} added, "
+            f"{len(delta['removed_player_ids'])} removed players)"
+        )
+    return out_path
+
+
+def stage_season(
+    season: str,
+    season_type: str,
+    raw: dict | None = None,
+    write: bool = True,
+    lookback_days: int = CARRY_FORWARD_DAYS,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Build one season's staging DataFrame.
+
+    Args:
+        season:      e.g. "2024-25"
+        season_type: "Regular Season" or "Playoffs"
+        raw:         Pre-loaded load_raw_inputs() dict; read from disk when None.
+        write:       Write the staging parquet and reports and record the
+                     raw snapshots (what the CLI does).
+        lookback_days: Carry-forward window, in days, over the snapshot history.
+
+    Returns:
+        (staging_df, raw) — raw is returned so later stages (compute_pct_ast_pts)
+        can reuse the play-type frame without re-reading it.
+    """
+    season_type_slug = "regular" if season_type == "Regular Season" else "playoffs"
+    if raw is None:
+        raw = load_raw_inputs(season, season_type_slug)
+
+    prev_stage = load_prev_staging(season, season_type_slug)
+    df, carry, unmatched_pbp, sources = build_stage_frame(raw, season, season_type, prev_stage, lookback_days)
+
+    if write:
+        write_stage_outputs(df, season, season_type, carry, unmatched_pbp, prev_stage, sources)
+
+    pass_report = carry["pass"]
+    pt_report   = carry["pt"]
+    pbp_report  = carry["pbp"]
     if pass_report["missing_count"] > 0:
         print(
             f"[INFO] Passing carry-forward: missing={pass_report['missing_count']} "
@@ -475,6 +727,19 @@ def main() -> None:
     if unmatched_pbp:
         print(f"[INFO] PBPStats unmatched names ({len(unmatched_pbp)}): see carry_forward_report.json")
 
+    return df, raw
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season", required=True)
+    parser.add_argument("--season-type", required=True)
+    parser.add_argument("--carry-forward-days", type=int, default=CARRY_FORWARD_DAYS,
+                        help=f"Carry-forward lookback over the raw snapshot history (default {CARRY_FORWARD_DAYS})")
+    args = parser.parse_args()
+
+    stage_season(args.season, args.season_type, lookback_days=args.carry_forward_days)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,247 @@
+"""
+raw_snapshots.py
+
+Append-only history of the secondary sources that carry-forward fills from.
+
+Each staging run records what every secondary source (passing, play types,
+PBPStats) contributed that day, as the PLAYER_ID-keyed, prefixed frame that
+build_stage_season.py merges into staging:
+
+    assets/data/raw_history/{season}/{slug}/
+        manifest.json
+        pass/2026-01-14.parquet
+        pt/2026-01-14.parquet
+        pbp/2026-01-14.parquet
+        ...
+
+One zstd parquet per (source, date).  A day whose content hash matches the
+source's latest snapshot writes nothing; the snapshot's last_seen date is
+moved forward instead, so unchanged days cost one manifest update.  Re-running
+on the same date replaces that date's file.
+
+The manifest holds, per source, the snapshot list and a latest-seen index
+{PLAYER_ID: snapshot date} — the newest snapshot in which the player has at
+least one value.  carry_forward_rows() uses it to resolve missing players
+with one filtered read per snapshot involved, honoring a lookback window.
+
+The history is a local artifact (not committed).  For players it has not
+seen (or no snapshots yet), carry-forward falls back to the previous staging
+file.
+
+Usage:
+    python scripts/stage/raw_snapshots.py --season 2025-26 --season-type "Regular Season"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+HISTORY_DIR   = os.path.join(REPO_ROOT, "assets", "data", "raw_history")
+MANIFEST_FILE = "manifest.json"
+
+# Bump when the snapshot layout or manifest format changes
+HISTORY_VERSION = 1
+
+# Default lookback window for carry-forward, in days
+CARRY_FORWARD_DAYS = 14
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def history_dir(season: str, season_type_slug: str, root: str = HISTORY_DIR) -> str:
+    return os.path.join(root, season, season_type_slug)
+
+
+def snapshot_path(season: str, season_type_slug: str, source: str, day: str, root: str = HISTORY_DIR) -> str:
+    return os.path.join(history_dir(season, season_type_slug, root), source, f"{day}.parquet")
+
+
+# ── Manifest ──────────────────────────────────────────────────────────────────
+
+def load_manifest(season: str, season_type_slug: str, root: str = HISTORY_DIR) -> dict:
+    """The history manifest; an empty one when missing or of another version."""
+    path = os.path.join(history_dir(season, season_type_slug, root), MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == HISTORY_VERSION:
+            return manifest
+    return {"version": HISTORY_VERSION, "sources": {}}
+
+
+def _write_manifest(manifest: dict, season: str, season_type_slug: str, root: str) -> None:
+    path = os.path.join(history_dir(season, season_type_slug, root), MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """sha256 over column names, dtypes and row values."""
+    h = hashlib.sha256()
+    for c in df.columns:
+        h.update(f"{c}:{df[c].dtype};".encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _seen_ids(df: pd.DataFrame, key: str) -> list[int]:
+    """Players with at least one non-null source value."""
+    values = df.drop(columns=[key])
+    return df.loc[values.notna().any(axis=1), key].astype(int).tolist()
+
+
+# ── Record ────────────────────────────────────────────────────────────────────
+
+def record_snapshot(
+    df: pd.DataFrame,
+    season: str,
+    season_type_slug: str,
+    source: str,
+    day: date | None = None,
+    key: str = "PLAYER_ID",
+    root: str = HISTORY_DIR,
+) -> dict:
+    """
+    Add one source's frame for day (default: today, UTC) to the history.
+
+    Returns {"source", "date", "sha256", "rows", "written"}; written is False
+    when the content matches the source's latest snapshot.
+    Raises ValueError for a day before the source's latest snapshot (the
+    history is append-only).
+    """
+    day = (day or utc_today()).isoformat()
+    df = df.dropna(subset=[key]).astype({key: "int64"}).sort_values(key, kind="mergesort").reset_index(drop=True)
+    digest = frame_digest(df)
+
+    manifest = load_manifest(season, season_type_slug, root)
+    entry = manifest["sources"].setdefault(source, {"snapshots": [], "latest_seen": {}})
+    snaps = entry["snapshots"]
+    latest = snaps[-1] if snaps else None
+    result = {"source": source, "date": day, "sha256": digest, "rows": int(len(df)), "written": False}
+
+    if latest is not None and day < latest["date"]:
+        raise ValueError(f"{source} history for {season} already has {latest['date']}; cannot record {day}.")
+
+    if latest is not None and latest["sha256"] == digest:
+        latest["last_seen"] = max(latest["last_seen"], day)
+    else:
+        path = snapshot_path(season, season_type_slug, source, day, root)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        df.to_parquet(tmp_path, index=False, compression="zstd")
+        os.replace(tmp_path, path)
+        result["written"] = True
+
+        snap = {"date": day, "sha256": digest, "rows": int(len(df)), "last_seen": day}
+        if latest is not None and latest["date"] == day:
+            # Same-day rerun: the replaced file may have held players this one lacks
+            snaps[-1] = snap
+            entry["latest_seen"] = _rebuild_latest_seen(season, season_type_slug, source, snaps, key, root)
+        else:
+            snaps.append(snap)
+            entry["latest_seen"].update(dict.fromkeys(map(str, _seen_ids(df, key)), day))
+
+    os.makedirs(history_dir(season, season_type_slug, root), exist_ok=True)
+    _write_manifest(manifest, season, season_type_slug, root)
+    return result
+
+
+def _rebuild_latest_seen(
+    season: str, season_type_slug: str, source: str, snaps: list[dict], key: str, root: str,
+) -> dict[str, str]:
+    latest_seen = {}
+    for snap in snaps:
+        path = snapshot_path(season, season_type_slug, source, snap["date"], root)
+        if os.path.exists(path):
+            latest_seen.update(dict.fromkeys(map(str, _seen_ids(pd.read_parquet(path), key)), snap["date"]))
+    return latest_seen
+
+
+# ── Lookup ────────────────────────────────────────────────────────────────────
+
+def carry_forward_rows(
+    season: str,
+    season_type_slug: str,
+    source: str,
+    player_ids: list[int],
+    day: date | None = None,
+    lookback_days: int = CARRY_FORWARD_DAYS,
+    key: str = "PLAYER_ID",
+    root: str = HISTORY_DIR,
+) -> tuple[pd.DataFrame, dict[int, str]] | None:
+    """
+    Each player's row from the most recent snapshot that has them, if that
+    snapshot was still current within lookback_days of day.
+
+    Returns:
+        (rows with a key column, {PLAYER_ID: snapshot date}) for the players
+        found, or None when the history has no snapshots for source.
+    """
+    entry = load_manifest(season, season_type_slug, root)["sources"].get(source)
+    if not entry or not entry["snapshots"]:
+        return None
+
+    cutoff = ((day or utc_today()) - timedelta(days=lookback_days)).isoformat()
+    last_seen = {s["date"]: s["last_seen"] for s in entry["snapshots"]}
+
+    by_date: dict[str, list[int]] = {}
+    for pid in player_ids:
+        snap_date = entry["latest_seen"].get(str(pid))
+        if snap_date is not None and last_seen.get(snap_date, "") >= cutoff:
+            by_date.setdefault(snap_date, []).append(int(pid))
+
+    frames, origin = [], {}
+    for snap_date, pids in sorted(by_date.items()):
+        path = snapshot_path(season, season_type_slug, source, snap_date, root)
+        if not os.path.exists(path):
+            continue
+        frames.append(pd.read_parquet(path, filters=[(key, "in", pids)]))
+        origin.update(dict.fromkeys(pids, snap_date))
+
+    if not frames:
+        return pd.DataFrame(columns=[key]), {}
+    return pd.concat(frames, ignore_index=True), origin
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season", required=True)
+    parser.add_argument("--season-type", required=True)
+    args = parser.parse_args()
+
+    slug = "regular" if args.season_type == "Regular Season" else "playoffs"
+    manifest = load_manifest(args.season, slug)
+    if not manifest["sources"]:
+        print(f"[INFO] No snapshot history for {args.season} {args.season_type}")
+        return 0
+
+    for source, entry in manifest["sources"].items():
+        snaps = entry["snapshots"]
+        size  = sum(
+            os.path.getsize(p) for p in
+            (snapshot_path(args.season, slug, source, s["date"]) for s in snaps) if os.path.exists(p)
+        )
+        print(
+            f"[INFO] {source}: {len(snaps)} snapshots ({snaps[0]['date']} .. {snaps[-1]['last_seen']}), "
+            f"{size / 1e3:.0f} KB, {len(entry['latest_seen'])} players indexed"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,249 @@
+"""
+staging_dataset.py
+
+Partitioned multi-season view of the staging parquets.
+
+The per-season files (assets/data/staging/{season}__{slug}.parquet) stay the
+source of truth.  Each one is mirrored into a hive-partitioned dataset:
+
+    assets/data/staging_dataset/
+        season=2024-25/season_type=regular/part-0.parquet
+        ...
+
+Partitions are written in staging row order (sorted by PLAYER_ID) in row
+groups of ROW_GROUP_SIZE rows with column statistics, so PLAYER_ID filters can
+skip row groups and season / season_type filters skip whole directories.
+Partitions use the compact dtypes of staging_dtypes.py (int32, exact float32,
+dictionary-encoded names/teams) and leave out the per-season ctg__* constants,
+which live in the staging file metadata.  Staging schemas drift a little
+between seasons (438–443 columns, a few int vs float columns); scans use the
+union of the partition schemas, read from the partition footers, with ints
+promoted to float where seasons disagree.  There is no shared schema file, so
+seasons can be written concurrently.
+
+build_stage_season.py writes a season's partition every time it writes the
+season's staging file.  The dataset is a local, rebuildable artifact (not
+committed): after pulling new staging files, rebuild it with --rebuild.
+
+Usage:
+    python scripts/stage/staging_dataset.py --rebuild
+    python scripts/stage/staging_dataset.py --season 2024-25 --season-type "Regular Season"
+
+    from scripts.stage.staging_dataset import load_staging_dataset
+    df = load_staging_dataset(
+        columns=["PLAYER_ID", "Player", "nba_trad__GP"],
+        season_range=("2019-20", "2024-25"),
+        player_ids=[2544, 201939],
+    )
+"""
+
+import argparse
+import glob
+import os
+import sys
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.stage.staging_dtypes import compact_staging, read_staging_parquet
+
+STAGING_DIR  = os.path.join(REPO_ROOT, "assets", "data", "staging")
+DATASET_DIR  = os.path.join(REPO_ROOT, "assets", "data", "staging_dataset")
+PART_FILE    = "part-0.parquet"
+
+# ~570 players per season → 5 row groups; small enough for PLAYER_ID pruning
+ROW_GROUP_SIZE = 128
+
+PARTITION_SCHEMA = pa.schema([("season", pa.string()), ("season_type", pa.string())])
+
+
+def partition_path(season: str, season_type_slug: str, dataset_dir: str = DATASET_DIR) -> str:
+    return os.path.join(dataset_dir, f"season={season}", f"season_type={season_type_slug}", PART_FILE)
+
+
+def partition_files(dataset_dir: str = DATASET_DIR) -> list[str]:
+    return sorted(glob.glob(partition_path("*", "*", dataset_dir)))
+
+
+def read_common_schema(dataset_dir: str = DATASET_DIR) -> pa.Schema | None:
+    """
+    Union of every partition's schema (footers only, pandas metadata dropped —
+    it describes one season's frame, not the union), or None with no partitions.
+    """
+    schemas = [pq.read_schema(path).remove_metadata() for path in partition_files(dataset_dir)]
+    if not schemas:
+        return None
+    return pa.unify_schemas(schemas, promote_options="permissive")
+
+
+def write_season_partition(
+    df: pd.DataFrame,
+    season: str,
+    season_type_slug: str,
+    dataset_dir: str = DATASET_DIR,
+) -> str:
+    """
+    Write one season's staging frame as its dataset partition (with the
+    staging_dtypes.py compact dtypes).  The write goes through a hidden temp
+    file unique to the writer, so concurrent writers never see each other's
+    partial files.  Returns the partition path.
+    """
+    compact, _ = compact_staging(df)
+    table = pa.Table.from_pandas(compact, preserve_index=False)
+
+    out_path = partition_path(season, season_type_slug, dataset_dir)
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    # "." prefix: scans skip it (ignore_prefixes) while it is being written
+    tmp_path = os.path.join(os.path.dirname(out_path),
+                            f".{PART_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+    pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE, write_statistics=True)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def rebuild_dataset(dataset_dir: str = DATASET_DIR, staging_dir: str = STAGING_DIR) -> list[str]:
+    """Rewrite every partition from the per-season staging files."""
+    written = []
+    for name in sorted(os.listdir(staging_dir)):
+        if not name.endswith(".parquet") or "__" not in name:
+            continue
+        season, season_type_slug = name[: -len(".parquet")].split("__", 1)
+        df = read_staging_parquet(os.path.join(staging_dir, name))
+        written.append(write_season_partition(df, season, season_type_slug, dataset_dir))
+    return written
+
+
+def partition_is_current(season: str, season_type_slug: str, dataset_dir: str = DATASET_DIR) -> bool:
+    """True if the season's partition exists and is not older than its staging file."""
+    part = partition_path(season, season_type_slug, dataset_dir)
+    src  = os.path.join(STAGING_DIR, f"{season}__{season_type_slug}.parquet")
+    if not os.path.exists(part) or not os.path.exists(src):
+        return False
+    return os.path.getmtime(part) >= os.path.getmtime(src)
+
+
+def partition_dtypes(season: str, season_type_slug: str, dataset_dir: str = DATASET_DIR) -> pd.Series:
+    """
+    Pandas dtypes of one partition's own (pre-union) schema, as pd.read_parquet
+    would give.  Dictionary columns come back as a bare CategoricalDtype (the
+    schema does not carry their categories).
+    """
+    schema = pq.read_schema(partition_path(season, season_type_slug, dataset_dir))
+    dtypes = schema.empty_table().to_pandas().dtypes
+    return pd.Series(
+        [pd.CategoricalDtype() if isinstance(t, pd.CategoricalDtype) else t for t in dtypes],
+        index=dtypes.index,
+    )
+
+
+def open_staging_dataset(dataset_dir: str = DATASET_DIR) -> ds.Dataset:
+    """pyarrow Dataset over every partition, read with their union schema."""
+    common = read_common_schema(dataset_dir)
+    if common is None:
+        raise FileNotFoundError(
+            f"No staging dataset at {dataset_dir}. Run scripts/stage/staging_dataset.py --rebuild first."
+        )
+    schema = pa.unify_schemas([common, PARTITION_SCHEMA])
+    partitioning = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+    return ds.dataset(dataset_dir, format="parquet", partitioning=partitioning, schema=schema,
+                      exclude_invalid_files=False, ignore_prefixes=["_", "."])
+
+
+def staging_filter(
+    seasons: list[str] | None = None,
+    season_range: tuple[str | None, str | None] | None = None,
+    season_types: list[str] | None = None,
+    player_ids=None,
+) -> ds.Expression | None:
+    """
+    Build the scan filter.  seasons / season_range / season_types prune whole
+    partitions; player_ids is checked against row-group statistics.
+    season_range is inclusive; either end may be None.
+    """
+    parts = []
+    if seasons is not None:
+        parts.append(ds.field("season").isin(list(seasons)))
+    if season_range is not None:
+        start, end = season_range
+        if start is not None:
+            parts.append(ds.field("season") >= start)
+        if end is not None:
+            parts.append(ds.field("season") <= end)
+    if season_types is not None:
+        parts.append(ds.field("season_type").isin(list(season_types)))
+    if player_ids is not None:
+        parts.append(ds.field("PLAYER_ID").isin([int(p) for p in player_ids]))
+
+    expr = None
+    for p in parts:
+        expr = p if expr is None else expr & p
+    return expr
+
+
+def load_staging_dataset(
+    columns: list[str] | None = None,
+    seasons: list[str] | None = None,
+    season_range: tuple[str | None, str | None] | None = None,
+    season_types: list[str] | None = ("regular",),
+    player_ids=None,
+    dataset_dir: str = DATASET_DIR,
+) -> pd.DataFrame:
+    """
+    Read a slice of the staging dataset with filters pushed into the scan.
+
+    Args:
+        columns:      Columns to read (default: all).  Partition columns
+                      "season" and "season_type" may be requested too.
+        seasons:      Exact seasons, e.g. ["2023-24", "2024-25"].
+        season_range: Inclusive (first, last) season; either end may be None.
+        season_types: Season type slugs (default: ["regular"]; None for all).
+        player_ids:   Only these PLAYER_IDs.
+
+    Returns a DataFrame in partition (season) order, staging row order within
+    each season.  Columns a season does not have come back null.
+    """
+    dataset = open_staging_dataset(dataset_dir)
+    if columns is not None:
+        unknown = [c for c in columns if c not in dataset.schema.names]
+        if unknown:
+            raise KeyError(f"Columns not in the staging dataset: {unknown}")
+
+    table = dataset.to_table(
+        columns=list(columns) if columns is not None else None,
+        filter=staging_filter(seasons, season_range, season_types, player_ids),
+    )
+    return table.to_pandas()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument("--rebuild", action="store_true",
+                       help="Rewrite every partition from assets/data/staging/*.parquet")
+    which.add_argument("--season",  help='Rewrite one season\'s partition, e.g. "2024-25"')
+    parser.add_argument("--season-type", default="Regular Season", help='e.g. "Regular Season"')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        written = rebuild_dataset()
+        print(f"[OK] Rebuilt staging dataset: {len(written)} partitions in {DATASET_DIR}")
+        return 0
+
+    season_type_slug = "regular" if args.season_type == "Regular Season" else "playoffs"
+    src = os.path.join(STAGING_DIR, f"{args.season}__{season_type_slug}.parquet")
+    if not os.path.exists(src):
+        raise FileNotFoundError(f"Missing staging file: {src}. Run build_stage_season.py first.")
+    out = write_season_partition(read_staging_parquet(src), args.season, season_type_slug)
+    print(f"[OK] Wrote partition: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
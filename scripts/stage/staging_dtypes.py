@@ -0,0 +1,283 @@
+"""
+staging_dtypes.py
+
+Compact on-disk dtype policy for the staging parquets.
+
+build_stage_season.py builds staging as mostly float64 / int64 / str columns.
+write_staging_parquet() applies this policy before writing:
+
+    per-season constants   ctg__* columns are the same value on every row; they
+                           are dropped from the columns and stored once in the
+                           parquet schema metadata
+    names, teams, metadata Season, SeasonType, Player, *PLAYER_NAME, *NICKNAME,
+                           team abbreviations / IDs → categorical (parquet
+                           dictionary encoding)
+    integers               int64 → int32 when every value fits
+    floats                 float64 → float32 only when every non-null value
+                           survives the round trip exactly (counting stats that
+                           are float only because of NaN, .5/.25 rates, ...).
+                           Anything else stays float64.
+
+Files are zstd-compressed and written without the pandas metadata block (it
+is stored twice in the footer and was a quarter of each file); the Arrow
+schema alone round-trips every dtype, including the categoricals.
+
+The policy is lossless: staging is only ever built from int64 / float64 / str /
+bool columns, so read_staging_parquet(plain=True) widens int32 / float32 /
+categorical back and re-inserts the constants at their recorded positions,
+rebuilding the exact frame that was passed to write_staging_parquet().
+
+Readers that compute on staging numbers use widen_floats=True so arithmetic runs
+in float64 exactly as before (float32 * float would otherwise round
+differently); readers that only inspect values can keep the compact frame.
+
+Staging files written before the policy (no metadata) read back unchanged.
+
+Usage:
+    python scripts/stage/staging_dtypes.py --report
+    python scripts/stage/staging_dtypes.py --rewrite --season 2024-25
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+STAGING_DIR = os.path.join(REPO_ROOT, "assets", "data", "staging")
+
+# Key in the parquet schema metadata holding the policy record
+METADATA_KEY   = b"buckets_staging"
+POLICY_VERSION = 1
+
+# Columns broadcast from one per-season value (stored once as metadata)
+CONSTANT_PREFIXES = ("ctg__",)
+
+# Repeated names, teams and metadata (stored as categoricals)
+CATEGORY_COLUMNS = {"Season", "SeasonType", "Player", "pbp__Name", "pbp__ShortName", "pbp__TeamId"}
+CATEGORY_SUFFIXES = ("__PLAYER_NAME", "__NICKNAME", "__TEAM_ABBREVIATION", "__TeamAbbreviation")
+
+_INT32 = np.iinfo(np.int32)
+
+
+# ── Policy ────────────────────────────────────────────────────────────────────
+
+def is_constant_column(col: str) -> bool:
+    return col.startswith(CONSTANT_PREFIXES)
+
+
+def is_category_column(col: str) -> bool:
+    return col in CATEGORY_COLUMNS or col.endswith(CATEGORY_SUFFIXES)
+
+
+def _fits_float32(values: np.ndarray) -> bool:
+    values = values[~np.isnan(values)]
+    return bool((values.astype(np.float32).astype(np.float64) == values).all())
+
+
+def _compact_dtype(col: str, s: pd.Series):
+    """Compact dtype for one column, or None to keep it as is."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return None
+    if is_category_column(col) and (pd.api.types.is_string_dtype(s) or s.dtype == object):
+        return "category"
+    if s.dtype == np.int64:
+        if s.empty or (s.min() >= _INT32.min and s.max() <= _INT32.max):
+            return np.int32
+        return None
+    if s.dtype == np.float64 and _fits_float32(s.to_numpy()):
+        return np.float32
+    return None
+
+
+def _constant_value(col: str, s: pd.Series):
+    """The single value of a constant column; RuntimeError if the rows disagree."""
+    uniq = s.drop_duplicates()
+    if len(uniq) > 1:
+        raise RuntimeError(f"Staging column {col} should be constant per season but has {len(uniq)} values.")
+    if uniq.empty or pd.isna(uniq.iloc[0]):
+        return None
+    v = uniq.iloc[0]
+    return v.item() if isinstance(v, np.generic) else v
+
+
+def compact_staging(df: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """
+    Apply the dtype policy.
+
+    Returns:
+        (compact frame, policy record).  The record holds each per-season
+        constant dropped from the frame as {col: {"position", "value", "dtype"}}.
+        Compacting an already compact frame is a no-op.
+    """
+    constants = {
+        c: {"position": i, "value": _constant_value(c, df[c]), "dtype": str(df[c].dtype)}
+        for i, c in enumerate(df.columns) if is_constant_column(c)
+    }
+    out = df.drop(columns=list(constants))
+
+    casts = {c: _compact_dtype(c, out[c]) for c in out.columns}
+    out = out.astype({c: t for c, t in casts.items() if t is not None})
+
+    return out, {"policy_version": POLICY_VERSION, "constants": constants}
+
+
+def staging_record(path: str) -> dict | None:
+    """Policy record of a staging parquet, or None for a file written without one."""
+    meta = pq.read_schema(path).metadata or {}
+    raw = meta.get(METADATA_KEY)
+    return json.loads(raw) if raw else None
+
+
+def staging_columns(path: str) -> list[str]:
+    """All staging columns of a file, including constants stored as metadata."""
+    names  = pq.read_schema(path).names
+    record = staging_record(path)
+    if record:
+        for c, spec in sorted(record["constants"].items(), key=lambda kv: kv[1]["position"]):
+            names.insert(spec["position"], c)
+    return names
+
+
+def plain_dtype(dtype):
+    """Dtype a compact column had before the policy (int64 / float64 / str)."""
+    if isinstance(dtype, pd.CategoricalDtype):
+        return dtype.categories.dtype
+    if dtype == np.int32:
+        return np.int64
+    if dtype == np.float32:
+        return np.float64
+    return dtype
+
+
+# ── Read / write ──────────────────────────────────────────────────────────────
+
+def write_staging_parquet(df: pd.DataFrame, out_path: str) -> pd.DataFrame:
+    """
+    Compact df and write it atomically (tmp file + rename).  Returns the
+    compact frame.
+    """
+    compact, record = compact_staging(df)
+    table = pa.Table.from_pandas(compact, preserve_index=False)
+    table = table.replace_schema_metadata({METADATA_KEY: json.dumps(record).encode("utf-8")})
+    tmp_path = out_path + ".tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, out_path)
+    return compact
+
+
+def read_staging_parquet(
+    path: str,
+    columns: list[str] | None = None,
+    widen_floats: bool = False,
+    plain: bool = False,
+) -> pd.DataFrame:
+    """
+    Read a staging parquet written by write_staging_parquet().
+
+    Args:
+        path:         Staging parquet path.
+        columns:      Columns to read (default: all); constants are rebuilt
+                      from the metadata.
+        widen_floats: Cast float32 columns back to float64 (exact).  Use this
+                      wherever staging numbers feed arithmetic.
+        plain:        Restore every column's original dtype, giving the exact
+                      frame that was written.
+    """
+    record = staging_record(path)
+    if record is None:
+        return pd.read_parquet(path, columns=columns)
+
+    wanted    = list(columns) if columns is not None else staging_columns(path)
+    constants = record["constants"]
+    stored    = [c for c in wanted if c not in constants]
+    if stored:
+        df = pd.read_parquet(path, columns=stored)
+    else:
+        df = pd.DataFrame(index=pd.RangeIndex(pq.read_metadata(path).num_rows))
+
+    for c in wanted:
+        if c in constants:
+            spec  = constants[c]
+            value = np.nan if spec["value"] is None else spec["value"]
+            df[c] = pd.Series(value, index=df.index).astype(spec["dtype"])
+    df = df[wanted]
+
+    if plain:
+        return df.astype({c: plain_dtype(t) for c, t in df.dtypes.items()})
+    if widen_floats:
+        return widen_staging_floats(df)
+    return df
+
+
+def widen_float_dtypes(dtypes: pd.Series) -> pd.Series:
+    """A frame's dtypes with float32 replaced by float64."""
+    return pd.Series([np.dtype(np.float64) if t == np.float32 else t for t in dtypes], index=dtypes.index)
+
+
+def widen_staging_floats(df: pd.DataFrame) -> pd.DataFrame:
+    f32 = [c for c in df.columns if df[c].dtype == np.float32]
+    return df.astype(dict.fromkeys(f32, np.float64)) if f32 else df
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+
+def _staging_files(season: str | None) -> list[str]:
+    names = sorted(n for n in os.listdir(STAGING_DIR) if n.endswith(".parquet") and "__" in n)
+    if season:
+        names = [n for n in names if n.startswith(f"{season}__")]
+    return [os.path.join(STAGING_DIR, n) for n in names]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    which = parser.add_mutually_exclusive_group(required=True)
+    which.add_argument("--report",  action="store_true",
+                       help="Print file size and load memory, plain vs compact, per staging file")
+    which.add_argument("--rewrite", action="store_true",
+                       help="Rewrite staging files with the compact policy")
+    parser.add_argument("--season", default=None, help='Only this season, e.g. "2024-25"')
+    args = parser.parse_args()
+
+    paths = _staging_files(args.season)
+    if not paths:
+        raise FileNotFoundError(f"No staging parquets in {STAGING_DIR}")
+
+    for path in paths:
+        name = os.path.basename(path)
+        df   = read_staging_parquet(path, plain=True)
+        if args.rewrite:
+            before = os.path.getsize(path)
+            write_staging_parquet(df, path)
+            print(f"[OK] {name}: {before / 1e3:.0f} KB -> {os.path.getsize(path) / 1e3:.0f} KB")
+            continue
+
+        compact, record = compact_staging(df)
+        tmp_path = os.path.join(STAGING_DIR, f".{name}.policy")
+        try:
+            df.to_parquet(tmp_path, index=False)
+            plain_size = os.path.getsize(tmp_path)
+            write_staging_parquet(df, tmp_path)
+            compact_size = os.path.getsize(tmp_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print(
+            f"[INFO] {name}: file {plain_size / 1e3:.0f} KB -> {compact_size / 1e3:.0f} KB, "
+            f"memory {df.memory_usage(deep=True).sum() / 1e6:.2f} MB -> "
+            f"{compact.memory_usage(deep=True).sum() / 1e6:.2f} MB, "
+            f"{len(record['constants'])} constants as metadata"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,283 @@
+"""
+Benchmark: build_season phases on synthetic staging at 1×, 10× and 100× players.
+
+The synthetic staging frame is the real season staging parquet (full column
+schema) tiled N times.  Every copy after the first gets fresh PLAYER_IDs, a
+suffixed Player name and count columns scaled by a per-row random factor
+(0.85–1.15, seeded), so the NaN pattern, dtypes and column set match real
+staging while league aggregates stay plausible.
+
+For each scale the phase chain used by build_season_table() is run --repeat
+times; per-phase wall time (median and min) is recorded, plus one extra pass
+under tracemalloc for each phase's peak allocation.  The scaling exponent per
+phase is the slope of log(time) against log(rows): ~1.0 is linear, anything
+clearly above 1 is superlinear.
+
+Usage:
+    python tests/bench_build_season.py
+    python tests/bench_build_season.py --scales 1 10 --repeat 5
+    python tests/bench_build_season.py --output reports/bench_build_season.json
+
+Output (JSON, default reports/bench_build_season.json):
+    {
+      "generated_at_utc": ..., "season": ..., "repeat": ..., "versions": {...},
+      "scales": [
+        {"scale": 1, "rows": 569, "cols": 442,
+         "phases": {"phase1a_playtypes": {"wall_ms_median": ..., "wall_ms_min": ...,
+                                          "peak_bytes": ...}, ...},
+         "total_ms_median": ...},
+        ...
+      ],
+      "scaling_exponent": {"phase1a_playtypes": 0.98, ...}
+    }
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import scripts.calculate.build_season as bs
+from scripts.calculate.config import build_config
+from scripts.stage.staging_dtypes import read_staging_parquet
+
+SEASON = "2024-25"
+
+# PLAYER_ID offset between synthetic copies (real NBA IDs are < 10M)
+ID_STRIDE = 10_000_000
+
+# Substrings marking numeric columns that are rates/identifiers, not counts
+_NON_COUNT_MARKERS = ("PCT", "Pct", "_ID", "EntityId", "TeamId", "RowId", "RANK",
+                      "PERCENTILE", "PPP", "AGE", "ctg__", "Accuracy", "Frequency",
+                      "Rtg", "Avg", "Usage")
+
+
+# ── Synthetic staging ─────────────────────────────────────────────────────────
+
+def synthetic_staging(template: pd.DataFrame, scale: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Tile a staging frame `scale` times with the same column schema.
+
+    Copy 0 is the template unchanged; copies 1..scale-1 get PLAYER_ID +
+    k * ID_STRIDE, a " #k" name suffix and count columns multiplied by a
+    per-row factor in [0.85, 1.15] (integer columns rounded back to int).
+    """
+    if scale < 1:
+        raise ValueError(f"scale must be >= 1, got {scale}")
+
+    rng = np.random.default_rng(seed)
+    count_cols = [
+        c for c in template.columns
+        if c != "PLAYER_ID"
+        and pd.api.types.is_numeric_dtype(template[c])
+        and not pd.api.types.is_bool_dtype(template[c])
+        and not any(m in c for m in _NON_COUNT_MARKERS)
+    ]
+
+    copies = [template]
+    for k in range(1, scale):
+        cp = template.copy()
+        cp["PLAYER_ID"] = cp["PLAYER_ID"] + k * ID_STRIDE
+        cp["Player"] = cp["Player"].astype(object).where(
+            cp["Player"].isna(), cp["Player"].astype(str) + f" #{k}"
+        )
+        factor = rng.uniform(0.85, 1.15, size=len(cp))
+        for c in count_cols:
+            scaled = cp[c].to_numpy(dtype=np.float64) * factor
+            if pd.api.types.is_integer_dtype(cp[c]):
+                cp[c] = np.round(scaled).astype(cp[c].dtype)
+            else:
+                cp[c] = scaled
+        copies.append(cp)
+
+    return pd.concat(copies, ignore_index=True)
+
+
+# ── Phase chain ───────────────────────────────────────────────────────────────
+
+def phase_steps(cfg: dict, season: str) -> list[tuple[str, callable]]:
+    """
+    The build_season_table() phase chain as (name, step) pairs.
+    Each step reads its inputs from and writes its outputs to a shared state dict.
+    """
+    def scoring_share(st):
+        st["df"] = bs.compute_scoring_share_of_tov(st["stg"])
+
+    def p1a(st):
+        st["pt1a"] = bs.phase1a_playtypes(st["df"])
+
+    def p2(st):
+        st["pt2"], st["tr_agg"] = bs.phase2_transition(st["df"], cfg)
+
+    def p3a(st):
+        st["pt3a"], st["agg3a"] = bs.phase3a_passing(st["df"], st["pt1a"], st["pt2"], cfg)
+
+    def p1b(st):
+        st["pt1b"] = bs.phase1b_playtypes(
+            st["pt1a"], st["agg3a"]["lg_avg_onball_tov_rate"], cfg,
+            {"offrebound": cfg["CTG_HC_PPP"]},
+        )
+
+    def p3b(st):
+        st["pt3b"] = bs.phase3b_passing(st["pt3a"], st["agg3a"], st["tr_agg"]["TR_PPP_RATIO"], cfg)
+
+    def p4(st):
+        st["pt4"] = bs.phase4_transition(st["pt2"], st["pt3b"], st["tr_agg"], cfg)
+
+    def p5(st):
+        st["pt5"] = bs.phase5_floor_raising(st["pt1b"], st["pt3b"], st["df"], cfg)
+
+    def p6(st):
+        st["out"] = bs.phase6_assemble(st["pt1b"], st["pt3b"], st["pt4"], st["pt5"], st["df"], season)
+
+    return [
+        ("compute_scoring_share_of_tov", scoring_share),
+        ("phase1a_playtypes",            p1a),
+        ("phase2_transition",            p2),
+        ("phase3a_passing",              p3a),
+        ("phase1b_playtypes",            p1b),
+        ("phase3b_passing",              p3b),
+        ("phase4_transition",            p4),
+        ("phase5_floor_raising",         p5),
+        ("phase6_assemble",              p6),
+    ]
+
+
+def bench_scale(stg: pd.DataFrame, cfg: dict, season: str, repeat: int) -> dict:
+    """Time every phase `repeat` times, then one tracemalloc pass for peaks."""
+    steps = phase_steps(cfg, season)
+    times = {name: [] for name, _ in steps}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            st = {"stg": stg}
+            for name, step in steps:
+                t0 = time.perf_counter()
+                step(st)
+                times[name].append(time.perf_counter() - t0)
+
+        peaks = {}
+        st = {"stg": stg}
+        tracemalloc.start()
+        try:
+            for name, step in steps:
+                tracemalloc.reset_peak()
+                base_bytes, _ = tracemalloc.get_traced_memory()
+                step(st)
+                peaks[name] = tracemalloc.get_traced_memory()[1] - base_bytes
+        finally:
+            tracemalloc.stop()
+
+    phases = {
+        name: {
+            "wall_ms_median": round(statistics.median(ts) * 1000, 3),
+            "wall_ms_min":    round(min(ts) * 1000, 3),
+            "peak_bytes":     int(peaks[name]),
+        }
+        for name, ts in times.items()
+    }
+    return {
+        "rows":            int(stg.shape[0]),
+        "cols":            int(stg.shape[1]),
+        "output_rows":     int(st["out"].shape[0]),
+        "phases":          phases,
+        "total_ms_median": round(sum(p["wall_ms_median"] for p in phases.values()), 3),
+    }
+
+
+def scaling_exponents(results: list[dict]) -> dict[str, float | None]:
+    """Slope of log(median time) vs log(rows) per phase (None with < 2 scales)."""
+    if len(results) < 2:
+        return {name: None for name in results[0]["phases"]} if results else {}
+    rows = np.log([r["rows"] for r in results])
+    out = {}
+    for name in results[0]["phases"]:
+        t = np.log([max(r["phases"][name]["wall_ms_median"], 1e-6) for r in results])
+        out[name] = round(float(np.polyfit(rows, t, 1)[0]), 3)
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--season", default=SEASON, help='Template season (default: "2024-25")')
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100],
+                        help="Player-count multipliers (default: 1 10 100)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Timed runs per scale (default: 3)")
+    parser.add_argument("--seed",   type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(REPO_ROOT, "reports", "bench_build_season.json"))
+    args = parser.parse_args()
+
+    paths = bs.season_input_paths(args.season, "regular")
+    if not os.path.exists(paths["staging"]):
+        print(f"[ERROR] Missing staging template: {paths['staging']}")
+        return 1
+
+    template = read_staging_parquet(paths["staging"], widen_floats=True)
+    cfg = build_config(paths["ctg"])
+    if os.path.exists(paths["pct_ast"]):
+        with open(paths["pct_ast"], encoding="utf-8") as f:
+            cfg["PCT_AST_PTS_IN_PA"] = json.load(f)["values"]["PCT_AST_PTS_IN_PA"]
+    else:
+        cfg["PCT_AST_PTS_IN_PA"] = 0.8  # any plausible value; timing does not depend on it
+
+    results = []
+    for scale in args.scales:
+        stg = synthetic_staging(template, scale, seed=args.seed)
+        print(f"[INFO] Scale {scale}×: {stg.shape[0]} rows × {stg.shape[1]} cols ...", flush=True)
+        r = bench_scale(stg, cfg, args.season, args.repeat)
+        r["scale"] = scale
+        results.append(r)
+
+    exponents = scaling_exponents(results)
+
+    # ── Summary table ─────────────────────────────────────────────────────────
+    print()
+    header = f"{'Phase':<30}" + "".join(f"{str(r['scale']) + '× ms':>12}" for r in results) + f"{'peak MB':>10}{'exp':>7}"
+    print(header)
+    print("-" * len(header))
+    for name in results[0]["phases"]:
+        row = f"{name:<30}" + "".join(f"{r['phases'][name]['wall_ms_median']:>12.1f}" for r in results)
+        peak = results[-1]["phases"][name]["peak_bytes"] / 1e6
+        exp  = exponents.get(name)
+        row += f"{peak:>10.1f}" + (f"{exp:>7.2f}" if exp is not None else f"{'':>7}")
+        print(row)
+    print("-" * len(header))
+    print(f"{'total':<30}" + "".join(f"{r['total_ms_median']:>12.1f}" for r in results))
+
+    report = {
+        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        "season":           args.season,
+        "repeat":           args.repeat,
+        "seed":             args.seed,
+        "versions": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy":  np.__version__,
+        },
+        "scales":           results,
+        "scaling_exponent": exponents,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[OK] Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
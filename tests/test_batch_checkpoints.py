@@ -0,0 +1,224 @@
+"""
+Batch checkpoint test: the batch_build_historical checkpoint ledger on a
+scratch tree of stand-in artifacts (no steps are run).
+
+  - with no ledger every step has to run; once every step is recorded as
+    succeeded, none does;
+  - editing the staging parquet invalidates build_stage (artifact changed)
+    and every local step after it (inputs changed), but no ingest step;
+    restoring the same bytes makes them all valid again;
+  - a failed run or an edited step script reruns just that step; an edited
+    module the local step scripts import reruns them all; an edited name
+    fixer input reruns build_stage; a deleted ingest
+    artifact reruns its ingest and the local steps; other seasons are
+    untouched;
+  - for the current season (live_season) the ingest steps always rerun and
+    the local steps stay valid; other seasons' ingest steps stay valid;
+  - the ledger round-trips through save_ledger() / load_ledger();
+  - select_steps() keeps STEPS order and rejects unknown names;
+  - with stand-in steps run for three seasons at once, build_stage and
+    validate_stage (SHARED_REPORT_STEPS) never overlap while the other local
+    steps of different seasons do.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import scripts.local.batch_build_historical as batch
+from scripts.local.batch_build_historical import (
+    NETWORK_STEPS,
+    SHARED_REPORT_STEPS,
+    STEPS,
+    load_ledger,
+    record_checkpoint,
+    save_ledger,
+    select_steps,
+    step_paths,
+    step_run_reason,
+)
+from scripts.local.run_pipeline import hash_inputs
+
+SEASONS = ["2023-24", "2024-25"]
+NAMES   = [name for name, _ in STEPS]
+LOCAL   = [name for name in NAMES if name not in NETWORK_STEPS]
+
+
+def write(root: str, rel: str, text: str) -> None:
+    path = os.path.join(root, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def make_tree(root: str) -> None:
+    """Every input and artifact of every step, for SEASONS, with distinct content."""
+    for season in SEASONS:
+        for name in NAMES:
+            inputs, outputs = step_paths(name, season)
+            for rel in (inputs or []) + outputs:
+                rel = rel.replace("*", "Name Fixer 2025")
+                if not os.path.exists(os.path.join(root, rel)):
+                    write(root, rel, f"{rel}\n")
+
+
+def reasons(ledger: dict, root: str, season: str = SEASONS[1], live_season: str | None = None) -> dict[str, str | None]:
+    return {name: step_run_reason(ledger, name, season, root, live_season) for name in NAMES}
+
+
+def record_all(ledger: dict, root: str, season: str, names: list[str] = NAMES) -> None:
+    for name in names:
+        inputs, _ = step_paths(name, season)
+        inputs_hash = hash_inputs(inputs, root)[0] if inputs is not None else None
+        record_checkpoint(ledger, name, season, True, "", 1.0, inputs_hash, root)
+
+
+def run_local_seasons(seasons: list[str], step_seconds: float = 0.2) -> list[tuple[str, str, float, float]]:
+    """
+    run_local_steps() for seasons in parallel threads with a sleeping stand-in
+    for run_step() (no ledger or log written).  Returns (season, step, start, end) spans.
+    """
+    spans = []
+
+    def fake_run_step(step_name, script_args, season, timeout):
+        start = time.perf_counter()
+        time.sleep(step_seconds)
+        spans.append((season, step_name, start, time.perf_counter()))
+        return True, ""
+
+    saved = batch.run_step, batch.save_ledger, batch.log
+    batch.run_step, batch.save_ledger, batch.log = fake_run_step, lambda ledger: None, lambda msg: None
+    try:
+        ledger  = {"version": 1, "checkpoints": {}}
+        threads = [
+            threading.Thread(target=batch.run_local_steps,
+                             args=(season, STEPS, {"steps": {}, "failed_step": None}, ledger, True, 1.0))
+            for season in seasons
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        batch.run_step, batch.save_ledger, batch.log = saved
+    return spans
+
+
+def any_overlap(spans: list[tuple[str, str, float, float]]) -> bool:
+    spans = sorted(spans, key=lambda s: s[2])
+    return any(b[2] < a[3] and a[0] != b[0] for i, a in enumerate(spans) for b in spans[i + 1:])
+
+
+def main() -> int:
+    checks = []
+    with tempfile.TemporaryDirectory() as root:
+        make_tree(root)
+        ledger = {"version": 1, "checkpoints": {}}
+
+        checks.append(("no ledger runs every step",
+                       all(r == "no checkpoint" for r in reasons(ledger, root).values())))
+        for season in SEASONS:
+            record_all(ledger, root, season)
+        checks.append(("recorded steps are skipped", all(r is None for r in reasons(ledger, root).values())))
+
+        _, (stg,) = step_paths("build_stage", SEASONS[1])
+        with open(os.path.join(root, stg), encoding="utf-8") as f:
+            original = f.read()
+        write(root, stg, "edited\n")
+        edited = reasons(ledger, root)
+        checks.append(("edited artifact reruns its step", edited["build_stage"].startswith("artifacts")))
+        checks.append(("downstream steps rerun",
+                       all(edited[n] == "inputs changed" for n in LOCAL if n != "build_stage")))
+        checks.append(("ingest steps stay valid", all(edited[n] is None for n in NETWORK_STEPS)))
+        checks.append(("other season untouched",
+                       all(r is None for r in reasons(ledger, root, SEASONS[0]).values())))
+
+        write(root, stg, original)
+        checks.append(("identical artifact keeps steps valid",
+                       all(r is None for r in reasons(ledger, root).values())))
+
+        record_checkpoint(ledger, "compute_pct_ast", SEASONS[1], False, "Timed out after 300s", 300.0, None, root)
+        failed = reasons(ledger, root)
+        checks.append(("failed step reruns",
+                       failed["compute_pct_ast"] == "failed last run"
+                       and all(failed[n] is None for n in NAMES if n != "compute_pct_ast")))
+        record_all(ledger, root, SEASONS[1], ["compute_pct_ast"])
+
+        _, outputs = step_paths("nba_pbpstats", SEASONS[1])
+        os.remove(os.path.join(root, outputs[0]))
+        deleted = reasons(ledger, root)
+        checks.append(("deleted artifact reruns ingest and downstream",
+                       deleted["nba_pbpstats"].startswith("artifacts")
+                       and all(deleted[n] == "inputs changed" for n in LOCAL)
+                       and all(deleted[n] is None for n in NETWORK_STEPS if n != "nba_pbpstats")))
+        write(root, outputs[0], f"{outputs[0]}\n")
+
+        write(root, "scripts/calculate/compute_pct_ast_pts.py", "changed\n")
+        script = reasons(ledger, root)
+        checks.append(("edited script reruns only its step",
+                       script["compute_pct_ast"] == "inputs changed" and script["build_season"] is None
+                       and script["build_stage"] is None))
+
+        fixer = "mappings/name_fixer_inputs/Name Fixer 2025.csv"
+        write(root, fixer, "changed\n")
+        names = reasons(ledger, root)
+        checks.append(("edited name fixer input reruns build_stage",
+                       names["build_stage"] == "inputs changed"
+                       and all(names[n] is None for n in NETWORK_STEPS)))
+        write(root, fixer, f"{fixer}\n")
+
+        write(root, "scripts/stage/staging_dtypes.py", "changed\n")
+        module = reasons(ledger, root)
+        checks.append(("edited imported module reruns its importers",
+                       all(module[n] == "inputs changed" for n in LOCAL)
+                       and all(module[n] is None for n in NETWORK_STEPS)))
+
+        record_all(ledger, root, SEASONS[1])
+        live = reasons(ledger, root, live_season=SEASONS[1])
+        checks.append(("current season reruns ingest only",
+                       all(live[n] == "current season" for n in NETWORK_STEPS)
+                       and all(live[n] is None for n in LOCAL)))
+        past = reasons(ledger, root, SEASONS[0], live_season=SEASONS[1])
+        checks.append(("past seasons keep ingest checkpoints", all(past[n] is None for n in NETWORK_STEPS)))
+
+        ledger_path = os.path.join(root, "reports", "batch_checkpoints.json")
+        save_ledger(ledger, ledger_path)
+        checks.append(("ledger round-trips", load_ledger(ledger_path) == ledger))
+
+    checks.append(("select_steps keeps STEPS order",
+                   [n for n, _ in select_steps(["build_season", "build_stage"])] == ["build_stage", "build_season"]))
+    checks.append(("select_steps default is every step", select_steps(None) == list(STEPS)))
+    try:
+        select_steps(["build_everything"])
+        unknown_ok = False
+    except ValueError:
+        unknown_ok = True
+    checks.append(("unknown step rejected", unknown_ok))
+
+    spans = run_local_seasons(["2013-14", "2014-15", "2015-16"])
+    checks.append(("shared-report steps run one season at a time",
+                   not any_overlap([s for s in spans if s[1] in SHARED_REPORT_STEPS])))
+    checks.append(("other local steps overlap across seasons",
+                   any_overlap([s for s in spans if s[1] not in SHARED_REPORT_STEPS])))
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — checkpoints skip valid steps and rerun invalidated ones")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
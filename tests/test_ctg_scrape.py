@@ -0,0 +1,162 @@
+"""
+CTG scrape test: the targeted league-averages parser and the saved login
+session of scripts/ingest/ctg_league_avgs.py (no network).
+
+On a synthetic page shaped like CTG's (large tables before and after the
+target, a decoy league_averages row in another table, nested tags and
+entities in the cells):
+
+  - _parse_stat_cells() returns exactly the td.stat.value texts of the
+    target table's league_averages row, and _cell_float() strips the %;
+  - a missing table, thead or row raises ValueError;
+  - it is much faster than a full html.parser pass over the page.
+
+Saved session:
+
+  - cookies round-trip with their expiry; expired cookies, and cookies with
+    no expiry older than CTG_SESSION_MAX_AGE, are not loaded;
+  - the login cookie decides whether a saved session is reusable, and
+    ctg_session() reuses it without logging in.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from html.parser import HTMLParser
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.ingest.ctg_league_avgs import (
+    CTG_SESSION_MAX_AGE,
+    _cell_float,
+    _parse_stat_cells,
+    ctg_session,
+    load_session_cookies,
+    save_session_cookies,
+)
+
+TABLE_ID = "league_offense_halfcourt_and_putbacks"
+VALUES   = ["99.1", "97.8", "24.9%", "0.5", "1.2", "112.3", "13.4%"]
+DOMAIN   = ".cleaningtheglass.com"
+
+
+def filler_table(table_id: str, rows: int) -> str:
+    body = "".join(
+        f'<tr><td class="name"><a href="/players/{i}">Player {i}</a></td>'
+        + "".join(f'<td class="stat value">{i * j % 97}.{j}</td>' for j in range(12)) + "</tr>\n"
+        for i in range(rows)
+    )
+    return (f'<table id="{table_id}" class="stat_table"><thead><tr class="league_averages">'
+            f'<td class="stat value">0.0</td></tr></thead><tbody>{body}</tbody></table>\n')
+
+
+def ctg_page(include_row: bool = True, include_thead: bool = True) -> str:
+    cells = "".join(
+        f'<td class="stat value"><span class="val">{v}</span></td>' if i % 2 else f'<td class="value stat">{v}</td>'
+        for i, v in enumerate(VALUES)
+    )
+    row = (f'<tr class="league_averages"><td class="name">League&nbsp;Average</td>'
+           f'<td class="rank">&mdash;</td>{cells}</tr>') if include_row else "<tr><td>x</td></tr>"
+    head = f'<thead><tr><th>Team</th><th>Pts/Play</th></tr>{row}</thead>' if include_thead else ""
+    target = f'<table id="{TABLE_ID}" class="stat_table">{head}<tbody><tr><td class="stat value">1.0</td></tr></tbody></table>'
+    return ("<html><head><title>CTG</title><script>var x = '<table>';</script></head><body>"
+            + filler_table("league_offense_overall", 1500) + target + filler_table("league_defense", 1500)
+            + "</body></html>")
+
+
+class FullParse(HTMLParser):
+    def handle_starttag(self, tag, attrs):
+        dict(attrs)
+
+
+def best_of(fn, n: int = 5) -> float:
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def raises_value_error(fn) -> bool:
+    try:
+        fn()
+    except ValueError:
+        return True
+    return False
+
+
+def make_cookie(name: str, expires: float | None) -> requests.cookies.Cookie:
+    return requests.cookies.create_cookie(name, f"{name}-value", domain=DOMAIN, path="/", expires=expires)
+
+
+def main() -> int:
+    page  = ctg_page()
+    cells = _parse_stat_cells(page, TABLE_ID, "context")
+
+    fast_s = best_of(lambda: _parse_stat_cells(page, TABLE_ID, "context"))
+    full_s = best_of(lambda: FullParse().feed(page))
+    print(f"Page {len(page) / 1e6:.1f} MB: targeted {fast_s * 1e3:.2f} ms, full parse {full_s * 1e3:.1f} ms")
+
+    checks = [
+        ("league averages row cells",  cells == VALUES),
+        ("percent stripped",           _cell_float(cells, 2, TABLE_ID) == 24.9 and _cell_float(cells, 5, TABLE_ID) == 112.3),
+        ("missing table",              raises_value_error(lambda: _parse_stat_cells(page, "league_nothing", "context"))),
+        ("missing thead",              raises_value_error(lambda: _parse_stat_cells(ctg_page(include_thead=False), TABLE_ID, "context"))),
+        ("missing row",                raises_value_error(lambda: _parse_stat_cells(ctg_page(include_row=False), TABLE_ID, "context"))),
+        ("cell index out of range",    raises_value_error(lambda: _cell_float(cells, 99, TABLE_ID))),
+        ("faster than a full parse",   fast_s * 10 < full_s),
+    ]
+
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session_cookies.json")
+        session = requests.Session()
+        session.cookies.set_cookie(make_cookie("wordpress_logged_in_abc", now + 14 * 86400))
+        session.cookies.set_cookie(make_cookie("wordpress_sec_abc", None))
+        session.cookies.set_cookie(make_cookie("old_cookie", now - 60))
+        session.cookies.set_cookie(requests.cookies.create_cookie("other", "x", domain=".example.com", path="/"))
+        save_session_cookies(session, path)
+
+        loaded = requests.Session()
+        logged_in = load_session_cookies(loaded, path)
+        names = {c.name for c in loaded.cookies}
+        checks.append(("saved session reloads",
+                       logged_in and names == {"wordpress_logged_in_abc", "wordpress_sec_abc"}
+                       and loaded.cookies.get("wordpress_logged_in_abc") == "wordpress_logged_in_abc-value"))
+        if os.name == "posix":
+            checks.append(("cookie file private", os.stat(path).st_mode & 0o777 == 0o600))
+
+        later = requests.Session()
+        load_session_cookies(later, path, now=now + CTG_SESSION_MAX_AGE + 60)
+        checks.append(("no-expiry cookies age out", {c.name for c in later.cookies} == {"wordpress_logged_in_abc"}))
+        checks.append(("expired login not reused",
+                       not load_session_cookies(requests.Session(), path, now=now + 15 * 86400)))
+        checks.append(("missing file not reused", not load_session_cookies(requests.Session(), path + ".none")))
+
+        reused, auth = ctg_session("user@example.com", "secret", session_path=path)
+        checks.append(("ctg_session reuses saved login without logging in",
+                       auth == "saved" and reused.summary()["requests"] == 0
+                       and reused.cookies.get("wordpress_logged_in_abc") is not None))
+        checks.append(("anonymous without credentials", ctg_session("", "", session_path=path)[1] == "anonymous"))
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — CTG parser reads the averages row and the saved session is reused")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -328,9 +328,10 @@ if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
 import scripts.calculate.build_season as bs
 from scripts.calculate.config import build_config
+from scripts.stage.staging_dtypes import read_staging_parquet
 
-_stg = pd.read_parquet(os.path.join(REPO_ROOT, "assets", "data", "staging",
-                                     f"{PRIMARY_SEASON}__regular.parquet"))
+_stg = read_staging_parquet(os.path.join(REPO_ROOT, "assets", "data", "staging",
+                                         f"{PRIMARY_SEASON}__regular.parquet"), widen_floats=True)
 _cfg = build_config(os.path.join(REPO_ROOT, "assets", "data", "raw",
                                   PRIMARY_SEASON, "regular", "ctg_league_averages.json"))
 _cfg["PCT_AST_PTS_IN_PA"] = json.load(open(os.path.join(
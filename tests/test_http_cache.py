@@ -0,0 +1,180 @@
+"""
+HTTP cache / unchanged-output test: IngestSession's TTL response cache against
+a local stub (no network), and the content-hash write helpers.
+
+  - a repeated GET within the host's TTL is served from the cache without
+    reaching the stub, and is counted as a cache hit;
+  - an expired entry, an error response, a POST, a host with no TTL and a
+    session with the cache off all go to the stub;
+  - record mode never reads the cache;
+  - a login page and a response that sets cookies are never cached, so a
+    second session's login GET still gets its cookies;
+  - write_parquet_if_changed() leaves a file with the same content untouched
+    (also when the fresh frame was rebuilt from JSON rows, as nba_api does) and
+    rewrites it when a value changes;
+  - write_json_if_changed() ignores generated_at_utc / http.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.ingest.ingest_client import (
+    IngestSession,
+    write_json_if_changed,
+    write_parquet_if_changed,
+)
+
+HOST = "127.0.0.1"
+RAW_PATH = os.path.join(REPO_ROOT, "assets", "data", "raw", "2024-25", "regular", "nba_traditional_totals.parquet")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits: list[str] = []
+
+    def _reply(self):
+        StubHandler.hits.append(self.path)
+        status = 503 if self.path.startswith("/down") else 200
+        body = json.dumps({"path": self.path, "hit": len(StubHandler.hits)}).encode("utf-8")
+        self.send_response(status)
+        if self.path.startswith(("/wp-login.php", "/session")):
+            self.send_header("Set-Cookie", f"sid={len(StubHandler.hits)}; Path=/")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+def stub_hits(session: IngestSession, method: str, url: str, **kwargs) -> int:
+    """Number of requests that reached the stub for one session call."""
+    before = len(StubHandler.hits)
+    try:
+        session.request(method, url, timeout=5, **kwargs)
+    except Exception:
+        pass
+    return len(StubHandler.hits) - before
+
+
+def main() -> int:
+    server = ThreadingHTTPServer((HOST, 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://{HOST}:{server.server_address[1]}"
+    checks = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        try:
+            cached = IngestSession(mode="live", rate_limits={}, cache=True, cache_dir=cache_dir,
+                                   cache_ttls={HOST: 3600})
+            first  = cached.get(f"{base}/stats?i=1", timeout=5)
+            before = len(StubHandler.hits)
+            second = cached.get(f"{base}/stats?i=1", timeout=5)
+            checks.append(("repeat GET served from cache",
+                           len(StubHandler.hits) == before and second.json() == first.json()))
+            checks.append(("cache hit in metrics",
+                           cached.summary()["cache_hits"] == 1 and cached.summary()["by_host"][HOST]["cache_hits"] == 1))
+            checks.append(("other params miss", stub_hits(cached, "GET", f"{base}/stats?i=2") == 1))
+            checks.append(("errors not cached",
+                           stub_hits(cached, "GET", f"{base}/down") == 1
+                           and stub_hits(cached, "GET", f"{base}/down") == 1))
+            checks.append(("POST not cached",
+                           stub_hits(cached, "POST", f"{base}/login", data={"a": 1}) == 1
+                           and stub_hits(cached, "POST", f"{base}/login", data={"a": 1}) == 1))
+
+            shared = IngestSession(mode="live", rate_limits={}, cache=True, cache_dir=cache_dir,
+                                   cache_ttls={HOST: 3600})
+            checks.append(("cache shared across sessions", stub_hits(shared, "GET", f"{base}/stats?i=1") == 0))
+
+            expired = IngestSession(mode="live", rate_limits={}, cache=True, cache_dir=cache_dir,
+                                    cache_ttls={HOST: 0.05})
+            time.sleep(0.1)
+            checks.append(("expired entry refetched", stub_hits(expired, "GET", f"{base}/stats?i=1") == 1))
+
+            uncached_host = IngestSession(mode="live", rate_limits={}, cache=True, cache_dir=cache_dir, cache_ttls={})
+            off = IngestSession(mode="live", rate_limits={}, cache=False, cache_dir=cache_dir,
+                                cache_ttls={HOST: 3600})
+            recorder = IngestSession(mode="record", cassette_dir=os.path.join(tmp, "cassettes"), rate_limits={},
+                                     cache=True, cache_dir=cache_dir, cache_ttls={HOST: 3600})
+            checks.append(("host without TTL not cached", stub_hits(uncached_host, "GET", f"{base}/stats?i=1") == 1))
+            checks.append(("cache off",                   stub_hits(off, "GET", f"{base}/stats?i=1") == 1))
+            checks.append(("record mode bypasses cache",  stub_hits(recorder, "GET", f"{base}/stats?i=1") == 1))
+
+            login = IngestSession(mode="live", rate_limits={}, cache=True, cache_dir=cache_dir,
+                                  cache_ttls={HOST: 3600})
+            relogin = IngestSession(mode="live", rate_limits={}, cache=True, cache_dir=cache_dir,
+                                    cache_ttls={HOST: 3600})
+            checks.append(("login page not cached",
+                           stub_hits(login, "GET", f"{base}/wp-login.php") == 1
+                           and stub_hits(relogin, "GET", f"{base}/wp-login.php") == 1
+                           and relogin.cookies.get("sid") is not None))
+            checks.append(("cookie-setting response not cached",
+                           stub_hits(login, "GET", f"{base}/session") == 1
+                           and stub_hits(relogin, "GET", f"{base}/session") == 1))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        raw = pd.read_parquet(RAW_PATH)
+        rows = json.loads(json.dumps(raw.astype(object).where(raw.notna(), None).values.tolist()))
+        fresh = pd.DataFrame(rows, columns=list(raw.columns))
+        out_path = os.path.join(tmp, "raw.parquet")
+        created = write_parquet_if_changed(raw, out_path)
+        mtime = os.stat(out_path).st_mtime_ns
+        time.sleep(0.01)
+        same = write_parquet_if_changed(fresh, out_path)
+        same_mtime = os.stat(out_path).st_mtime_ns
+        edited = fresh.copy()
+        edited.loc[0, "PTS"] += 1
+        changed = write_parquet_if_changed(edited, out_path)
+        checks.append(("new parquet written",        not created["unchanged"]))
+        checks.append(("same content not rewritten",
+                       same["unchanged"] and same["sha256"] == created["sha256"] and same_mtime == mtime))
+        checks.append(("changed content rewritten",
+                       not changed["unchanged"] and pd.read_parquet(out_path)["PTS"].iloc[0] == edited["PTS"].iloc[0]))
+
+        json_path = os.path.join(tmp, "raw.json")
+        payload = {"generated_at_utc": "2025-01-01", "season": "2024-25", "values": {"a": 1.5}, "http": {}}
+        checks.append(("new JSON written", not write_json_if_changed(payload, json_path)))
+        checks.append(("JSON unchanged apart from volatile keys",
+                       write_json_if_changed({**payload, "generated_at_utc": "2025-01-02", "http": {"x": 1}},
+                                             json_path)))
+        with open(json_path, encoding="utf-8") as f:
+            checks.append(("unchanged JSON kept", json.load(f)["generated_at_utc"] == "2025-01-01"))
+        checks.append(("changed JSON rewritten", not write_json_if_changed({**payload, "values": {"a": 2.0}}, json_path)))
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — ingest cache and unchanged-output detection work")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+"""
+Ingest orchestrator test: ingest_all_async() on stand-in source scripts (no
+network).
+
+Five sources on three hosts, shaped like INGEST_SOURCES: three on host "a",
+one each on "b" and "c".  Each script sleeps, writes its own manifest and
+records the BUCKETS_RATE_SHARE it was given; one source fails.
+
+  - with a cap of 3 on "a" everything overlaps: wall time is about the
+    slowest source, not the sum, and each "a" source gets a 1/3 rate share;
+  - with a cap of 1 on "a" its sources run one after another, never two at
+    once, with the full rate each;
+  - the failure is reported for its source only (exit code, output tail) and
+    the other sources still finish with their row counts;
+  - a source over the timeout is killed and marked timed out.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.ingest.ingest_all import ingest_all_async
+
+SLEEP = {"trad": 0.6, "playtypes": 0.8, "tracking": 0.4, "pbpstats": 0.5, "ctg": 0.3}
+HOSTS = {"trad": "a", "playtypes": "a", "tracking": "a", "pbpstats": "b", "ctg": "c"}
+FAILING = "pbpstats"
+
+SCRIPT = """
+import json, os, sys, time
+print("start {name}", flush=True)
+time.sleep({sleep})
+with open({manifest!r}, "w") as f:
+    json.dump({{"raw_files": [{{"id": "{name}", "path": "{name}", "rows": 10, "cols": 3, "unchanged": False}}],
+               "unchanged": False, "http": {{"rate_share": float(os.environ["BUCKETS_RATE_SHARE"])}}}}, f)
+if {fail}:
+    print("{name} exploded", flush=True)
+    sys.exit(3)
+print("done {name}", flush=True)
+"""
+
+
+def make_sources(tmp: str, sleeps: dict[str, float]) -> list[dict]:
+    """One stand-in script per source, named and shaped like INGEST_SOURCES entries."""
+    sources = []
+    for name, host in HOSTS.items():
+        script   = os.path.join(tmp, f"{name}.py")
+        manifest = os.path.join(tmp, f"{name}_manifest.json")
+        with open(script, "w", encoding="utf-8") as f:
+            f.write(SCRIPT.format(name=name, sleep=sleeps[name], manifest=manifest, fail=name == FAILING))
+        sources.append({"name": name, "script": script, "host": host, "manifest": manifest})
+    return sources
+
+
+def overlapping(results: dict, names: list[str]) -> bool:
+    spans = sorted((results[n]["started_at"], results[n]["started_at"] + results[n]["seconds"]) for n in names)
+    return any(b_start < a_end - 0.05 for (_, a_end), (b_start, _) in zip(spans, spans[1:]))
+
+
+def main() -> int:
+    a_sources = [n for n, h in HOSTS.items() if h == "a"]
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = make_sources(tmp, SLEEP)
+        wide   = asyncio.run(ingest_all_async("2024-25", "Regular Season", sources=sources, caps={"a": 3}))
+        narrow = asyncio.run(ingest_all_async("2024-25", "Regular Season", sources=sources, caps={"a": 1}))
+        slow   = asyncio.run(ingest_all_async("2024-25", "Regular Season", sources=make_sources(tmp, {**SLEEP, "ctg": 30}),
+                                              caps={"a": 3}, timeout=2))
+
+    ws, ns = wide["sources"], narrow["sources"]
+    print(f"Cap 3: wall {wide['wall_seconds']:.2f}s, serial {wide['serial_seconds']:.2f}s")
+    print(f"Cap 1: wall {narrow['wall_seconds']:.2f}s")
+
+    checks = [
+        ("wall time near the slowest source",
+         wide["wall_seconds"] < max(ws[n]["seconds"] for n in ws) + 0.5
+         and wide["wall_seconds"] < 0.7 * wide["serial_seconds"]),
+        ("shared host sources overlap at cap 3", overlapping(ws, a_sources)),
+        ("rate split across a shared host",
+         all(ws[n]["rate_share"] == ws[n]["http"]["rate_share"] == 1 / 3 for n in a_sources)
+         and ws["ctg"]["http"]["rate_share"] == 1.0),
+        ("cap 1 serializes the host",
+         not overlapping(ns, a_sources) and all(ns[n]["http"]["rate_share"] == 1.0 for n in a_sources)),
+        ("cap 1 queues behind the host", sum(ns[n]["queued_seconds"] > 0.2 for n in a_sources) == 2),
+        ("failure isolated",
+         not wide["ok"] and wide["failed"] == [FAILING] and ws[FAILING]["returncode"] == 3
+         and "exploded" in ws[FAILING]["error"]),
+        ("other sources report rows",
+         all(ws[n]["ok"] and ws[n]["rows"] == 10 for n in ws if n != FAILING)),
+        ("timeout kills the source",
+         slow["sources"]["ctg"]["timed_out"] and not slow["sources"]["ctg"]["ok"]
+         and slow["wall_seconds"] < 5 and slow["sources"]["trad"]["ok"]),
+    ]
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — ingest sources run concurrently under per-host caps")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
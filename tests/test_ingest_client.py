@@ -0,0 +1,142 @@
+"""
+Ingest client test: IngestSession against a local HTTP/1.1 stub (no network).
+
+  - keep-alive: 10 requests through one session use one connection (plain
+    requests.get opens one per request);
+  - a 429 raises requests.HTTPError carrying the response, and the backoff
+    honors its Retry-After; without one it stays within the jittered range;
+  - the per-host token bucket spaces requests to the host;
+  - every request gets a timing record, summarized per host;
+  - cassettes: responses recorded in "record" mode replay byte-identically in
+    "replay" mode with the stub shut down; an unrecorded request raises.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.ingest.ingest_client import IngestSession, backoff_seconds
+
+HOST = "127.0.0.1"
+RATE = 20.0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set = set()
+    arrivals: list[float] = []
+
+    def do_GET(self):
+        StubHandler.connections.add(self.client_address)
+        StubHandler.arrivals.append(time.monotonic())
+        if self.path.startswith("/busy"):
+            self.send_response(429)
+            self.send_header("Retry-After", "7")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"path": self.path, "rows": list(range(20))}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def reset_stub() -> None:
+    StubHandler.connections = set()
+    StubHandler.arrivals = []
+
+
+def main() -> int:
+    server = ThreadingHTTPServer((HOST, 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://{HOST}:{server.server_address[1]}"
+    urls = [f"{base}/stats?i={i}" for i in range(10)]
+    checks = []
+
+    with tempfile.TemporaryDirectory() as cassettes:
+        try:
+            reset_stub()
+            live = IngestSession(mode="live", rate_limits={})
+            for url in urls:
+                live.get(url, timeout=5)
+            pooled = len(StubHandler.connections)
+            reset_stub()
+            for url in urls:
+                requests.get(url, timeout=5)
+            unpooled = len(StubHandler.connections)
+            print(f"Connections: {pooled} pooled, {unpooled} unpooled")
+            checks.append(("keep-alive reuses one connection", pooled == 1 and unpooled == len(urls)))
+
+            try:
+                live.get(f"{base}/busy", timeout=5)
+                busy_err = None
+            except requests.HTTPError as e:
+                busy_err = e
+            checks.append(("429 raises HTTPError", busy_err is not None and busy_err.response.status_code == 429))
+            checks.append(("backoff honors Retry-After", busy_err is not None and backoff_seconds(1, busy_err) >= 7))
+            jitter = [backoff_seconds(3) for _ in range(200)]
+            checks.append(("jittered backoff range", 4 <= min(jitter) < max(jitter) <= 8))
+
+            reset_stub()
+            limited = IngestSession(mode="live", rate_limits={HOST: (RATE, 1)})
+            for url in urls:
+                limited.get(url, timeout=5)
+            gaps = [b - a for a, b in zip(StubHandler.arrivals, StubHandler.arrivals[1:])]
+            print(f"Rate limit: min gap {min(gaps) * 1e3:.0f} ms at {RATE:g} req/s")
+            checks.append(("per-host rate limit", min(gaps) >= 0.8 / RATE))
+
+            summary = live.summary()
+            host = summary["by_host"][HOST]
+            checks.append(("timing metrics",
+                           summary["requests"] == len(urls) + 1 and host["errors"] == 1
+                           and all(m["seconds"] > 0 for m in live.metrics)))
+
+            recorder = IngestSession(mode="record", cassette_dir=cassettes, rate_limits={})
+            recorded = [recorder.get(url, timeout=5) for url in urls]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        replayer = IngestSession(mode="replay", cassette_dir=cassettes)
+        replayed = [replayer.get(url, timeout=5) for url in urls]
+        checks.append(("replay is byte-identical offline",
+                       all(a.content == b.content and a.status_code == b.status_code
+                           and a.json() == b.json() for a, b in zip(recorded, replayed))))
+        checks.append(("replay is marked in metrics", all(m["replayed"] for m in replayer.metrics)))
+        try:
+            replayer.get(f"{base}/stats?i=999", timeout=5)
+            missing_ok = False
+        except RuntimeError:
+            missing_ok = True
+        checks.append(("unrecorded request raises in replay", missing_ok))
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — ingest client pools, limits, times and replays requests")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -40,6 +40,7 @@ from scripts.calculate.build_season import (
     phase3a_passing,
 )
 from scripts.calculate.config import build_config, HC_CLAMP_MIN, HC_CLAMP_MAX
+from scripts.stage.staging_dtypes import read_staging_parquet
 
 SEASON           = "2024-25"
 SEASON_TYPE_SLUG = "regular"
@@ -63,7 +64,7 @@ def normalize_name(s: str) -> str:
 
 
 def main() -> int:
-    df_stg = pd.read_parquet(STAGING_PATH)
+    df_stg = read_staging_parquet(STAGING_PATH, widen_floats=True)
     df_csv = pd.read_csv(CSV_PATH)
     cfg    = build_config(CTG_PATH)
 
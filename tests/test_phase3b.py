@@ -52,6 +52,7 @@ from scripts.calculate.build_season import (
     phase3b_passing,
 )
 from scripts.calculate.config import build_config
+from scripts.stage.staging_dtypes import read_staging_parquet
 
 SEASON           = "2024-25"
 SEASON_TYPE_SLUG = "regular"
@@ -79,7 +80,7 @@ def main() -> int:
     print(f"Staging : {STAGING_PATH}")
     print(f"CSV     : {CSV_PATH}")
 
-    df_stg = pd.read_parquet(STAGING_PATH)
+    df_stg = read_staging_parquet(STAGING_PATH, widen_floats=True)
     df_csv = pd.read_csv(CSV_PATH)
     cfg    = build_config(CTG_PATH)
 
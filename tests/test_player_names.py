@@ -0,0 +1,155 @@
+"""
+Player-name test: the vectorized bulk cleaners match the scalar rules, and the
+cached alias index matches player_aliases.csv and is rebuilt only when the
+Name Fixer inputs change.
+
+  - clean_display_names() / player_keys() must equal the original per-name
+    rules (copied below) on every name in mappings/player_aliases.csv, every
+    raw Name Fixer input name, and the mojibake forms of the accented ones;
+  - build_alias_table() must reproduce mappings/player_aliases.csv exactly;
+  - load_alias_index() on a copy of the inputs writes the index once, serves
+    the second call from the cache, and rebuilds after an input file changes
+    (the new alias must then resolve through alias_lookup()).
+"""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.player_names import (
+    NAME_FIXER_DIR,
+    SOURCE_COLUMNS,
+    alias_lookup,
+    build_alias_table,
+    clean_display_names,
+    load_alias_index,
+    name_fixer_files,
+    player_keys,
+    read_name_fixer_csv,
+)
+
+ALIASES_CSV = os.path.join(REPO_ROOT, "mappings", "player_aliases.csv")
+
+
+# ── Reference: the per-name rules before vectorization ───────────────────────
+
+def _ref_repair_mojibake(s: str) -> str:
+    s = (s or "").strip()
+    if not s:
+        return ""
+    if any(ch in s for ch in ("Ã", "Ä", "Â", "â", "€", "œ", "�", "Å")):
+        for enc in ("latin1", "cp1252"):
+            try:
+                return s.encode(enc).decode("utf-8")
+            except UnicodeError:
+                pass
+    return s
+
+
+def _ref_strip_accents(s: str) -> str:
+    s = (s or "").strip()
+    if not s:
+        return ""
+    s_norm = unicodedata.normalize("NFKD", s)
+    s_no = "".join(ch for ch in s_norm if not unicodedata.combining(ch))
+    for bad, good in [("Ł", "L"), ("ł", "l"), ("Đ", "D"), ("đ", "d"), ("Ø", "O"), ("ø", "o"), ("ß", "ss")]:
+        s_no = s_no.replace(bad, good)
+    return s_no
+
+
+def _ref_display(s: str) -> str:
+    return _ref_strip_accents(_ref_repair_mojibake(s))
+
+
+def _ref_key(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "", _ref_display(s).lower())
+
+
+def _mojibake_forms(name: str) -> list[str]:
+    forms = []
+    for enc in ("latin1", "cp1252"):
+        try:
+            forms.append(name.encode("utf-8").decode(enc))
+        except UnicodeError:
+            pass
+    return forms
+
+
+def all_test_names() -> pd.Series:
+    """Every alias-table name and raw input name, plus mojibake forms of the non-ASCII ones."""
+    aliases = pd.read_csv(ALIASES_CSV, dtype=str, keep_default_na=False, na_filter=False)
+    names   = set(aliases["source_name"]) | set(aliases["display_name"])
+    for f in name_fixer_files():
+        df = read_name_fixer_csv(f)
+        for col in ["NBA Names"] + [c for _, c in SOURCE_COLUMNS]:
+            if col in df.columns:
+                names |= set(df[col])
+    for name in [n for n in names if not n.isascii()]:
+        names |= set(_mojibake_forms(name))
+    names |= {"", "  Łukasz Ødegaard-Đorđević  ", "Dennis Schröder ß", "A.J. Green Jr."}
+    return pd.Series(sorted(names), dtype=object)
+
+
+def main() -> int:
+    checks = []
+
+    names = all_test_names()
+    print(f"Names   : {len(names):,} ({int((~names.map(str.isascii)).sum()):,} non-ASCII)")
+    # Duplicates and nulls go through the bulk path too
+    bulk_in = pd.concat([names, names.iloc[::7], pd.Series([None])], ignore_index=True)
+    checks.append(("bulk display names match the scalar rules",
+                   clean_display_names(bulk_in).tolist() == [_ref_display(n or "") for n in bulk_in]))
+    checks.append(("bulk player keys match the scalar rules",
+                   player_keys(bulk_in).tolist() == [_ref_key(n or "") for n in bulk_in]))
+
+    expected = pd.read_csv(ALIASES_CSV, dtype=str, keep_default_na=False, na_filter=False)
+    built    = build_alias_table().astype(str)
+    checks.append(("alias table matches player_aliases.csv",
+                   built.reset_index(drop=True).equals(expected)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = Path(tmp) / "name_fixer_inputs"
+        index  = Path(tmp) / "player_alias_index.pkl"
+        shutil.copytree(NAME_FIXER_DIR, inputs)
+
+        first = load_alias_index(inputs, index)
+        mtime = index.stat().st_mtime_ns
+        second = load_alias_index(inputs, index)
+        checks.append(("first load builds the index", first.astype(str).equals(built)))
+        checks.append(("second load is served from cache", index.stat().st_mtime_ns == mtime and second.equals(first)))
+
+        last   = sorted(inputs.glob("*.csv"))[-1]
+        header = pd.read_csv(last, nrows=0, encoding="utf-8-sig").columns
+        row    = ["Zz Test Player" if c == "NBA Names" else "Zz Test Alias" for c in header]
+        with open(last, "a", encoding="utf-8") as f:
+            f.write(",".join(row) + "\n")
+        rebuilt = load_alias_index(inputs, index)
+        lookup  = alias_lookup("pbp", aliases=rebuilt)
+        checks.append(("changed inputs rebuild the index",
+                       index.stat().st_mtime_ns != mtime and lookup.get("zztestalias") == "zztestplayer"))
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — bulk cleaners match the scalar rules; alias index matches the CSV and tracks its inputs")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+"""
+Concurrent ingest test: fetch_concurrently() + TokenBucket against a local
+stub of the stats.nba.com play-type endpoint (no network).
+
+The stub serves a stats.nba.com-style resultSets payload per PlayType; one
+play type is slow, one always returns HTTP 500.
+
+  - all 11 play types fetched with 11 workers take about one slow request,
+    not the sum of all of them;
+  - the failing play type is reported on its own and every other play type
+    still returns its rows;
+  - with a 20 req/s bucket of capacity 1, request arrivals at the stub are
+    spaced at least ~1/20 s apart.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.ingest.rate_limit import TokenBucket, fetch_concurrently
+from scripts.stage.build_stage_season import PLAY_TYPE_PREFIX_MAP
+
+PLAY_TYPES   = list(PLAY_TYPE_PREFIX_MAP)
+SLOW_TYPE    = "Spotup"
+FAILING_TYPE = "Misc"
+SLOW_SECONDS = 0.8
+FAST_SECONDS = 0.2
+RATE         = 20.0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    arrivals: list[float] = []
+
+    def do_GET(self):
+        StubHandler.arrivals.append(time.monotonic())
+        play_type = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)["PlayType"][0]
+        time.sleep(SLOW_SECONDS if play_type == SLOW_TYPE else FAST_SECONDS)
+        if play_type == FAILING_TYPE:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = json.dumps({"resultSets": [{
+            "headers": ["PLAYER_ID", "PLAYER_NAME", "POSS", "PTS"],
+            "rowSet": [[i, f"Player {i}", 10 + i, 12 + i] for i in range(50)],
+        }]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def fetch_stub(base_url: str, play_type: str, bucket: TokenBucket | None = None) -> pd.DataFrame:
+    if bucket is not None:
+        bucket.acquire()
+    url = f"{base_url}/synergyplaytypes?{urllib.parse.urlencode({'PlayType': play_type})}"
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        rs = json.load(resp)["resultSets"][0]
+    df = pd.DataFrame(rs["rowSet"], columns=rs["headers"])
+    df["PLAY_TYPE"] = play_type
+    return df
+
+
+def run(base_url: str, workers: int, bucket: TokenBucket | None) -> tuple[dict, float]:
+    StubHandler.arrivals = []
+    tasks = {pt: (lambda pt=pt: fetch_stub(base_url, pt, bucket)) for pt in PLAY_TYPES}
+    start = time.perf_counter()
+    results = fetch_concurrently(tasks, workers)
+    return results, time.perf_counter() - start
+
+
+def main() -> int:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        serial, serial_s = run(base_url, 1, None)
+        parallel, parallel_s = run(base_url, len(PLAY_TYPES), None)
+        _, limited_s = run(base_url, len(PLAY_TYPES), TokenBucket(RATE, 1))
+        gaps = [b - a for a, b in zip(StubHandler.arrivals, StubHandler.arrivals[1:])]
+    finally:
+        server.shutdown()
+
+    print(f"Serial   : {serial_s:.2f}s")
+    print(f"Parallel : {parallel_s:.2f}s")
+    print(f"Limited  : {limited_s:.2f}s (min gap {min(gaps) * 1e3:.0f} ms)")
+
+    ok_types = [pt for pt, r in parallel.items() if r["ok"]]
+    checks = [
+        ("same results serial and parallel",
+         all(serial[pt]["ok"] == parallel[pt]["ok"] for pt in PLAY_TYPES)
+         and all(serial[pt]["result"].equals(parallel[pt]["result"]) for pt in ok_types)),
+        ("wall time near one slow request", parallel_s < SLOW_SECONDS + 2 * FAST_SECONDS),
+        ("failure isolated to one play type",
+         not parallel[FAILING_TYPE]["ok"] and "500" in parallel[FAILING_TYPE]["error"]
+         and len(ok_types) == len(PLAY_TYPES) - 1),
+        ("other play types have rows", all(len(parallel[pt]["result"]) == 50 for pt in ok_types)),
+        ("rate limit spaces requests", min(gaps) >= 0.8 / RATE),
+    ]
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — concurrent fetch is isolated, fast and rate limited")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,160 @@
+"""
+Raw snapshot history test: dedup, latest-seen index and carry-forward lookback.
+
+The passing columns of the 2024-25 staging frame stand in for one source's
+daily frame, recorded into a temporary history:
+
+  - day 1 writes a snapshot; an identical day 2 writes nothing and only moves
+    last_seen; day 3 without two players writes a second snapshot;
+  - carry_forward_rows() on day 4 returns those two players' day-1 rows
+    exactly, and nothing for a player never seen;
+  - past the lookback window the same lookup finds nothing;
+  - a same-day rerun re-points the latest-seen index both ways;
+  - recording a day before the latest snapshot raises ValueError;
+  - carry_forward_from_history() keeps carrying a player missing from the
+    source on two runs in a row: from the previous staging snapshot while the
+    history is empty, and again once the history exists but lacks the player;
+  - past the lookback window a player the history has seen is no longer
+    carried from a previous staging row that was itself carried forward, but
+    still is from one that was observed.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.stage.build_stage_season import carry_forward_from_history, staging_path
+from scripts.stage.raw_snapshots import carry_forward_rows, load_manifest, record_snapshot
+from scripts.stage.staging_dtypes import read_staging_parquet
+
+SEASON           = "2024-25"
+SEASON_TYPE_SLUG = "regular"
+SOURCE           = "pass"
+DAY1             = date(2025, 1, 10)
+UNSEEN_ID        = 999_999_999
+
+
+def main() -> int:
+    staging = read_staging_parquet(os.path.join(REPO_ROOT, staging_path(SEASON, SEASON_TYPE_SLUG)), plain=True)
+    frame   = staging[["PLAYER_ID"] + [c for c in staging.columns if c.startswith("nba_pass__")]]
+    frame   = frame[frame.drop(columns="PLAYER_ID").notna().any(axis=1)].reset_index(drop=True)
+    a, b    = int(frame["PLAYER_ID"].iloc[3]), int(frame["PLAYER_ID"].iloc[8])
+    without_ab = frame[~frame["PLAYER_ID"].isin([a, b])]
+
+    def day(n):
+        return DAY1 + timedelta(days=n - 1)
+
+    checks = []
+    with tempfile.TemporaryDirectory() as root:
+        def record(df, n):
+            return record_snapshot(df, SEASON, SEASON_TYPE_SLUG, SOURCE, day(n), root=root)
+
+        def lookup(n, lookback_days=14):
+            return carry_forward_rows(SEASON, SEASON_TYPE_SLUG, SOURCE, [a, b, UNSEEN_ID], day(n),
+                                      lookback_days, root=root)
+
+        checks.append(("no history returns None", lookup(1) is None))
+
+        first, second, third = record(frame, 1), record(frame, 2), record(without_ab, 3)
+        entry = load_manifest(SEASON, SEASON_TYPE_SLUG, root)["sources"][SOURCE]
+        files = os.listdir(os.path.join(root, SEASON, SEASON_TYPE_SLUG, SOURCE))
+        checks.append(("unchanged day writes nothing",
+                       first["written"] and not second["written"] and third["written"] and len(files) == 2))
+        checks.append(("last_seen moves forward", entry["snapshots"][0]["last_seen"] == day(2).isoformat()))
+        checks.append(("latest-seen index",
+                       entry["latest_seen"][str(a)] == day(1).isoformat()
+                       and entry["latest_seen"][str(int(without_ab['PLAYER_ID'].iloc[0]))] == day(3).isoformat()))
+
+        rows, origin = lookup(4)
+        expected = frame[frame["PLAYER_ID"].isin([a, b])].sort_values("PLAYER_ID").reset_index(drop=True)
+        got      = rows.sort_values("PLAYER_ID").reset_index(drop=True)
+        checks.append(("carried rows are the day-1 rows", got.equals(expected)))
+        checks.append(("origin dates", origin == {a: day(1).isoformat(), b: day(1).isoformat()}))
+
+        rows, origin = lookup(20)
+        checks.append(("outside the lookback window", rows.empty and not origin))
+
+        record(frame[frame["PLAYER_ID"] != b], 3)
+        seen_after_rerun = load_manifest(SEASON, SEASON_TYPE_SLUG, root)["sources"][SOURCE]["latest_seen"]
+        record(without_ab, 3)
+        seen_after_revert = load_manifest(SEASON, SEASON_TYPE_SLUG, root)["sources"][SOURCE]["latest_seen"]
+        checks.append(("same-day rerun re-points the index",
+                       seen_after_rerun[str(a)] == day(3).isoformat()
+                       and seen_after_revert[str(a)] == day(1).isoformat()))
+
+        try:
+            record(frame, 2)
+            backdated_ok = False
+        except ValueError:
+            backdated_ok = True
+        checks.append(("history is append-only", backdated_ok))
+
+    pass_cols = [c for c in frame.columns if c != "PLAYER_ID" and not c.endswith("carried_forward")]
+    fresh     = staging.drop(columns=[c for c in staging.columns if c.endswith("carried_forward")])
+    dropped   = int(frame["PLAYER_ID"].iloc[5])
+    fresh.loc[fresh["PLAYER_ID"] == dropped, pass_cols] = None
+
+    with tempfile.TemporaryDirectory() as root:
+        def build(prev, n):
+            current = fresh.copy()
+            report = carry_forward_from_history(current=current, prev=prev, season=SEASON,
+                                                season_type_slug=SEASON_TYPE_SLUG, source=SOURCE, key="PLAYER_ID",
+                                                day=day(n), history_root=root)
+            record_snapshot(frame[frame["PLAYER_ID"] != dropped], SEASON, SEASON_TYPE_SLUG, SOURCE, day(n), root=root)
+            return current, report
+
+        run1, report1 = build(staging, 1)
+        run2, report2 = build(run1, 2)
+        carried = run2.loc[run2["PLAYER_ID"] == dropped, pass_cols].reset_index(drop=True)
+        original = staging.loc[staging["PLAYER_ID"] == dropped, pass_cols].reset_index(drop=True)
+        checks.append(("first run carries from previous staging",
+                       report1["carried_forward_count"] == 1
+                       and report1["carried_forward_from"] == {str(dropped): "previous_staging"}))
+        checks.append(("second run still carries what history lacks",
+                       report2["carried_forward_count"] == 1
+                       and report2["carried_forward_from"] == {str(dropped): "previous_staging"}
+                       and bool((carried.astype(object) == original.astype(object)).all(axis=None))))
+
+    flag_col = "nba_pass__carried_forward"
+    with tempfile.TemporaryDirectory() as root:
+        record_snapshot(frame, SEASON, SEASON_TYPE_SLUG, SOURCE, day(1), root=root)
+
+        def expired(prev_carried):
+            prev = staging.copy()
+            prev[flag_col] = prev["PLAYER_ID"].eq(dropped) & prev_carried
+            return carry_forward_from_history(current=fresh.copy(), prev=prev, season=SEASON,
+                                              season_type_slug=SEASON_TYPE_SLUG, source=SOURCE, key="PLAYER_ID",
+                                              lookback_days=14, day=day(20), history_root=root)
+
+        within = carry_forward_from_history(current=fresh.copy(), prev=None, season=SEASON,
+                                            season_type_slug=SEASON_TYPE_SLUG, source=SOURCE, key="PLAYER_ID",
+                                            lookback_days=14, day=day(10), history_root=root)
+        checks.append(("carried from the snapshot within the window",
+                       within["carried_forward_from"] == {str(dropped): day(1).isoformat()}))
+        stale, observed = expired(True), expired(False)
+        checks.append(("expired carried value not carried again",
+                       stale["carried_forward_count"] == 0 and stale["missing_count"] == 1))
+        checks.append(("expired player carried from an observed staging row",
+                       observed["carried_forward_from"] == {str(dropped): "previous_staging"}))
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — snapshot history dedups, indexes and honors the lookback")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
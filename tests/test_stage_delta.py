@@ -0,0 +1,75 @@
+"""
+Stage delta test: stage_delta() against known edits of a real staging frame.
+
+The 2024-25 staging frame is compared with itself (must be unchanged), then
+with a copy carrying known edits — one changed stat, one renamed player, one
+value set to NaN, one dropped player, one new player, one new column, one
+retyped column — and the reported change set must list exactly those
+PLAYER_IDs and columns.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.stage.build_stage_season import stage_delta, staging_path
+from scripts.stage.staging_dtypes import read_staging_parquet
+
+SEASON           = "2024-25"
+SEASON_TYPE_SLUG = "regular"
+NEW_PLAYER_ID    = 999_999_999
+
+
+def main() -> int:
+    path = os.path.join(REPO_ROOT, staging_path(SEASON, SEASON_TYPE_SLUG))
+    print(f"Staging : {path}")
+    prev = read_staging_parquet(path, plain=True)
+    ids  = prev["PLAYER_ID"].tolist()
+
+    cur = prev.copy()
+    cur.loc[cur["PLAYER_ID"] == ids[5], "nba_trad__PTS"] += 1
+    cur.loc[cur["PLAYER_ID"] == ids[7], "Player"] = "Renamed Player"
+    cur.loc[cur["PLAYER_ID"] == ids[9], "pbp__OffPoss"] = np.nan
+    cur = cur[cur["PLAYER_ID"] != ids[0]]
+    extra = cur.iloc[[0]].copy()
+    extra["PLAYER_ID"] = NEW_PLAYER_ID
+    cur = pd.concat([cur, extra], ignore_index=True)
+    cur["new_col"] = 1
+    cur["nba_trad__GP"] = cur["nba_trad__GP"].astype(np.float64)
+
+    same  = stage_delta(prev.copy(), prev)
+    delta = stage_delta(cur, prev)
+
+    checks = [
+        ("identical frame is unchanged", same["unchanged"] and not same["changed_player_ids"]),
+        ("edited frame is changed",      not delta["unchanged"]),
+        ("changed players",              delta["changed_player_ids"] == sorted(ids[i] for i in (5, 7, 9))),
+        ("changed columns",              delta["changed_columns"] == {"Player": 1, "nba_trad__PTS": 1, "pbp__OffPoss": 1}),
+        ("removed players",              delta["removed_player_ids"] == [ids[0]]),
+        ("added players",                delta["added_player_ids"] == [NEW_PLAYER_ID]),
+        ("added columns",                delta["added_columns"] == ["new_col"]),
+        ("retyped columns",              delta["retyped_columns"] == ["nba_trad__GP"]),
+        ("no previous snapshot",         stage_delta(prev, None)["added_player_ids"] == sorted(ids)),
+    ]
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — stage_delta reports exactly the edited rows and columns")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
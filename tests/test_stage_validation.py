@@ -0,0 +1,88 @@
+"""
+Stage validation test: single-pass statistics and the previous-run comparison.
+
+On the 2024-25 staging frame:
+
+  - staging_stats() null rates and per-source missing-row counts must equal
+    the direct pandas computation (carry-forward flag columns excluded);
+  - the schema fingerprint must be the same for the compact and the plain
+    read of the file;
+  - validate_stage() passes in-process without writing a report;
+  - compare_stats() against the frame's own statistics reports no change, and
+    against an edited copy (rows dropped, a column added, a column nulled)
+    reports exactly those changes as warnings.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.qa.validate_stage_season import (
+    SOURCE_PREFIXES,
+    compare_stats,
+    staging_stats,
+    validate_stage,
+)
+from scripts.stage.build_stage_season import staging_path
+from scripts.stage.staging_dtypes import read_staging_parquet
+
+SEASON      = "2024-25"
+SEASON_TYPE = "Regular Season"
+
+
+def main() -> int:
+    path  = os.path.join(REPO_ROOT, staging_path(SEASON, "regular"))
+    plain = read_staging_parquet(path, plain=True)
+    stats = staging_stats(plain)
+
+    rates_ok = all(
+        abs(stats["null_rates"][c] - plain[c].isna().mean()) < 1e-6 for c in plain.columns
+    )
+    sources_ok = True
+    for prefix in SOURCE_PREFIXES:
+        cols = [c for c in plain.columns if c.startswith(prefix) and not c.endswith("carried_forward")]
+        sources_ok &= stats["sources"][prefix]["missing_rows"] == int(plain[cols].isna().all(axis=1).sum())
+
+    report = validate_stage(plain, SEASON, SEASON_TYPE, write_report=False)
+
+    same_changes, same_warnings = compare_stats(stats, {"checked_at_utc": None, **stats})
+
+    edited = plain.iloc[:-100].copy()
+    edited["new_col"] = 1
+    edited["nba_pass__AST"] = np.nan
+    changes, warnings = compare_stats(staging_stats(edited), stats)
+
+    checks = [
+        ("null rates",                   rates_ok),
+        ("per-source missing rows",      sources_ok),
+        ("fingerprint ignores compact dtypes",
+         staging_stats(read_staging_parquet(path))["schema_fingerprint"] == stats["schema_fingerprint"]),
+        ("validates in-process",         report["ok"] and report["null_rates"] == stats["null_rates"]),
+        ("no previous run",              compare_stats(stats, None) == (None, [])),
+        ("unchanged since previous",     not same_changes["schema_changed"] and not same_warnings),
+        ("schema change",                changes["schema_changed"] and changes["added_columns"] == ["new_col"]),
+        ("row count change",             changes["rows_change"] == -100),
+        ("null rate jump",               list(changes["null_rate_jumps"]) == ["nba_pass__AST"]),
+        ("warnings",                     len(warnings) == 3),
+    ]
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — validation statistics and comparison are correct")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""
+Staging dataset test: concurrent partition writes of scripts/stage/staging_dataset.py.
+
+Six seasons' staging files are written into a temporary dataset by eight
+threads at once (each season by two threads, several rounds):
+
+  - no writer raises and no temp file is left behind;
+  - the scan schema is the union of the seasons' schemas, the same as after
+    writing them one at a time, with no column lost;
+  - every season reads back with its own row count and PLAYER_IDs.
+"""
+
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.stage.staging_dataset import (
+    STAGING_DIR,
+    load_staging_dataset,
+    read_common_schema,
+    write_season_partition,
+)
+from scripts.stage.staging_dtypes import read_staging_parquet
+
+SEASONS = ["2014-15", "2017-18", "2019-20", "2021-22", "2023-24", "2024-25"]
+ROUNDS  = 3
+
+
+def main() -> int:
+    frames = {
+        season: read_staging_parquet(os.path.join(STAGING_DIR, f"{season}__regular.parquet"))
+        for season in SEASONS
+    }
+    jobs = [season for _ in range(ROUNDS) for season in SEASONS * 2]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        serial_dir = os.path.join(tmp, "serial")
+        for season in SEASONS:
+            write_season_partition(frames[season], season, "regular", serial_dir)
+        serial_schema = read_common_schema(serial_dir)
+
+        concurrent_dir = os.path.join(tmp, "concurrent")
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(write_season_partition, frames[s], s, "regular", concurrent_dir) for s in jobs]
+            errors = [f.exception() for f in futures if f.exception() is not None]
+
+        leftovers = [name for _, _, names in os.walk(concurrent_dir) for name in names if name.endswith(".tmp")]
+        schema = read_common_schema(concurrent_dir)
+        stack  = load_staging_dataset(columns=["season", "PLAYER_ID"], dataset_dir=concurrent_dir)
+
+    # ctg__* constants live in the staging file metadata, not the partitions
+    all_columns = {c for f in frames.values() for c in f.columns if not c.startswith("ctg__")}
+    checks = [
+        ("concurrent writers succeed",      not errors),
+        ("no temp files left",              not leftovers),
+        ("union schema matches serial",     schema.equals(serial_schema)),
+        ("no column lost",                  all_columns <= set(schema.names)),
+        ("every season reads back",
+         all(sorted(stack.loc[stack["season"] == s, "PLAYER_ID"].astype(int)) == sorted(frames[s]["PLAYER_ID"].astype(int))
+             for s in SEASONS)),
+    ]
+    for e in errors[:3]:
+        print(f"[ERROR] {type(e).__name__}: {e}")
+
+    failures = 0
+    for name, ok in checks:
+        failures += not ok
+        print(f"[{'OK  ' if ok else 'FAIL'}] {name}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — concurrent season writes keep every partition and column")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+"""
+Staging dtype policy test: compact staging files give the same league tables.
+
+For every season with a staging parquet, the staging frame is rewritten with
+write_staging_parquet() into a temporary directory, then:
+
+  - read_staging_parquet(plain=True) must return exactly the frame written
+    (values, column order and dtypes);
+  - the compact file must be smaller than the same frame written with
+    DataFrame.to_parquet(), and the compact load smaller in memory;
+  - Phases 1a–6 run on read_staging() of the original and of the compact file
+    must produce byte-identical league-table CSV text.
+
+Seasons whose CTG / PCT_AST_PTS_IN_PA inputs are missing only run the first
+two checks.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.calculate.build_season import (
+    build_season_table,
+    format_season_table,
+    load_season_config,
+    read_staging,
+    season_input_paths,
+)
+from scripts.stage.staging_dtypes import STAGING_DIR, read_staging_parquet, write_staging_parquet
+
+SEASON_TYPE      = "Regular Season"
+SEASON_TYPE_SLUG = "regular"
+
+
+def league_table_csv(staging_path: str, paths: dict, season: str) -> str:
+    with contextlib.redirect_stdout(io.StringIO()):
+        cfg = load_season_config(paths)
+        out = build_season_table(read_staging(staging_path), cfg, season, SEASON_TYPE)
+    return format_season_table(out).to_csv(index=False)
+
+
+def main() -> int:
+    seasons = sorted(
+        name.split("__")[0] for name in os.listdir(STAGING_DIR)
+        if name.endswith(f"__{SEASON_TYPE_SLUG}.parquet")
+    )
+    print(f"Staging : {STAGING_DIR}")
+    print(f"Seasons : {len(seasons)}")
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for season in seasons:
+            paths = season_input_paths(season, SEASON_TYPE_SLUG)
+            df    = read_staging_parquet(paths["staging"], plain=True)
+
+            plain_path   = os.path.join(tmp, f"{season}.plain.parquet")
+            compact_path = os.path.join(tmp, f"{season}.parquet")
+            df.to_parquet(plain_path, index=False)
+            compact = write_staging_parquet(df, compact_path)
+
+            try:
+                pd.testing.assert_frame_equal(read_staging_parquet(compact_path, plain=True), df, check_exact=True)
+                roundtrip_ok = True
+            except AssertionError:
+                roundtrip_ok = False
+
+            plain_kb   = os.path.getsize(plain_path) / 1e3
+            compact_kb = os.path.getsize(compact_path) / 1e3
+            plain_mb   = df.memory_usage(deep=True).sum() / 1e6
+            compact_mb = read_staging_parquet(compact_path).memory_usage(deep=True).sum() / 1e6
+            smaller_ok = compact_kb < plain_kb and compact_mb < plain_mb
+
+            checks = [("round trip", roundtrip_ok, f"{df.shape[1]} cols, {compact.shape[1]} stored"),
+                      ("smaller", smaller_ok,
+                       f"file {plain_kb:.0f}->{compact_kb:.0f} KB, memory {plain_mb:.2f}->{compact_mb:.2f} MB")]
+
+            if os.path.exists(paths["ctg"]) and os.path.exists(paths["pct_ast"]):
+                same = league_table_csv(plain_path, paths, season) == league_table_csv(compact_path, paths, season)
+                checks.append(("league table", same, "identical CSV" if same else "CSV text differs"))
+            else:
+                print(f"[SKIP] {season} league table: missing CTG / PCT_AST_PTS_IN_PA inputs")
+
+            for name, ok, detail in checks:
+                failures += not ok
+                status = "OK  " if ok else "FAIL"
+                print(f"[{status}] {season} {name:12s} {detail}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print("PASS — compact staging round-trips and leaves league tables unchanged")
+        return 0
+    print(f"FAIL — {failures} failed checks")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
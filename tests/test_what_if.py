@@ -0,0 +1,109 @@
+"""
+What-if sweep test: sweep_points_created() vs. one full phase chain per variant.
+
+For the 2024-25 season, a batch of config variants (the base config, a
+PADDING_VOLUME × HC_CLAMP_MAX grid, and one variant that moves every other
+group of constants) is evaluated in one sweep_points_created() call.  Each
+variant is then rerun through Phases 1a–6 with the overridden config, and
+the sweep's Total PC / Games and Floor raising PC/g must match the Phase 6
+"Total PC/g (ex. floor raising)" and "Floor raising PC/g" columns within
+1e-9 for every player, with identical NaN patterns.
+"""
+
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.calculate.build_season import (
+    compute_scoring_share_of_tov,
+    load_season_config,
+    phase1a_playtypes,
+    phase1b_playtypes,
+    phase2_transition,
+    phase3a_passing,
+    phase3b_passing,
+    phase4_transition,
+    phase5_floor_raising,
+    phase6_assemble,
+    read_staging,
+    season_input_paths,
+)
+from scripts.calculate.what_if import sweep_points_created, variant_grid
+
+SEASON           = "2024-25"
+SEASON_TYPE_SLUG = "regular"
+TOLERANCE        = 1e-9
+
+VARIANTS = (
+    [{}]
+    + variant_grid({"PADDING_VOLUME": [200, 800], "HC_CLAMP_MAX": [0.85, 0.90]})
+    + [{
+        "PCT_FT_AST_NO_SHOT": 0.3,
+        "LG_AVG_PP_FT_AST":   2.0,
+        "HC_CLAMP_MIN":       0.75,
+        "HC_REG_OBS":         0.05,
+        "TR_REG_HCPCT":       -200.0,
+        "FR_QUADRATIC":       -0.004,
+        "FR_MIN_POSS":        300,
+    }]
+)
+
+
+def rerun(df_stg, cfg: dict):
+    """Phases 1a–6 with one config, as build_season_table() runs them."""
+    df          = compute_scoring_share_of_tov(df_stg)
+    pt1a        = phase1a_playtypes(df)
+    pt2, tr_agg = phase2_transition(df, cfg)
+    pt3a, agg3a = phase3a_passing(df, pt1a, pt2, cfg)
+    pt1b = phase1b_playtypes(pt1a, agg3a["lg_avg_onball_tov_rate"], cfg, {"offrebound": cfg["CTG_HC_PPP"]})
+    pt3b = phase3b_passing(pt3a, agg3a, tr_agg["TR_PPP_RATIO"], cfg)
+    pt4  = phase4_transition(pt2, pt3b, tr_agg, cfg)
+    pt5  = phase5_floor_raising(pt1b, pt3b, df, cfg)
+    return phase6_assemble(pt1b, pt3b, pt4, pt5, df, SEASON)
+
+
+def main() -> int:
+    paths = season_input_paths(SEASON, SEASON_TYPE_SLUG)
+    print(f"Staging : {paths['staging']}")
+    print(f"Variants: {len(VARIANTS)}")
+
+    df_stg = read_staging(paths["staging"])
+    with contextlib.redirect_stdout(io.StringIO()):
+        cfg = load_season_config(paths)
+        res = sweep_points_created(df_stg, cfg, VARIANTS)
+
+    failures = 0
+    for k, overrides in enumerate(VARIANTS):
+        with contextlib.redirect_stdout(io.StringIO()):
+            out = rerun(df_stg, {**cfg, **overrides})
+
+        checks = {
+            "Total PC/g (ex. floor raising)": (res["Total PC"][k] / out["Games"]).to_numpy(),
+            "Floor raising PC/g":             res["Floor raising PC/g"][k].to_numpy(),
+        }
+        for col, got in checks.items():
+            want = out[col].to_numpy(dtype=np.float64)
+            nan_ok = bool((np.isnan(want) == np.isnan(got)).all())
+            diff   = float(np.nanmax(np.abs(want - got))) if nan_ok else float("nan")
+            ok     = nan_ok and diff <= TOLERANCE
+            failures += not ok
+            status = "OK  " if ok else "FAIL"
+            print(f"[{status}] variant {k} {col:32s} max diff={diff:.2e}  {overrides or '(base)'}")
+
+    print(f"\n{'='*52}")
+    if failures == 0:
+        print(f"PASS — sweep matches per-variant reruns within {TOLERANCE}")
+        return 0
+    print(f"FAIL — {failures} mismatched variant/column pairs")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())